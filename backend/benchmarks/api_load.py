@@ -0,0 +1,329 @@
+"""
+REST and WebSocket load benchmark for the FastAPI app
+
+Serves ``main.app`` with uvicorn on a local port, with the daylight_mircat
+module driving the simulated SDK in backend/simulators/mircat (built with
+make on first use). A client thread with its own event loop generates load,
+so client-side work never runs on the server's loop. Measured:
+
+- REST p50/p99 latency and throughput for GET /status (concurrent clients),
+  POST /tune and sweep scan start/stop (sequential; they are exclusive
+  device operations)
+- WebSocket frame rate and inter-frame jitter on /ws/daylight_mircat with
+  1, 10 and 50 concurrent clients, measured while a sweep scan keeps the
+  status changing
+- server event-loop lag (timer overshoot of a 10 ms ticker on the server
+  loop) during every phase
+
+Results are written as JSON (stdout or --output) so they can be compared
+between commits.
+
+Usage (from backend/):
+    python benchmarks/api_load.py --output results.json
+    python benchmarks/api_load.py --sdk-latency-us 2000 --ws-clients 1 10 50
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SIMULATOR_DIR = BACKEND_DIR / "simulators" / "mircat"
+
+sys.path.insert(0, str(BACKEND_DIR / "src"))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+import websockets  # noqa: E402
+
+API = "/api/daylight_mircat"
+LAG_TICK_S = 0.010
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(len(ordered) * pct / 100.0)) - 1))]
+
+
+def _summary(samples_ms: List[float]) -> Dict[str, Any]:
+    if not samples_ms:
+        return {"count": 0}
+    return {
+        "count": len(samples_ms),
+        "p50_ms": round(statistics.median(samples_ms), 3),
+        "p99_ms": round(_percentile(samples_ms, 99), 3),
+        "max_ms": round(max(samples_ms), 3),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+    }
+
+
+def _ensure_simulator(sdk_dir: Path) -> None:
+    if (sdk_dir / "libMIRcatSDK.so").exists():
+        return
+    if sdk_dir != SIMULATOR_DIR:
+        raise SystemExit(f"libMIRcatSDK.so not found in {sdk_dir}")
+    print("Building the MIRcat SDK simulator...", file=sys.stderr)
+    subprocess.run(["make", "-s", "-C", str(SIMULATOR_DIR)], check=True)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except Exception:
+        return None
+
+
+class LoopLagMonitor:
+    """Records how late a periodic timer fires on the loop it runs on."""
+
+    def __init__(self, tick_s: float = LAG_TICK_S):
+        self.tick_s = tick_s
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            t0 = loop.time()
+            await asyncio.sleep(self.tick_s)
+            self.samples.append(max(0.0, (loop.time() - t0 - self.tick_s) * 1000.0))
+
+    def take(self) -> List[float]:
+        """Return and reset the samples gathered since the last call."""
+        samples, self.samples = self.samples, []
+        return samples
+
+
+class ClientThread:
+    """Event loop in a background thread; server-side work stays on the main loop."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    async def run(self, coro: Awaitable) -> Any:
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    def close(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+async def _rest_phase(client: httpx.AsyncClient, requests: int, concurrency: int,
+                      make_request: Callable[[httpx.AsyncClient, int], Awaitable[None]]) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def _worker() -> None:
+        nonlocal errors
+        for index in counter:
+            t0 = time.perf_counter()
+            try:
+                await make_request(client, index)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    return {
+        **_summary(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+async def _get_status(client: httpx.AsyncClient, _index: int) -> None:
+    (await client.get(f"{API}/status")).raise_for_status()
+
+
+async def _tune(client: httpx.AsyncClient, index: int) -> None:
+    # Alternate between two targets so every request moves the grating
+    wavenumber = 1750.0 if index % 2 else 1950.0
+    (await client.post(f"{API}/tune", json={"wavenumber": wavenumber})).raise_for_status()
+
+
+async def _scan_start_stop(client: httpx.AsyncClient, _index: int) -> None:
+    (await client.post(f"{API}/scan/sweep/start", json={
+        "start_wavenumber": 1700.0, "end_wavenumber": 1900.0, "scan_speed": 100.0, "number_of_scans": 1,
+    })).raise_for_status()
+    (await client.post(f"{API}/scan/stop")).raise_for_status()
+
+
+async def _start_long_sweep(client: httpx.AsyncClient) -> None:
+    # Slow, repeated sweep so every status poll carries a new wavenumber
+    (await client.post(f"{API}/scan/sweep/start", json={
+        "start_wavenumber": 1700.0, "end_wavenumber": 2000.0, "scan_speed": 10.0, "number_of_scans": 100,
+    })).raise_for_status()
+
+
+async def _ws_phase(url: str, clients: int, duration_s: float) -> Dict[str, Any]:
+    arrivals: List[List[float]] = [[] for _ in range(clients)]
+    errors = 0
+
+    async def _client(slot: int) -> None:
+        nonlocal errors
+        try:
+            async with websockets.connect(url, max_size=None) as ws:
+                deadline = time.perf_counter() + duration_s
+                while True:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    try:
+                        await asyncio.wait_for(ws.recv(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    arrivals[slot].append(time.perf_counter())
+        except Exception:
+            errors += 1
+
+    await asyncio.gather(*(_client(slot) for slot in range(clients)))
+    # The first frame is the subscribe-time snapshot; measure the steady stream after it
+    gaps = [(b - a) * 1000.0 for times in arrivals for a, b in zip(times[1:], times[2:])]
+    rates = [(len(times) - 2) / (times[-1] - times[1]) for times in arrivals if len(times) > 2 and times[-1] > times[1]]
+    return {
+        "clients": clients,
+        "errors": errors,
+        "frames": sum(len(times) for times in arrivals),
+        "frame_rate_hz_per_client": round(statistics.fmean(rates), 2) if rates else 0.0,
+        "interval": _summary(gaps),
+        "jitter_ms": round(statistics.pstdev(gaps), 3) if len(gaps) > 1 else None,
+    }
+
+
+async def _benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    import main
+    from modules.daylight_mircat.routes import mircat_controller
+
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=args.port, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    lag = LoopLagMonitor()
+    lag.start()
+    client_thread = ClientThread()
+    base_url = f"http://127.0.0.1:{args.port}"
+    results: Dict[str, Any] = {"rest": {}, "websocket": []}
+
+    async def _setup(client: httpx.AsyncClient) -> None:
+        for path in ("/connect", "/arm"):
+            (await client.post(f"{API}{path}")).raise_for_status()
+        (await client.post(f"{API}/tune", json={"wavenumber": 1800.0})).raise_for_status()
+
+    try:
+        await client_thread.run(_with_client(base_url, _setup))
+        lag.take()
+
+        rest_phases = [
+            ("status", args.requests, args.concurrency, _get_status),
+            ("tune", args.device_requests, 1, _tune),
+            ("scan_start_stop", args.device_requests, 1, _scan_start_stop),
+        ]
+        for name, requests, concurrency, make_request in rest_phases:
+            result = await client_thread.run(_with_client(
+                base_url, lambda client: _rest_phase(client, requests, concurrency, make_request)))
+            result["event_loop_lag"] = _summary(lag.take())
+            results["rest"][name] = result
+
+        ws_url = f"ws://127.0.0.1:{args.port}/ws/daylight_mircat?protocol={args.ws_protocol}"
+        await client_thread.run(_with_client(base_url, _start_long_sweep))
+        try:
+            lag.take()
+            for clients in args.ws_clients:
+                result = await client_thread.run(_ws_phase(ws_url, clients, args.ws_duration))
+                result["event_loop_lag"] = _summary(lag.take())
+                results["websocket"].append(result)
+        finally:
+            await client_thread.run(_with_client(base_url, lambda client: client.post(f"{API}/scan/stop")))
+    finally:
+        client_thread.close()
+        await mircat_controller.disconnect()
+        server.should_exit = True
+        await serve_task
+    return results
+
+
+async def _with_client(base_url: str, body: Callable[[httpx.AsyncClient], Awaitable[Any]]) -> Any:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        return await body(client)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sdk-dir", type=Path, default=SIMULATOR_DIR, help="directory containing libMIRcatSDK.so")
+    parser.add_argument("--sdk-latency-us", type=float, default=1000.0, help="simulated per-call serial latency")
+    parser.add_argument("--requests", type=int, default=500, help="GET /status requests")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent GET /status clients")
+    parser.add_argument("--device-requests", type=int, default=20, help="tune and scan start/stop requests")
+    parser.add_argument("--ws-clients", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--ws-duration", type=float, default=5.0, help="seconds per WebSocket phase")
+    parser.add_argument("--ws-protocol", choices=("full", "delta"), default="full")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    sdk_dir = args.sdk_dir.resolve()
+    _ensure_simulator(sdk_dir)
+    # The simulator reads its model parameters once, when the library is loaded
+    os.environ["MIRCAT_SDK_DIR"] = str(sdk_dir)
+    os.environ["MIRCAT_SIM_LATENCY_US"] = str(args.sdk_latency_us)
+    os.environ.setdefault("MIRCAT_SIM_ARM_MS", "50")
+    os.environ.setdefault("MIRCAT_SIM_TEC_TAU_S", "0.1")
+
+    logging.disable(logging.WARNING)
+    started = datetime.now(timezone.utc).isoformat()
+    # The app prints connection events; keep stdout for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        results = asyncio.run(_benchmark(args))
+    report = {
+        "benchmark": "api_load",
+        "started": started,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "sdk_dir": str(sdk_dir),
+            "sdk_latency_us": args.sdk_latency_us,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "device_requests": args.device_requests,
+            "ws_clients": args.ws_clients,
+            "ws_duration_s": args.ws_duration,
+            "ws_protocol": args.ws_protocol,
+            "lag_tick_ms": LAG_TICK_S * 1000.0,
+        },
+        **results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
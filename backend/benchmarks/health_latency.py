@@ -0,0 +1,114 @@
+"""
+/health latency while the MIRcat status poller is busy
+
+Compares event-loop responsiveness with SDK calls executed inline on the
+event loop (the old behavior) versus on the dedicated SDK executor thread.
+A stand-in SDK object sleeps for a fixed per-call serial latency so the
+benchmark runs without hardware. The app is served by uvicorn on a local
+port and probed over real HTTP from a separate client thread.
+
+Usage (from backend/):
+    python benchmarks/health_latency.py --sdk-latency-ms 4 --requests 200
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+import main  # noqa: E402
+from modules.daylight_mircat.routes import mircat_controller  # noqa: E402
+
+
+class _SlowSDK:
+    """Every MIRcatSDK_* function blocks for a fixed latency and returns success."""
+
+    def __init__(self, latency_s: float):
+        self._latency_s = latency_s
+
+    def __getattr__(self, name):
+        latency_s = self._latency_s
+
+        def _call(*_args):
+            time.sleep(latency_s)
+            return 0
+        return _call
+
+
+async def _inline_run(fn, *args, **kwargs):
+    # Pre-executor behavior: blocking ctypes call directly on the event loop
+    return fn(*args, **kwargs)
+
+
+def _probe(url: str, requests: int) -> list:
+    samples = []
+    with httpx.Client() as client:
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            client.get(url).raise_for_status()
+            samples.append((time.perf_counter() - t0) * 1000.0)
+            time.sleep(0.005)
+    return samples
+
+
+async def _measure(mode: str, sdk_latency_s: float, requests: int, port: int) -> dict:
+    ctl = mircat_controller
+    ctl._sdk = _SlowSDK(sdk_latency_s)
+    ctl.sdk_initialized = True
+    ctl.connected = True
+    ctl.poll_intervals = {tier: 0.0 for tier in ctl.poll_intervals}  # continuous full sweeps
+    executor_run = type(ctl._hw).run.__get__(ctl._hw)
+    ctl._hw.run = _inline_run if mode == "inline" else executor_run
+
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    await ctl.start_status_poller()
+
+    result: dict = {}
+    probe = threading.Thread(
+        target=lambda: result.update(samples=_probe(f"http://127.0.0.1:{port}/health", requests))
+    )
+    probe.start()
+    while probe.is_alive():
+        await asyncio.sleep(0.01)
+
+    await ctl.stop_status_poller()
+    server.should_exit = True
+    await serve_task
+    ctl._hw.run = executor_run
+
+    samples = sorted(result["samples"])
+    return {
+        "mode": mode,
+        "sdk_latency_ms": sdk_latency_s * 1000.0,
+        "p50_ms": round(statistics.median(samples), 3),
+        "p99_ms": round(samples[max(0, int(len(samples) * 0.99) - 1)], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sdk-latency-ms", type=float, default=4.0, help="simulated per-call serial latency")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    logging.getLogger("modules").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    for mode in ("inline", "executor"):
+        print(await _measure(mode, args.sdk_latency_ms / 1000.0, args.requests, args.port))
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,261 @@
+"""
+Per-call Python overhead of MIRcat SDK reads on the status polling path
+
+Compares the old call pattern (fresh c_bool/c_float/... objects and byref
+wrappers on every call, string if/elif dispatch) with the bound prototypes
+and preallocated out-parameter stubs in sdk_bindings. Both paths call the
+same stand-in library: every MIRcatSDK.h function compiled as a C stub that
+returns success immediately, so the numbers isolate the Python side. Without
+a C compiler the stubs fall back to ctypes callbacks, whose own overhead
+then dominates both columns.
+
+Usage (from backend/):
+    python benchmarks/sdk_call_overhead.py --iterations 20000
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from ctypes import CDLL, CFUNCTYPE, byref, c_bool, c_float, c_uint8, c_uint16, c_uint32
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from modules.daylight_mircat.controller import MIRcatController  # noqa: E402
+from modules.daylight_mircat.sdk_bindings import PROTOTYPES, SDK_PREFIX  # noqa: E402
+
+_STATUS_GROUPS = frozenset([
+    "interlocks", "key_switch", "temperature_stable", "tuned", "armed", "emission",
+    "temperatures", "pointing", "pulse", "scan", "sweep_bidirectional",
+])
+
+
+def _compiled_stub_library(workdir: Path):
+    """Build a shared library whose MIRcatSDK_* functions all return 0; returns its path or None."""
+    compiler = shutil.which("cc") or shutil.which("gcc") or shutil.which("clang")
+    if compiler is None:
+        return None
+    source = workdir / "mircat_stub.c"
+    # Empty parameter lists: the stubs ignore whatever the caller passes
+    source.write_text("".join(
+        f"unsigned int {SDK_PREFIX}{name}() {{ return 0; }}\n" for name in PROTOTYPES
+    ))
+    library = workdir / "libMIRcatSDK_stub.so"
+    subprocess.run([compiler, "-O2", "-shared", "-fPIC", "-o", str(library), str(source)], check=True)
+    return library
+
+
+def _legacy_library(library: Path):
+    """Separate handle with restype only, as the controller declared before the bindings."""
+    lib = CDLL(str(library))
+    for name in PROTOTYPES:
+        getattr(lib, SDK_PREFIX + name).restype = c_uint32
+    return lib
+
+
+def _callback_stub_library():
+    """Object exposing every SDK function as a no-op ctypes callback."""
+    lib = type("StubMIRcatSDK", (), {})()
+    for name, argtypes in PROTOTYPES.items():
+        setattr(lib, SDK_PREFIX + name, CFUNCTYPE(c_uint32, *argtypes)(lambda *_args: 0))
+    return lib
+
+
+class _LegacyReads:
+    """The pre-binding controller code for the same reads (unused commands elided)."""
+
+    _SIMPLE_STATUS_READS = MIRcatController._SIMPLE_STATUS_READS
+
+    def __init__(self, sdk):
+        self._sdk = sdk
+        self.current_qcl = 1
+        self.connected = True
+        self.sdk_initialized = True
+
+    def _ensure_sdk(self):
+        if self._sdk is not None:
+            return
+
+    def _sdk_ok(self, ret):
+        return int(ret) == 0
+
+    def _mircat_sdk_call(self, command, value=None):
+        self._ensure_sdk()
+        try:
+            if command == 'isconnected':
+                return bool(self.connected and self.sdk_initialized)
+            elif command == 'isarmed':
+                is_armed = c_bool(False)
+                ret = self._sdk.MIRcatSDK_IsLaserArmed(byref(is_armed))
+                if not self._sdk_ok(ret):
+                    raise Exception(f"IsLaserArmed failed ({int(ret)})")
+                return bool(is_armed.value)
+            elif command == 'istuned':
+                is_tuned = c_bool(False)
+                ret = self._sdk.MIRcatSDK_IsTuned(byref(is_tuned))
+                if not self._sdk_ok(ret):
+                    raise Exception(f"IsTuned failed ({int(ret)})")
+                return bool(is_tuned.value)
+            elif command == 'temperaturestable':
+                at_temp = c_bool(False)
+                ret = self._sdk.MIRcatSDK_AreTECsAtSetTemperature(byref(at_temp))
+                if not self._sdk_ok(ret):
+                    raise Exception(f"AreTECsAtSetTemperature failed ({int(ret)})")
+                return bool(at_temp.value)
+            elif command == 'isinterlocked':
+                interlock = c_bool(False)
+                ret = self._sdk.MIRcatSDK_IsInterlockedStatusSet(byref(interlock))
+                if not self._sdk_ok(ret):
+                    raise Exception(f"IsInterlockedStatusSet failed ({int(ret)})")
+                return bool(interlock.value)
+            elif command == 'iskeyswitch':
+                ks = c_bool(False)
+                ret = self._sdk.MIRcatSDK_IsKeySwitchStatusSet(byref(ks))
+                if not self._sdk_ok(ret):
+                    raise Exception(f"IsKeySwitchStatusSet failed ({int(ret)})")
+                return bool(ks.value)
+            elif command == 'emission':
+                return True
+            elif command == 'isemitting':
+                is_on = c_bool(False)
+                ret = self._sdk.MIRcatSDK_IsEmissionOn(byref(is_on))
+                if not self._sdk_ok(ret):
+                    raise Exception(f"IsEmissionOn failed ({int(ret)})")
+                return bool(is_on.value)
+            elif command in ('arm', 'disarm', 'wavenumber'):
+                return True
+            elif command == 'temperature':
+                qcl = int(self.current_qcl or 1)
+                temp = c_float(0)
+                ret = self._sdk.MIRcatSDK_GetQCLTemperature(c_uint8(qcl), byref(temp))
+                if not self._sdk_ok(ret):
+                    raise Exception(f"GetQCLTemperature failed ({int(ret)}) for QCL {qcl}")
+                return float(temp.value)
+            else:
+                raise Exception(f"Unknown MIRcat SDK command: {command}")
+        except Exception:
+            raise
+
+    def _read_scan_status(self):
+        in_prog = c_bool(False); active = c_bool(False); paused = c_bool(False)
+        cur_scan = c_uint16(0); cur_pct = c_uint16(0); cur_ww = c_float(0)
+        units = c_uint8(0); tec = c_bool(False); motion = c_bool(False)
+        if not self._sdk_ok(self._sdk.MIRcatSDK_GetScanStatus(byref(in_prog), byref(active), byref(paused),
+                                  byref(cur_scan), byref(cur_pct), byref(cur_ww), byref(units), byref(tec), byref(motion))):
+            return None
+        return (bool(in_prog.value), int(cur_scan.value), int(cur_pct.value),
+                float(cur_ww.value), int(units.value), bool(motion.value))
+
+    def _read_hardware_status(self, groups):
+        status = {
+            "connected": self._mircat_sdk_call("isconnected"),
+            "system_fault": False,
+        }
+        readings = {"status": status}
+        for group, (key, command) in self._SIMPLE_STATUS_READS.items():
+            if group in groups:
+                status[key] = self._mircat_sdk_call(command)
+        if "temperatures" in groups:
+            temp = self._mircat_sdk_call("temperature")
+            status["case_temp_1"] = temp
+            status["case_temp_2"] = temp
+            status["pcb_temperature"] = temp
+        if "pointing" in groups:
+            status.update({
+                "pointing_correction": False,
+                "pointing_supported": None,
+                "pointing_x_enabled": None,
+                "pointing_y_enabled": None,
+            })
+            try:
+                if hasattr(self._sdk, 'MIRcatSDK_PointingControlsSupported') and hasattr(self._sdk, 'MIRcatSDK_PointingGetCompensationEnabled'):
+                    supp = c_bool(False)
+                    if self._sdk_ok(self._sdk.MIRcatSDK_PointingControlsSupported(byref(supp))):
+                        status["pointing_supported"] = bool(supp.value)
+                        if bool(supp.value):
+                            xe = c_bool(False); ye = c_bool(False)
+                            if self._sdk_ok(self._sdk.MIRcatSDK_PointingGetCompensationEnabled(byref(xe), byref(ye))):
+                                status["pointing_x_enabled"] = bool(xe.value)
+                                status["pointing_y_enabled"] = bool(ye.value)
+                                status["pointing_correction"] = bool(xe.value) or bool(ye.value)
+            except Exception:
+                pass
+        if "pulse" in groups:
+            try:
+                qcl = int(self.current_qcl or 1)
+                pr = c_float(0); pw = c_float(0)
+                if self._sdk_ok(self._sdk.MIRcatSDK_GetQCLPulseRate(c_uint8(qcl), byref(pr))):
+                    readings["pulse_rate"] = float(pr.value)
+                if self._sdk_ok(self._sdk.MIRcatSDK_GetQCLPulseWidth(c_uint8(qcl), byref(pw))):
+                    readings["pulse_width"] = float(pw.value)
+            except Exception:
+                pass
+        if "scan" in groups:
+            try:
+                readings["scan"] = self._read_scan_status()
+            except Exception:
+                pass
+        if "sweep_bidirectional" in groups:
+            try:
+                bidir = c_bool(False)
+                if self._sdk_ok(self._sdk.MIRcatSDK_IsSweepBidirectional(byref(bidir))):
+                    status["sweep_bidirectional"] = bool(bidir.value)
+            except Exception:
+                pass
+        return readings
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    """Best-of-five mean duration of ``fn()`` in microseconds."""
+    best = float("inf")
+    for _ in range(5):
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / iterations)
+    return best * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=20000, help="calls per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        library = _compiled_stub_library(Path(workdir))
+        if library is None:
+            print("No C compiler found; using ctypes callback stubs")
+            old_lib, new_lib = _callback_stub_library(), _callback_stub_library()
+        else:
+            old_lib, new_lib = _legacy_library(library), CDLL(str(library))
+        _run(old_lib, new_lib, args.iterations)
+
+
+def _run(old_lib, new_lib, iterations: int) -> None:
+    legacy = _LegacyReads(old_lib)
+    controller = MIRcatController()
+    controller._sdk = new_lib
+    controller.connected = True
+    controller.sdk_initialized = True
+
+    cases = [
+        ("GetScanStatus", legacy._read_scan_status, controller._read_scan_status),
+        ("IsEmissionOn via command dispatch", lambda: legacy._mircat_sdk_call("isemitting"),
+         lambda: controller._mircat_sdk_call("isemitting")),
+        ("GetQCLTemperature via command dispatch", lambda: legacy._mircat_sdk_call("temperature"),
+         lambda: controller._mircat_sdk_call("temperature")),
+        ("full status sweep", lambda: legacy._read_hardware_status(_STATUS_GROUPS),
+         lambda: controller._read_hardware_status(_STATUS_GROUPS)),
+    ]
+    print(f"{'call':40s} {'legacy us':>10s} {'bound us':>10s} {'speedup':>8s}")
+    for label, old_fn, new_fn in cases:
+        old_us = _time_per_call(old_fn, iterations)
+        new_us = _time_per_call(new_fn, iterations)
+        print(f"{label:40s} {old_us:10.2f} {new_us:10.2f} {old_us / new_us:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1477 @@
+/*
+ * MIRcat SDK simulator
+ *
+ * A drop-in libMIRcatSDK.so for Linux that implements the subset of
+ * MIRcatSDK.h used by the daylight_mircat controller against a simple
+ * timing model, so the controller can be exercised and benchmarked without
+ * the laser. Point the backend at it with MIRCAT_SDK_DIR.
+ *
+ * Model (all times from CLOCK_MONOTONIC):
+ *   - every SDK call sleeps a fixed serial latency plus optional jitter
+ *   - tuning takes tune_base_ms + |delta cm-1| / tune_rate seconds
+ *   - arming takes arm_ms; the TECs then settle exponentially from their
+ *     current temperature to the set point with time constant tec_tau_s and
+ *     relax back towards ambient after disarming
+ *   - sweep, step & measure and multispectral scans advance with wall time
+ *     (manual process trigger mode advances on ManualStepScanInProgress)
+ *   - errors are injected at random (error_rate, error_code) or for the
+ *     next N calls of a named function
+ *
+ * Parameters come from MIRCAT_SIM_<NAME> environment variables (for example
+ * MIRCAT_SIM_LATENCY_US=2000) and can be changed at run time with
+ * MIRcatSim_SetParam. MIRCAT_SIM_FAIL="TuneToWW:80:1,GetScanStatus:100:3"
+ * queues targeted failures (function:code:count, count -1 = forever).
+ *
+ * Build: make (produces libMIRcatSDK.so next to this file)
+ */
+
+#include <ctype.h>
+#include <math.h>
+#include <pthread.h>
+#include <stdbool.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#define EXPORT __attribute__((visibility("default")))
+
+/* Return codes (MIRcatSDKConstants.py) */
+#define RET_SUCCESS 0
+#define RET_INDEX_OUTOFBOUNDS 73
+#define RET_START_MULTISPECTRALSCAN_FAILURE 74
+#define RET_TOO_MANY_ELEMENTS 75
+#define RET_NOT_ENOUGH_ELEMENTS 76
+#define RET_WW_OUTOFTUNINGRANGE 80
+#define RET_NO_SCAN_INPROGRESS 81
+#define RET_PULSERATE_OUTOFRANGE 86
+#define RET_PULSEWIDTH_OUTOFRANGE 87
+#define RET_CURRENT_OUTOFRANGE 88
+#define RET_QCL_NUM_OUTOFRANGE 90
+#define RET_LASER_NOT_ARMED 93
+#define RET_LASER_NOT_TUNED 94
+#define RET_TECS_NOT_AT_SET_TEMPERATURE 95
+#define RET_COMM_ERROR 100
+#define RET_NOT_INITIALIZED 101
+
+#define UNITS_MICRONS 1
+#define UNITS_CM1 2
+#define PROC_TRIG_MODE_MANUAL 3
+
+#define MAX_QCLS 4
+#define MAX_ELEMENTS 255
+#define MAX_FAIL_RULES 32
+
+/* ------------------------------------------------------------------------- */
+/* Parameters                                                                */
+/* ------------------------------------------------------------------------- */
+
+enum {
+    P_LATENCY_US,
+    P_LATENCY_JITTER_US,
+    P_TUNE_BASE_MS,
+    P_TUNE_RATE,
+    P_ARM_MS,
+    P_EMISSION_MS,
+    P_TEC_AMBIENT_C,
+    P_TEC_SETPOINT_C,
+    P_TEC_TAU_S,
+    P_TEC_TOLERANCE_C,
+    P_NUM_QCLS,
+    P_WAVENUMBER_MIN,
+    P_WAVENUMBER_MAX,
+    P_DEFAULT_STEP_TIME_MS,
+    P_ERROR_RATE,
+    P_ERROR_CODE,
+    P_SEED,
+    P_POINTING_SUPPORTED,
+    P_COUNT
+};
+
+static const char *g_param_names[P_COUNT] = {
+    "latency_us", "latency_jitter_us", "tune_base_ms", "tune_rate", "arm_ms",
+    "emission_ms", "tec_ambient_c", "tec_setpoint_c", "tec_tau_s",
+    "tec_tolerance_c", "num_qcls", "wavenumber_min", "wavenumber_max",
+    "default_step_time_ms", "error_rate", "error_code", "seed",
+    "pointing_supported",
+};
+
+static double g_params[P_COUNT] = {
+    1000.0,   /* latency_us: serial round trip per SDK call */
+    0.0,      /* latency_jitter_us: uniform extra latency */
+    50.0,     /* tune_base_ms: fixed settling time of every tune */
+    2000.0,   /* tune_rate: cm-1 per second */
+    200.0,    /* arm_ms */
+    50.0,     /* emission_ms */
+    25.0,     /* tec_ambient_c */
+    19.0,     /* tec_setpoint_c */
+    2.0,      /* tec_tau_s */
+    0.1,      /* tec_tolerance_c */
+    1.0,      /* num_qcls */
+    1638.81,  /* wavenumber_min (cm-1, split evenly across QCLs) */
+    2077.27,  /* wavenumber_max */
+    1000.0,   /* default_step_time_ms until SetWlTrigParams is called */
+    0.0,      /* error_rate: probability that any call fails */
+    RET_COMM_ERROR, /* error_code returned by random failures */
+    1.0,      /* seed */
+    1.0,      /* pointing_supported */
+};
+
+typedef struct {
+    char function[64];
+    uint32_t code;
+    int32_t remaining; /* -1: forever */
+} fail_rule;
+
+static fail_rule g_fail_rules[MAX_FAIL_RULES];
+static int g_num_fail_rules;
+static unsigned int g_rand_state = 1;
+static uint64_t g_call_count;
+
+static pthread_mutex_t g_lock = PTHREAD_MUTEX_INITIALIZER;
+static pthread_once_t g_once = PTHREAD_ONCE_INIT;
+
+/* ------------------------------------------------------------------------- */
+/* Device state                                                              */
+/* ------------------------------------------------------------------------- */
+
+enum { SCAN_NONE, SCAN_SWEEP, SCAN_STEP, SCAN_MULTI };
+
+typedef struct {
+    float wavenumber; /* cm-1 */
+    uint8_t units;    /* units the element was given in */
+    uint32_t dwell_us;
+    uint32_t off_us;
+} ms_element;
+
+typedef struct {
+    int mode;
+    double t0;
+    uint16_t num_scans;
+    uint8_t units;
+    double start_cm1;    /* wavenumber when the scan was started */
+    /* sweep: native units */
+    float sweep_start, sweep_stop, sweep_speed;
+    bool bidirectional;
+    /* step & measure: native units */
+    float step_start, step_stop, step_size;
+    uint32_t step_count;
+    bool manual;
+    uint32_t manual_steps;
+    double manual_t;
+} scan_state;
+
+static struct {
+    bool initialized;
+    bool arm_requested;
+    double arm_t;
+    bool emission_requested;
+    double emission_t;
+    /* TEC: T(t) = to + (from - to) * exp(-(t - t0) / tau) */
+    double tec_from, tec_to, tec_t0;
+    /* tuning */
+    bool tune_valid;
+    uint8_t qcl;
+    double tune_from, tune_to, tune_t0, tune_dur; /* cm-1 */
+    uint8_t tune_units;
+    scan_state scan;
+    /* sweep configuration (readback) */
+    float cfg_sweep_start, cfg_sweep_stop, cfg_sweep_speed;
+    uint8_t cfg_sweep_units;
+    uint16_t cfg_sweep_scans;
+    bool cfg_sweep_bidir;
+    bool adv_channel[MAX_QCLS + 1];
+    /* step & measure configuration (readback) */
+    float cfg_step_start, cfg_step_stop, cfg_step_size;
+    uint8_t cfg_step_units;
+    uint16_t cfg_step_scans;
+    /* multispectral table */
+    uint8_t ms_expected;
+    uint8_t ms_count;
+    ms_element ms[MAX_ELEMENTS];
+    uint16_t ms_scans;
+    /* wavelength trigger parameters */
+    uint8_t pulse_mode, proc_mode, wl_units;
+    float wl_start, wl_stop, wl_interval;
+    uint32_t step_time_us, step_delay_us;
+    bool wl_params_set;
+    /* per-QCL pulse parameters, index 1..MAX_QCLS */
+    float pulse_rate[MAX_QCLS + 1], pulse_width[MAX_QCLS + 1], current_ma[MAX_QCLS + 1];
+    bool pointing_x, pointing_y;
+} S;
+
+/* ------------------------------------------------------------------------- */
+/* Helpers                                                                   */
+/* ------------------------------------------------------------------------- */
+
+static double now_s(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec * 1e-9;
+}
+
+static void sleep_us(double us)
+{
+    if (us <= 0.0)
+        return;
+    struct timespec ts;
+    ts.tv_sec = (time_t)(us / 1e6);
+    ts.tv_nsec = (long)((us - (double)ts.tv_sec * 1e6) * 1e3);
+    while (nanosleep(&ts, &ts) != 0) {
+    }
+}
+
+static double to_cm1(double value, uint8_t units)
+{
+    if (units == UNITS_MICRONS)
+        return value > 0.0 ? 10000.0 / value : 0.0;
+    return value;
+}
+
+static double from_cm1(double cm1, uint8_t units)
+{
+    if (units == UNITS_MICRONS)
+        return cm1 > 0.0 ? 10000.0 / cm1 : 0.0;
+    return cm1;
+}
+
+static int num_qcls(void)
+{
+    int n = (int)g_params[P_NUM_QCLS];
+    return n < 1 ? 1 : (n > MAX_QCLS ? MAX_QCLS : n);
+}
+
+static void qcl_range(int qcl, double *lo, double *hi)
+{
+    double span = (g_params[P_WAVENUMBER_MAX] - g_params[P_WAVENUMBER_MIN]) / num_qcls();
+    *lo = g_params[P_WAVENUMBER_MIN] + span * (qcl - 1);
+    *hi = *lo + span;
+}
+
+static bool in_tuning_range(double cm1)
+{
+    return cm1 >= g_params[P_WAVENUMBER_MIN] - 1e-3 && cm1 <= g_params[P_WAVENUMBER_MAX] + 1e-3;
+}
+
+static double tune_time(double from_cm1_, double to_cm1_)
+{
+    double rate = g_params[P_TUNE_RATE] > 0.0 ? g_params[P_TUNE_RATE] : 1e9;
+    return g_params[P_TUNE_BASE_MS] / 1e3 + fabs(to_cm1_ - from_cm1_) / rate;
+}
+
+static double tec_temperature(double t)
+{
+    double tau = g_params[P_TEC_TAU_S] > 0.0 ? g_params[P_TEC_TAU_S] : 1e-9;
+    return S.tec_to + (S.tec_from - S.tec_to) * exp(-(t - S.tec_t0) / tau);
+}
+
+static void tec_retarget(double t, double target)
+{
+    S.tec_from = tec_temperature(t);
+    S.tec_to = target;
+    S.tec_t0 = t;
+}
+
+static bool is_armed(double t)
+{
+    return S.arm_requested && t >= S.arm_t + g_params[P_ARM_MS] / 1e3;
+}
+
+static bool tecs_at_temperature(double t)
+{
+    return is_armed(t) && fabs(tec_temperature(t) - g_params[P_TEC_SETPOINT_C]) <= g_params[P_TEC_TOLERANCE_C];
+}
+
+static double tuned_position(double t)
+{
+    if (!S.tune_valid)
+        return 0.0;
+    if (t >= S.tune_t0 + S.tune_dur || S.tune_dur <= 0.0)
+        return S.tune_to;
+    return S.tune_from + (S.tune_to - S.tune_from) * (t - S.tune_t0) / S.tune_dur;
+}
+
+static void set_position(double t, double cm1)
+{
+    S.tune_valid = true;
+    S.tune_from = S.tune_to = cm1;
+    S.tune_t0 = t;
+    S.tune_dur = 0.0;
+}
+
+/* ------------------------------------------------------------------------- */
+/* Scan timeline                                                             */
+/* ------------------------------------------------------------------------- */
+
+typedef struct {
+    bool done;
+    uint16_t scan_number; /* 1-based */
+    uint16_t percent;
+    double position;      /* in scan units (element units for multispectral) */
+    uint8_t units;
+    bool motion;
+    double end_cm1;
+} scan_point;
+
+static double step_dwell_s(void)
+{
+    if (!S.wl_params_set)
+        return g_params[P_DEFAULT_STEP_TIME_MS] / 1e3;
+    return (S.step_time_us + S.step_delay_us) / 1e6;
+}
+
+static double step_position(uint32_t index)
+{
+    const scan_state *sc = &S.scan;
+    double dir = sc->step_stop >= sc->step_start ? 1.0 : -1.0;
+    return sc->step_start + dir * fabs(sc->step_size) * index;
+}
+
+/* Element i of a step or multispectral pass: wavenumber (cm-1) */
+static double element_cm1(uint32_t i)
+{
+    if (S.scan.mode == SCAN_MULTI)
+        return S.ms[i].wavenumber;
+    return to_cm1(step_position(i), S.scan.units);
+}
+
+static uint32_t element_count(void)
+{
+    return S.scan.mode == SCAN_MULTI ? S.ms_count : S.scan.step_count;
+}
+
+static double element_hold_s(uint32_t i)
+{
+    if (S.scan.mode == SCAN_MULTI)
+        return (S.ms[i].dwell_us + S.ms[i].off_us) / 1e6;
+    return step_dwell_s();
+}
+
+/* Duration of pass p; only the tune into the first element differs between passes */
+static double pass_duration(uint32_t pass)
+{
+    const scan_state *sc = &S.scan;
+    if (sc->mode == SCAN_SWEEP) {
+        double sweep = fabs(sc->sweep_stop - sc->sweep_start) / (sc->sweep_speed > 0 ? sc->sweep_speed : 1e-9);
+        double lead;
+        if (pass == 0)
+            lead = tune_time(sc->start_cm1, to_cm1(sc->sweep_start, sc->units));
+        else if (sc->bidirectional)
+            lead = 0.0;
+        else
+            lead = tune_time(to_cm1(sc->sweep_stop, sc->units), to_cm1(sc->sweep_start, sc->units));
+        return lead + sweep;
+    }
+    uint32_t n = element_count();
+    if (n == 0)
+        return 0.0;
+    double total = 0.0;
+    double prev = pass == 0 ? sc->start_cm1 : element_cm1(n - 1);
+    for (uint32_t i = 0; i < n; i++) {
+        double cur = element_cm1(i);
+        total += tune_time(prev, cur) + element_hold_s(i);
+        prev = cur;
+    }
+    return total;
+}
+
+static void locate_sweep(double e, uint32_t pass, scan_point *out)
+{
+    const scan_state *sc = &S.scan;
+    double sweep = fabs(sc->sweep_stop - sc->sweep_start) / (sc->sweep_speed > 0 ? sc->sweep_speed : 1e-9);
+    double lead = pass_duration(pass) - sweep;
+    bool reverse = sc->bidirectional && (pass % 2 == 1);
+    double a = reverse ? sc->sweep_stop : sc->sweep_start;
+    double b = reverse ? sc->sweep_start : sc->sweep_stop;
+    out->units = sc->units;
+    if (e < lead) {
+        double from = pass == 0 ? sc->start_cm1 : to_cm1(sc->sweep_stop, sc->units);
+        double f = lead > 0 ? e / lead : 1.0;
+        out->position = from_cm1(from + (to_cm1(a, sc->units) - from) * f, sc->units);
+        out->percent = 0;
+        out->motion = true;
+        return;
+    }
+    double f = sweep > 0 ? (e - lead) / sweep : 1.0;
+    if (f > 1.0)
+        f = 1.0;
+    out->position = a + (b - a) * f;
+    out->percent = (uint16_t)(f * 100.0);
+    out->motion = true;
+}
+
+static void locate_elements(double e, uint32_t pass, scan_point *out)
+{
+    uint32_t n = element_count();
+    if (n == 0) {
+        out->units = S.scan.units;
+        out->position = from_cm1(S.scan.start_cm1, S.scan.units);
+        return;
+    }
+    double prev = pass == 0 ? S.scan.start_cm1 : element_cm1(n - 1);
+    for (uint32_t i = 0; i < n; i++) {
+        double cur = element_cm1(i);
+        double tune = tune_time(prev, cur);
+        double hold = element_hold_s(i);
+        uint8_t units = S.scan.mode == SCAN_MULTI ? S.ms[i].units : S.scan.units;
+        out->units = units;
+        out->percent = (uint16_t)(i * 100 / n);
+        if (e < tune) {
+            out->position = from_cm1(prev + (cur - prev) * (e / tune), units);
+            out->motion = true;
+            return;
+        }
+        e -= tune;
+        if (e < hold || i == n - 1) {
+            out->position = from_cm1(cur, units);
+            out->motion = false;
+            return;
+        }
+        e -= hold;
+        prev = cur;
+    }
+}
+
+static void locate_manual(scan_point *out, double t)
+{
+    const scan_state *sc = &S.scan;
+    uint32_t n = sc->step_count;
+    uint32_t total = n * (sc->num_scans ? sc->num_scans : 1);
+    uint32_t steps = sc->manual_steps < total ? sc->manual_steps : total - 1;
+    uint32_t i = steps % n;
+    double cur = element_cm1(i);
+    double prev = steps == 0 ? sc->start_cm1 : element_cm1((i + n - 1) % n);
+    double tune = tune_time(prev, cur);
+    double e = t - sc->manual_t;
+    out->done = sc->manual_steps >= total;
+    out->scan_number = (uint16_t)(steps / n + 1);
+    out->percent = (uint16_t)(i * 100 / n);
+    out->units = sc->units;
+    out->motion = e < tune;
+    out->position = from_cm1(out->motion ? prev + (cur - prev) * (e / tune) : cur, sc->units);
+    out->end_cm1 = cur;
+}
+
+static scan_point scan_locate(double t)
+{
+    scan_point out;
+    memset(&out, 0, sizeof(out));
+    const scan_state *sc = &S.scan;
+    if (sc->mode == SCAN_STEP && sc->manual) {
+        locate_manual(&out, t);
+        return out;
+    }
+    double e = t - sc->t0;
+    double first = pass_duration(0);
+    double later = sc->num_scans > 1 ? pass_duration(1) : 0.0;
+    double total = first + later * (sc->num_scans > 0 ? sc->num_scans - 1 : 0);
+    if (e >= total) {
+        out.done = true;
+        out.scan_number = sc->num_scans;
+        out.percent = 100;
+        if (sc->mode == SCAN_SWEEP) {
+            bool reverse = sc->bidirectional && sc->num_scans % 2 == 0;
+            out.end_cm1 = to_cm1(reverse ? sc->sweep_start : sc->sweep_stop, sc->units);
+        } else {
+            uint32_t n = element_count();
+            out.end_cm1 = n > 0 ? element_cm1(n - 1) : sc->start_cm1;
+        }
+        return out;
+    }
+    uint32_t pass = 0;
+    if (e >= first && later > 0.0) {
+        pass = 1 + (uint32_t)((e - first) / later);
+        e = e - first - later * (pass - 1);
+    }
+    out.scan_number = (uint16_t)(pass + 1);
+    if (sc->mode == SCAN_SWEEP)
+        locate_sweep(e, pass, &out);
+    else
+        locate_elements(e, pass, &out);
+    return out;
+}
+
+/* Retire a finished scan so tuning state reflects where it ended */
+static void scan_update(double t)
+{
+    if (S.scan.mode == SCAN_NONE)
+        return;
+    scan_point p = scan_locate(t);
+    if (p.done) {
+        S.scan.mode = SCAN_NONE;
+        set_position(t, p.end_cm1);
+    }
+}
+
+static void scan_abort(double t)
+{
+    if (S.scan.mode == SCAN_NONE)
+        return;
+    scan_point p = scan_locate(t);
+    set_position(t, p.done ? p.end_cm1 : to_cm1(p.position, p.units));
+    S.scan.mode = SCAN_NONE;
+}
+
+static void scan_begin(double t, int mode, uint16_t num_scans, uint8_t units)
+{
+    scan_abort(t);
+    memset(&S.scan, 0, sizeof(S.scan));
+    S.scan.mode = mode;
+    S.scan.t0 = t;
+    S.scan.num_scans = num_scans ? num_scans : 1;
+    S.scan.units = units;
+    S.scan.start_cm1 = S.tune_valid ? tuned_position(t) : g_params[P_WAVENUMBER_MIN];
+}
+
+/* ------------------------------------------------------------------------- */
+/* Call entry: latency, error injection, locking                             */
+/* ------------------------------------------------------------------------- */
+
+/* Power-on state: cold TECs, untuned, nothing armed */
+static void reset_state(void)
+{
+    memset(&S, 0, sizeof(S));
+    S.tec_from = S.tec_to = g_params[P_TEC_AMBIENT_C];
+    S.tec_t0 = now_s();
+    S.qcl = 1;
+    for (int q = 1; q <= MAX_QCLS; q++) {
+        S.pulse_rate[q] = 100000.0f;
+        S.pulse_width[q] = 500.0f;
+        S.current_ma[q] = 500.0f;
+        S.adv_channel[q] = true;
+    }
+}
+
+static void load_params(void)
+{
+    char key[64];
+    for (int i = 0; i < P_COUNT; i++) {
+        snprintf(key, sizeof(key), "MIRCAT_SIM_%s", g_param_names[i]);
+        for (char *c = key; *c; c++)
+            *c = (char)toupper((unsigned char)*c);
+        const char *value = getenv(key);
+        if (value && *value)
+            g_params[i] = atof(value);
+    }
+    g_rand_state = (unsigned int)g_params[P_SEED];
+    const char *fail = getenv("MIRCAT_SIM_FAIL");
+    if (fail && *fail) {
+        char buf[1024];
+        snprintf(buf, sizeof(buf), "%s", fail);
+        char *save = NULL;
+        for (char *tok = strtok_r(buf, ",", &save); tok && g_num_fail_rules < MAX_FAIL_RULES;
+             tok = strtok_r(NULL, ",", &save)) {
+            fail_rule *r = &g_fail_rules[g_num_fail_rules];
+            unsigned int code = RET_COMM_ERROR;
+            int count = 1;
+            if (sscanf(tok, "%63[^:]:%u:%d", r->function, &code, &count) >= 1) {
+                r->code = code;
+                r->remaining = count;
+                g_num_fail_rules++;
+            }
+        }
+    }
+    reset_state();
+}
+
+static uint32_t injected_error(const char *function)
+{
+    for (int i = 0; i < g_num_fail_rules; i++) {
+        fail_rule *r = &g_fail_rules[i];
+        if (r->remaining == 0)
+            continue;
+        if (strcmp(r->function, function) != 0 && strcmp(r->function, "*") != 0)
+            continue;
+        if (r->remaining > 0)
+            r->remaining--;
+        return r->code;
+    }
+    if (g_params[P_ERROR_RATE] > 0.0 &&
+        (double)rand_r(&g_rand_state) / RAND_MAX < g_params[P_ERROR_RATE])
+        return (uint32_t)g_params[P_ERROR_CODE];
+    return RET_SUCCESS;
+}
+
+static uint32_t sim_enter(const char *function, bool require_init)
+{
+    pthread_once(&g_once, load_params);
+    pthread_mutex_lock(&g_lock);
+    g_call_count++;
+    double latency = g_params[P_LATENCY_US];
+    if (g_params[P_LATENCY_JITTER_US] > 0.0)
+        latency += g_params[P_LATENCY_JITTER_US] * ((double)rand_r(&g_rand_state) / RAND_MAX);
+    uint32_t rc = injected_error(function);
+    pthread_mutex_unlock(&g_lock);
+    /* The serial round trip happens outside the lock, like a blocking port read */
+    sleep_us(latency);
+    if (rc != RET_SUCCESS)
+        return rc;
+    pthread_mutex_lock(&g_lock);
+    if (require_init && !S.initialized) {
+        pthread_mutex_unlock(&g_lock);
+        return RET_NOT_INITIALIZED;
+    }
+    scan_update(now_s());
+    return RET_SUCCESS;
+}
+
+#define SIM_ENTER_(name, require_init)                          \
+    do {                                                        \
+        uint32_t sim_rc_ = sim_enter(name, require_init);       \
+        if (sim_rc_ != RET_SUCCESS)                             \
+            return sim_rc_;                                     \
+    } while (0)
+#define SIM_ENTER(name) SIM_ENTER_(name, true)
+#define SIM_RETURN(code)                                        \
+    do {                                                        \
+        uint32_t sim_ret_ = (code);                             \
+        pthread_mutex_unlock(&g_lock);                          \
+        return sim_ret_;                                        \
+    } while (0)
+#define CHECK_QCL(q)                                            \
+    do {                                                        \
+        if ((q) < 1 || (q) > num_qcls())                        \
+            SIM_RETURN(RET_QCL_NUM_OUTOFRANGE);                 \
+    } while (0)
+
+/* ------------------------------------------------------------------------- */
+/* Simulator control API                                                     */
+/* ------------------------------------------------------------------------- */
+
+EXPORT uint32_t MIRcatSim_SetParam(const char *name, double value)
+{
+    pthread_once(&g_once, load_params);
+    pthread_mutex_lock(&g_lock);
+    for (int i = 0; i < P_COUNT; i++) {
+        if (strcmp(name, g_param_names[i]) == 0) {
+            g_params[i] = value;
+            if (i == P_SEED)
+                g_rand_state = (unsigned int)value;
+            SIM_RETURN(RET_SUCCESS);
+        }
+    }
+    SIM_RETURN(RET_INDEX_OUTOFBOUNDS);
+}
+
+EXPORT uint32_t MIRcatSim_GetParam(const char *name, double *value)
+{
+    pthread_once(&g_once, load_params);
+    pthread_mutex_lock(&g_lock);
+    for (int i = 0; i < P_COUNT; i++) {
+        if (strcmp(name, g_param_names[i]) == 0) {
+            *value = g_params[i];
+            SIM_RETURN(RET_SUCCESS);
+        }
+    }
+    SIM_RETURN(RET_INDEX_OUTOFBOUNDS);
+}
+
+/* Fail the next `count` calls of `function` (name without prefix, "*" = any) */
+EXPORT uint32_t MIRcatSim_InjectError(const char *function, uint32_t code, int32_t count)
+{
+    pthread_once(&g_once, load_params);
+    pthread_mutex_lock(&g_lock);
+    if (g_num_fail_rules >= MAX_FAIL_RULES)
+        SIM_RETURN(RET_TOO_MANY_ELEMENTS);
+    fail_rule *r = &g_fail_rules[g_num_fail_rules++];
+    snprintf(r->function, sizeof(r->function), "%s", function);
+    r->code = code;
+    r->remaining = count;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSim_ClearErrors(void)
+{
+    pthread_once(&g_once, load_params);
+    pthread_mutex_lock(&g_lock);
+    g_num_fail_rules = 0;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSim_GetCallCount(uint64_t *count)
+{
+    pthread_once(&g_once, load_params);
+    pthread_mutex_lock(&g_lock);
+    *count = g_call_count;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+/* Power-cycle the simulated laser (parameters and injected errors are kept) */
+EXPORT uint32_t MIRcatSim_Reset(void)
+{
+    pthread_once(&g_once, load_params);
+    pthread_mutex_lock(&g_lock);
+    reset_state();
+    SIM_RETURN(RET_SUCCESS);
+}
+
+/* ------------------------------------------------------------------------- */
+/* API / connection                                                          */
+/* ------------------------------------------------------------------------- */
+
+EXPORT uint32_t MIRcatSDK_GetAPIVersion(uint16_t *major, uint16_t *minor, uint16_t *patch)
+{
+    SIM_ENTER_("GetAPIVersion", false);
+    *major = 2;
+    *minor = 5;
+    *patch = 0;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_SetCommType(uint8_t comm_type)
+{
+    (void)comm_type;
+    SIM_ENTER_("SetCommType", false);
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_SetSerialParams(uint16_t port, uint32_t baud)
+{
+    (void)port;
+    (void)baud;
+    SIM_ENTER_("SetSerialParams", false);
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_Initialize(void)
+{
+    SIM_ENTER_("Initialize", false);
+    S.initialized = true;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_DeInitialize(void)
+{
+    SIM_ENTER_("DeInitialize", false);
+    S.initialized = false;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_IsConnectedToLaser(bool *connected)
+{
+    SIM_ENTER_("IsConnectedToLaser", false);
+    *connected = S.initialized;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetNumInstalledQcls(uint8_t *count)
+{
+    SIM_ENTER("GetNumInstalledQcls");
+    *count = (uint8_t)num_qcls();
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetTuningRange(float *min_ww, float *max_ww, uint8_t *units)
+{
+    SIM_ENTER("GetTuningRange");
+    *min_ww = (float)g_params[P_WAVENUMBER_MIN];
+    *max_ww = (float)g_params[P_WAVENUMBER_MAX];
+    *units = UNITS_CM1;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetQclTuningRange(uint8_t qcl, float *min_ww, float *max_ww, uint8_t *units)
+{
+    SIM_ENTER("GetQclTuningRange");
+    CHECK_QCL(qcl);
+    double lo, hi;
+    qcl_range(qcl, &lo, &hi);
+    *min_ww = (float)lo;
+    *max_ww = (float)hi;
+    *units = UNITS_CM1;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+/* ------------------------------------------------------------------------- */
+/* Status                                                                    */
+/* ------------------------------------------------------------------------- */
+
+EXPORT uint32_t MIRcatSDK_IsInterlockedStatusSet(bool *set)
+{
+    SIM_ENTER("IsInterlockedStatusSet");
+    *set = true;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_IsKeySwitchStatusSet(bool *set)
+{
+    SIM_ENTER("IsKeySwitchStatusSet");
+    *set = true;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_IsSystemError(bool *error)
+{
+    SIM_ENTER("IsSystemError");
+    *error = false;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetSystemErrorWord(uint16_t *word)
+{
+    SIM_ENTER("GetSystemErrorWord");
+    *word = 0;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_ClearSystemError(bool *cleared)
+{
+    SIM_ENTER("ClearSystemError");
+    *cleared = true;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetWWDisplayUnits(uint8_t *units)
+{
+    SIM_ENTER("GetWWDisplayUnits");
+    *units = UNITS_CM1;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetActiveQcl(uint8_t *qcl)
+{
+    SIM_ENTER("GetActiveQcl");
+    *qcl = S.qcl;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetScanStatus(bool *in_progress, bool *active, bool *paused,
+                                        uint16_t *scan_number, uint16_t *scan_percent,
+                                        float *current_ww, uint8_t *units, bool *tec, bool *motion)
+{
+    SIM_ENTER("GetScanStatus");
+    double t = now_s();
+    *paused = false;
+    *tec = tecs_at_temperature(t);
+    if (S.scan.mode == SCAN_NONE) {
+        *in_progress = false;
+        *active = false;
+        *scan_number = 0;
+        *scan_percent = 0;
+        *units = S.tune_valid ? S.tune_units : UNITS_CM1;
+        *current_ww = (float)from_cm1(tuned_position(t), *units);
+        *motion = S.tune_valid && t < S.tune_t0 + S.tune_dur;
+        SIM_RETURN(RET_SUCCESS);
+    }
+    scan_point p = scan_locate(t);
+    *in_progress = true;
+    *active = true;
+    *scan_number = p.scan_number;
+    *scan_percent = p.percent;
+    *current_ww = (float)p.position;
+    *units = p.units;
+    *motion = p.motion;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetScanWaitingProcessTrigger(bool *waiting)
+{
+    SIM_ENTER("GetScanWaitingProcessTrigger");
+    *waiting = S.scan.mode == SCAN_STEP && S.scan.manual;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+/* ------------------------------------------------------------------------- */
+/* Arming, emission and TECs                                                 */
+/* ------------------------------------------------------------------------- */
+
+static void arm(double t)
+{
+    if (S.arm_requested)
+        return;
+    S.arm_requested = true;
+    S.arm_t = t;
+    /* TECs start pulling towards the set point once the arm sequence completes */
+    tec_retarget(t + g_params[P_ARM_MS] / 1e3, g_params[P_TEC_SETPOINT_C]);
+}
+
+static void disarm(double t)
+{
+    scan_abort(t);
+    S.arm_requested = false;
+    S.emission_requested = false;
+    tec_retarget(t, g_params[P_TEC_AMBIENT_C]);
+}
+
+EXPORT uint32_t MIRcatSDK_ArmLaser(void)
+{
+    SIM_ENTER("ArmLaser");
+    arm(now_s());
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_DisarmLaser(void)
+{
+    SIM_ENTER("DisarmLaser");
+    disarm(now_s());
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_ArmDisarmLaser(void)
+{
+    SIM_ENTER("ArmDisarmLaser");
+    double t = now_s();
+    if (S.arm_requested)
+        disarm(t);
+    else
+        arm(t);
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_IsLaserArmed(bool *armed)
+{
+    SIM_ENTER("IsLaserArmed");
+    *armed = is_armed(now_s());
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_AreTECsAtSetTemperature(bool *at_temperature)
+{
+    SIM_ENTER("AreTECsAtSetTemperature");
+    *at_temperature = tecs_at_temperature(now_s());
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetQCLTemperature(uint8_t qcl, float *temperature)
+{
+    SIM_ENTER("GetQCLTemperature");
+    CHECK_QCL(qcl);
+    double t = now_s();
+    /* Before the arm sequence completes the TEC target change has not started */
+    *temperature = (float)(t < S.tec_t0 ? S.tec_from : tec_temperature(t));
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetQclSetTemperature(uint8_t qcl, float *temperature)
+{
+    SIM_ENTER("GetQclSetTemperature");
+    CHECK_QCL(qcl);
+    *temperature = (float)g_params[P_TEC_SETPOINT_C];
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetTecCurrent(uint8_t qcl, int16_t *current_ma)
+{
+    SIM_ENTER("GetTecCurrent");
+    CHECK_QCL(qcl);
+    double t = now_s();
+    double error = t < S.tec_t0 ? 0.0 : tec_temperature(t) - S.tec_to;
+    /* Proportional drive, clamped to the TEC supply */
+    double drive = fmax(-2000.0, fmin(2000.0, error * 400.0));
+    *current_ma = (int16_t)drive;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetSystemTemperatures(float *case1, float *case2, float *pcb)
+{
+    SIM_ENTER("GetSystemTemperatures");
+    *case1 = (float)g_params[P_TEC_AMBIENT_C];
+    *case2 = (float)g_params[P_TEC_AMBIENT_C];
+    *pcb = (float)(g_params[P_TEC_AMBIENT_C] + 5.0);
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_TurnEmissionOn(void)
+{
+    SIM_ENTER("TurnEmissionOn");
+    double t = now_s();
+    if (!is_armed(t))
+        SIM_RETURN(RET_LASER_NOT_ARMED);
+    if (!tecs_at_temperature(t))
+        SIM_RETURN(RET_TECS_NOT_AT_SET_TEMPERATURE);
+    if (!S.tune_valid)
+        SIM_RETURN(RET_LASER_NOT_TUNED);
+    if (!S.emission_requested) {
+        S.emission_requested = true;
+        S.emission_t = t;
+    }
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_TurnEmissionOff(void)
+{
+    SIM_ENTER("TurnEmissionOff");
+    S.emission_requested = false;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_IsEmissionOn(bool *on)
+{
+    SIM_ENTER("IsEmissionOn");
+    *on = S.emission_requested && now_s() >= S.emission_t + g_params[P_EMISSION_MS] / 1e3;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+/* ------------------------------------------------------------------------- */
+/* Tuning                                                                    */
+/* ------------------------------------------------------------------------- */
+
+EXPORT uint32_t MIRcatSDK_TuneToWW(float ww, uint8_t units, uint8_t qcl)
+{
+    SIM_ENTER("TuneToWW");
+    CHECK_QCL(qcl);
+    double target = to_cm1(ww, units);
+    if (!in_tuning_range(target))
+        SIM_RETURN(RET_WW_OUTOFTUNINGRANGE);
+    double t = now_s();
+    scan_abort(t);
+    double from = S.tune_valid ? tuned_position(t) : target;
+    S.tune_valid = true;
+    S.tune_from = from;
+    S.tune_to = target;
+    S.tune_t0 = t;
+    S.tune_dur = tune_time(from, target);
+    S.tune_units = units;
+    S.qcl = qcl;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_IsTuned(bool *tuned)
+{
+    SIM_ENTER("IsTuned");
+    double t = now_s();
+    *tuned = S.tune_valid && S.scan.mode == SCAN_NONE && t >= S.tune_t0 + S.tune_dur;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetActualWW(float *ww, uint8_t *units, bool *light_valid)
+{
+    SIM_ENTER("GetActualWW");
+    double t = now_s();
+    *units = S.tune_valid ? S.tune_units : UNITS_CM1;
+    if (S.scan.mode != SCAN_NONE) {
+        scan_point p = scan_locate(t);
+        *ww = (float)from_cm1(to_cm1(p.position, p.units), *units);
+    } else {
+        *ww = (float)from_cm1(tuned_position(t), *units);
+    }
+    *light_valid = S.emission_requested && t >= S.emission_t + g_params[P_EMISSION_MS] / 1e3;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetTuneWW(float *ww, uint8_t *units, uint8_t *qcl)
+{
+    SIM_ENTER("GetTuneWW");
+    *units = S.tune_valid ? S.tune_units : UNITS_CM1;
+    *ww = (float)from_cm1(S.tune_to, *units);
+    *qcl = S.qcl;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_CancelManualTuneMode(void)
+{
+    SIM_ENTER("CancelManualTuneMode");
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_ConvertWW(float ww, uint8_t from_units, uint8_t to_units, float *out)
+{
+    SIM_ENTER_("ConvertWW", false);
+    *out = (float)from_cm1(to_cm1(ww, from_units), to_units);
+    SIM_RETURN(RET_SUCCESS);
+}
+
+/* ------------------------------------------------------------------------- */
+/* Pulse parameters                                                          */
+/* ------------------------------------------------------------------------- */
+
+EXPORT uint32_t MIRcatSDK_SetQCLParams(uint8_t qcl, float pulse_rate, float pulse_width, float current_ma)
+{
+    SIM_ENTER("SetQCLParams");
+    CHECK_QCL(qcl);
+    if (pulse_rate <= 0.0f)
+        SIM_RETURN(RET_PULSERATE_OUTOFRANGE);
+    if (pulse_width <= 0.0f)
+        SIM_RETURN(RET_PULSEWIDTH_OUTOFRANGE);
+    if (current_ma < 0.0f)
+        SIM_RETURN(RET_CURRENT_OUTOFRANGE);
+    S.pulse_rate[qcl] = pulse_rate;
+    S.pulse_width[qcl] = pulse_width;
+    S.current_ma[qcl] = current_ma;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_SetAllQclParams(uint8_t qcl, float pulse_rate, float pulse_width, float current_ma,
+                                          float temperature, uint8_t laser_mode, bool check_params)
+{
+    (void)temperature;
+    (void)laser_mode;
+    (void)check_params;
+    SIM_ENTER("SetAllQclParams");
+    CHECK_QCL(qcl);
+    S.pulse_rate[qcl] = pulse_rate;
+    S.pulse_width[qcl] = pulse_width;
+    S.current_ma[qcl] = current_ma;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetQCLPulseRate(uint8_t qcl, float *pulse_rate)
+{
+    SIM_ENTER("GetQCLPulseRate");
+    CHECK_QCL(qcl);
+    *pulse_rate = S.pulse_rate[qcl];
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetQCLPulseWidth(uint8_t qcl, float *pulse_width)
+{
+    SIM_ENTER("GetQCLPulseWidth");
+    CHECK_QCL(qcl);
+    *pulse_width = S.pulse_width[qcl];
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetQCLCurrent(uint8_t qcl, float *current_ma)
+{
+    SIM_ENTER("GetQCLCurrent");
+    CHECK_QCL(qcl);
+    *current_ma = S.current_ma[qcl];
+    SIM_RETURN(RET_SUCCESS);
+}
+
+/* ------------------------------------------------------------------------- */
+/* Scans                                                                     */
+/* ------------------------------------------------------------------------- */
+
+static uint32_t check_scan_range(float a, float b, uint8_t units)
+{
+    if (!in_tuning_range(to_cm1(a, units)) || !in_tuning_range(to_cm1(b, units)))
+        return RET_WW_OUTOFTUNINGRANGE;
+    return RET_SUCCESS;
+}
+
+static uint32_t start_sweep(float start, float stop, float speed, uint8_t units, uint16_t num_scans, bool bidir)
+{
+    double t = now_s();
+    if (!is_armed(t))
+        return RET_LASER_NOT_ARMED;
+    uint32_t rc = check_scan_range(start, stop, units);
+    if (rc != RET_SUCCESS)
+        return rc;
+    S.cfg_sweep_start = start;
+    S.cfg_sweep_stop = stop;
+    S.cfg_sweep_speed = speed;
+    S.cfg_sweep_units = units;
+    S.cfg_sweep_scans = num_scans;
+    S.cfg_sweep_bidir = bidir;
+    scan_begin(t, SCAN_SWEEP, num_scans, units);
+    S.scan.sweep_start = start;
+    S.scan.sweep_stop = stop;
+    S.scan.sweep_speed = speed;
+    S.scan.bidirectional = bidir;
+    return RET_SUCCESS;
+}
+
+EXPORT uint32_t MIRcatSDK_StartSweepScan(float start, float stop, float speed, uint8_t units,
+                                         uint16_t num_scans, bool bidirectional, uint8_t preferred_qcl)
+{
+    SIM_ENTER("StartSweepScan");
+    (void)preferred_qcl;
+    SIM_RETURN(start_sweep(start, stop, speed, units, num_scans, bidirectional));
+}
+
+EXPORT uint32_t MIRcatSDK_SetAdvancedSweepParams(uint8_t units, float start, float stop, float speed,
+                                                 uint16_t num_scans, bool bidirectional)
+{
+    SIM_ENTER("SetAdvancedSweepParams");
+    S.cfg_sweep_start = start;
+    S.cfg_sweep_stop = stop;
+    S.cfg_sweep_speed = speed;
+    S.cfg_sweep_units = units;
+    S.cfg_sweep_scans = num_scans;
+    S.cfg_sweep_bidir = bidirectional;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetAdvancedSweepParams(uint8_t *units, float *start, float *stop, float *speed,
+                                                 uint16_t *num_scans, bool *bidirectional)
+{
+    SIM_ENTER("GetAdvancedSweepParams");
+    *units = S.cfg_sweep_units;
+    *start = S.cfg_sweep_start;
+    *stop = S.cfg_sweep_stop;
+    *speed = S.cfg_sweep_speed;
+    *num_scans = S.cfg_sweep_scans;
+    *bidirectional = S.cfg_sweep_bidir;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_SetAdvancedSweepChanParams(uint8_t qcl, float start, float stop, bool use_channel)
+{
+    (void)start;
+    (void)stop;
+    SIM_ENTER("SetAdvancedSweepChanParams");
+    CHECK_QCL(qcl);
+    S.adv_channel[qcl] = use_channel;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_ReadWriteAdvancedSweepParams(bool write)
+{
+    (void)write;
+    SIM_ENTER("ReadWriteAdvancedSweepParams");
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_StartSweepAdvancedScan(void)
+{
+    SIM_ENTER("StartSweepAdvancedScan");
+    SIM_RETURN(start_sweep(S.cfg_sweep_start, S.cfg_sweep_stop, S.cfg_sweep_speed, S.cfg_sweep_units,
+                           S.cfg_sweep_scans, S.cfg_sweep_bidir));
+}
+
+EXPORT uint32_t MIRcatSDK_GetSweepStartWW(float *ww, uint8_t *units)
+{
+    SIM_ENTER("GetSweepStartWW");
+    *ww = S.cfg_sweep_start;
+    *units = S.cfg_sweep_units;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetSweepStopWW(float *ww, uint8_t *units)
+{
+    SIM_ENTER("GetSweepStopWW");
+    *ww = S.cfg_sweep_stop;
+    *units = S.cfg_sweep_units;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetSweepScanSpeed(float *speed, uint8_t *units)
+{
+    SIM_ENTER("GetSweepScanSpeed");
+    *speed = S.cfg_sweep_speed;
+    *units = S.cfg_sweep_units;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetSweepNumScans(uint16_t *num_scans)
+{
+    SIM_ENTER("GetSweepNumScans");
+    *num_scans = S.cfg_sweep_scans;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_IsSweepBidirectional(bool *bidirectional)
+{
+    SIM_ENTER("IsSweepBidirectional");
+    *bidirectional = S.cfg_sweep_bidir;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_SetWlTrigParams(uint8_t pulse_mode, uint8_t proc_mode, float start, float stop,
+                                          float interval, uint8_t units, uint32_t step_time_us,
+                                          uint32_t step_delay_us)
+{
+    SIM_ENTER("SetWlTrigParams");
+    S.pulse_mode = pulse_mode;
+    S.proc_mode = proc_mode;
+    S.wl_start = start;
+    S.wl_stop = stop;
+    S.wl_interval = interval;
+    S.wl_units = units;
+    S.step_time_us = step_time_us;
+    S.step_delay_us = step_delay_us;
+    S.wl_params_set = true;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetWlTrigParams(uint8_t *pulse_mode, uint8_t *proc_mode, float *start, float *stop,
+                                          float *interval, uint8_t *units, uint32_t *step_time_us,
+                                          uint32_t *step_delay_us)
+{
+    SIM_ENTER("GetWlTrigParams");
+    *pulse_mode = S.pulse_mode;
+    *proc_mode = S.proc_mode;
+    *start = S.wl_start;
+    *stop = S.wl_stop;
+    *interval = S.wl_interval;
+    *units = S.wl_units;
+    *step_time_us = S.step_time_us;
+    *step_delay_us = S.step_delay_us;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_StartStepMeasureModeScan(float start, float stop, float step, uint8_t units,
+                                                   uint16_t num_scans)
+{
+    SIM_ENTER("StartStepMeasureModeScan");
+    double t = now_s();
+    if (!is_armed(t))
+        SIM_RETURN(RET_LASER_NOT_ARMED);
+    uint32_t rc = check_scan_range(start, stop, units);
+    if (rc != RET_SUCCESS)
+        SIM_RETURN(rc);
+    if (step <= 0.0f)
+        SIM_RETURN(RET_INDEX_OUTOFBOUNDS);
+    S.cfg_step_start = start;
+    S.cfg_step_stop = stop;
+    S.cfg_step_size = step;
+    S.cfg_step_units = units;
+    S.cfg_step_scans = num_scans;
+    scan_begin(t, SCAN_STEP, num_scans, units);
+    S.scan.step_start = start;
+    S.scan.step_stop = stop;
+    S.scan.step_size = step;
+    S.scan.step_count = (uint32_t)(fabs(stop - start) / step + 1e-6) + 1;
+    S.scan.manual = S.wl_params_set && S.proc_mode == PROC_TRIG_MODE_MANUAL;
+    S.scan.manual_t = t;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetStepMeasureStartWW(float *ww, uint8_t *units)
+{
+    SIM_ENTER("GetStepMeasureStartWW");
+    *ww = S.cfg_step_start;
+    *units = S.cfg_step_units;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetStepMeasureStopWW(float *ww, uint8_t *units)
+{
+    SIM_ENTER("GetStepMeasureStopWW");
+    *ww = S.cfg_step_stop;
+    *units = S.cfg_step_units;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetStepMeasureStepSizeWW(float *ww, uint8_t *units)
+{
+    SIM_ENTER("GetStepMeasureStepSizeWW");
+    *ww = S.cfg_step_size;
+    *units = S.cfg_step_units;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetStepMeasureNumScans(uint16_t *num_scans)
+{
+    SIM_ENTER("GetStepMeasureNumScans");
+    *num_scans = S.cfg_step_scans;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_ManualStepScanInProgress(void)
+{
+    SIM_ENTER("ManualStepScanInProgress");
+    if (S.scan.mode != SCAN_STEP || !S.scan.manual)
+        SIM_RETURN(RET_NO_SCAN_INPROGRESS);
+    S.scan.manual_steps++;
+    S.scan.manual_t = now_s();
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_InjectProcessTrigger(void)
+{
+    SIM_ENTER("InjectProcessTrigger");
+    if (S.scan.mode == SCAN_STEP && S.scan.manual) {
+        S.scan.manual_steps++;
+        S.scan.manual_t = now_s();
+    }
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_SetNumMultiSpectralElements(uint8_t count)
+{
+    SIM_ENTER("SetNumMultiSpectralElements");
+    /* The running scan reads the table on every status call; it stays fixed until it ends */
+    if (S.scan.mode == SCAN_MULTI)
+        SIM_RETURN(RET_START_MULTISPECTRALSCAN_FAILURE);
+    if (count == 0)
+        SIM_RETURN(RET_NOT_ENOUGH_ELEMENTS);
+    S.ms_expected = count;
+    S.ms_count = 0;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_AddMultiSpectralElement(float ww, uint8_t units, uint32_t dwell_us, uint32_t off_us)
+{
+    SIM_ENTER("AddMultiSpectralElement");
+    if (S.scan.mode == SCAN_MULTI)
+        SIM_RETURN(RET_START_MULTISPECTRALSCAN_FAILURE);
+    if (S.ms_count >= S.ms_expected)
+        SIM_RETURN(RET_TOO_MANY_ELEMENTS);
+    double cm1 = to_cm1(ww, units);
+    if (!in_tuning_range(cm1))
+        SIM_RETURN(RET_WW_OUTOFTUNINGRANGE);
+    ms_element *el = &S.ms[S.ms_count++];
+    el->wavenumber = (float)cm1;
+    el->units = units;
+    el->dwell_us = dwell_us;
+    el->off_us = off_us;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetNumMultiSpectralElements(uint8_t *count)
+{
+    SIM_ENTER("GetNumMultiSpectralElements");
+    *count = S.ms_count;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetMultiSpectralElement(uint8_t index, float *ww, uint32_t *dwell_us, uint32_t *off_us)
+{
+    SIM_ENTER("GetMultiSpectralElement");
+    if (index >= S.ms_count)
+        SIM_RETURN(RET_INDEX_OUTOFBOUNDS);
+    *ww = (float)from_cm1(S.ms[index].wavenumber, S.ms[index].units);
+    *dwell_us = S.ms[index].dwell_us;
+    *off_us = S.ms[index].off_us;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_GetMultiSpectralNumScans(uint16_t *num_scans)
+{
+    SIM_ENTER("GetMultiSpectralNumScans");
+    *num_scans = S.ms_scans;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_StartMultiSpectralModeScan(uint16_t num_scans)
+{
+    SIM_ENTER("StartMultiSpectralModeScan");
+    double t = now_s();
+    if (!is_armed(t))
+        SIM_RETURN(RET_LASER_NOT_ARMED);
+    if (S.ms_count == 0 || S.ms_count < S.ms_expected)
+        SIM_RETURN(RET_NOT_ENOUGH_ELEMENTS);
+    S.ms_scans = num_scans;
+    scan_begin(t, SCAN_MULTI, num_scans, S.ms[0].units);
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_StopScanInProgress(void)
+{
+    SIM_ENTER("StopScanInProgress");
+    if (S.scan.mode == SCAN_NONE)
+        SIM_RETURN(RET_NO_SCAN_INPROGRESS);
+    scan_abort(now_s());
+    SIM_RETURN(RET_SUCCESS);
+}
+
+/* ------------------------------------------------------------------------- */
+/* Pointing compensation                                                     */
+/* ------------------------------------------------------------------------- */
+
+EXPORT uint32_t MIRcatSDK_PointingControlsSupported(bool *supported)
+{
+    SIM_ENTER("PointingControlsSupported");
+    *supported = g_params[P_POINTING_SUPPORTED] != 0.0;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_PointingGetCompensationEnabled(bool *x_enabled, bool *y_enabled)
+{
+    SIM_ENTER("PointingGetCompensationEnabled");
+    *x_enabled = S.pointing_x;
+    *y_enabled = S.pointing_y;
+    SIM_RETURN(RET_SUCCESS);
+}
+
+EXPORT uint32_t MIRcatSDK_PointingCompensationEnable(bool x_enable, bool y_enable)
+{
+    SIM_ENTER("PointingCompensationEnable");
+    S.pointing_x = x_enable;
+    S.pointing_y = y_enable;
+    SIM_RETURN(RET_SUCCESS);
+}
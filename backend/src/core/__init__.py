@@ -0,0 +1,3 @@
+"""
+Shared backend infrastructure used by the device modules.
+"""
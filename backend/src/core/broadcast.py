@@ -0,0 +1,273 @@
+"""
+WebSocket Broadcast Hub
+
+One publisher per device serializes each status frame once; the encoded
+frame is then fanned out to every subscriber through a bounded per-client
+queue. A slow ``full`` client only ever loses its own oldest frames; a slow
+``delta`` client, which cannot skip a patch, has its whole queue replaced by
+a fresh snapshot instead.
+
+Two protocols are offered per subscriber:
+
+- ``full`` (default): every publish is sent as
+  ``{"device", "type": "status", "payload"}``.
+- ``delta``: a ``{"type": "snapshot", "seq", "payload"}`` frame on subscribe
+  or resync, then ``{"type": "patch", "seq", "changes", "removed"}`` frames
+  carrying only changed fields. ``changes`` is deep-merged into nested
+  objects, ``removed`` lists key paths to delete. ``seq`` increases by one
+  per patch; a client that sees a gap sends ``{"type": "resync"}``.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SnapshotProvider = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+PROTOCOL_FULL = "full"
+PROTOCOL_DELTA = "delta"
+
+
+def diff_payload(old: Dict[str, Any], new: Dict[str, Any],
+                 path: Tuple[str, ...] = ()) -> Tuple[Dict[str, Any], List[List[str]]]:
+    """Compute (changes, removed) turning ``old`` into ``new``; nested dicts are diffed recursively."""
+    changes: Dict[str, Any] = {}
+    removed: List[List[str]] = []
+    for key, value in new.items():
+        if key not in old:
+            changes[key] = value
+            continue
+        prev = old[key]
+        if isinstance(value, dict) and isinstance(prev, dict):
+            sub_changes, sub_removed = diff_payload(prev, value, path + (key,))
+            if sub_changes:
+                changes[key] = sub_changes
+            removed.extend(sub_removed)
+        elif prev != value:
+            changes[key] = value
+    removed.extend(list(path + (key,)) for key in old if key not in new)
+    return changes, removed
+
+
+class Subscriber:
+    """A single WebSocket client's view of a device channel."""
+
+    def __init__(self, device_id: str, queue_size: int, protocol: str = PROTOCOL_FULL):
+        self.device_id = device_id
+        self.protocol = protocol
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, frame: str) -> bool:
+        """Enqueue a frame, dropping the oldest queued frame when full.
+
+        A full delta queue is left untouched and False is returned: dropping a
+        queued snapshot or patch would strand the client, so the hub replaces
+        the queue with a fresh snapshot instead (see ``replace``).
+        """
+        if self.queue.full():
+            if self.protocol == PROTOCOL_DELTA:
+                return False
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(frame)
+        return True
+
+    def replace(self, frame: str) -> None:
+        """Discard every queued frame and queue ``frame`` alone."""
+        while True:
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self.dropped += 1
+        self.queue.put_nowait(frame)
+
+
+class _DeviceChannel:
+    def __init__(self, device_id: str, provider: Optional[SnapshotProvider]):
+        self.device_id = device_id
+        self.provider = provider
+        # Keys that change on every publish (timestamps, versions); they ride
+        # along in patches but never trigger one on their own
+        self.volatile_keys: Set[str] = set()
+        self.subscribers: Set[Subscriber] = set()
+        self.last_payload: Optional[Dict[str, Any]] = None
+        self._last_frame: Optional[str] = None
+        self._snapshot_frame: Optional[str] = None
+        # Deep copy of the payload the last patch (or snapshot) brought delta clients to
+        self._delta_base: Optional[Dict[str, Any]] = None
+        self.seq = 0
+        self.frames_published = 0
+        self.patches_published = 0
+
+    def set_payload(self, payload: Dict[str, Any]) -> None:
+        self.last_payload = payload
+        self._last_frame = None
+        self._snapshot_frame = None
+
+    def has_delta_subscribers(self) -> bool:
+        return any(s.protocol == PROTOCOL_DELTA for s in self.subscribers)
+
+    def snapshot_frame(self) -> Optional[str]:
+        if self._snapshot_frame is None and self.last_payload is not None:
+            self._snapshot_frame = json.dumps({
+                'device': self.device_id,
+                'type': 'snapshot',
+                'seq': self.seq,
+                'payload': self.last_payload,
+            })
+        return self._snapshot_frame
+
+    def rebase(self) -> None:
+        """Make the current payload the base that the next patch is diffed against."""
+        self._delta_base = copy.deepcopy(self.last_payload)
+
+    def patch_frame(self) -> Optional[str]:
+        """Diff the new payload against the delta base; returns the encoded patch or None if unchanged."""
+        base = self._delta_base
+        if base is None or self.last_payload is None:
+            return None
+        changes, removed = diff_payload(base, self.last_payload)
+        if not removed and all(key in self.volatile_keys for key in changes):
+            return None
+        self.seq += 1
+        self.patches_published += 1
+        self._snapshot_frame = None  # its seq is now stale
+        self.rebase()
+        return json.dumps({
+            'device': self.device_id,
+            'type': 'patch',
+            'seq': self.seq,
+            'changes': changes,
+            'removed': removed,
+        })
+
+    def frame(self) -> Optional[str]:
+        # Encoded lazily and at most once per payload, however many clients read it
+        if self._last_frame is None and self.last_payload is not None:
+            self._last_frame = json.dumps({
+                'device': self.device_id,
+                'type': 'status',
+                'payload': self.last_payload,
+            })
+        return self._last_frame
+
+
+class BroadcastHub:
+    """Fan-out of device status frames to WebSocket subscribers."""
+
+    def __init__(self, queue_size: int = 16):
+        self.queue_size = queue_size
+        self._channels: Dict[str, _DeviceChannel] = {}
+
+    def _channel(self, device_id: str) -> _DeviceChannel:
+        channel = self._channels.get(device_id)
+        if channel is None:
+            channel = self._channels[device_id] = _DeviceChannel(device_id, None)
+        return channel
+
+    def register_device(self, device_id: str, provider: SnapshotProvider,
+                        volatile_keys: Iterable[str] = ()) -> None:
+        """Register a device channel; ``provider`` supplies the initial frame for new subscribers."""
+        channel = self._channel(device_id)
+        channel.provider = provider
+        channel.volatile_keys = set(volatile_keys)
+
+    def has_device(self, device_id: str) -> bool:
+        channel = self._channels.get(device_id)
+        return channel is not None and channel.provider is not None
+
+    def publish(self, device_id: str, payload: Dict[str, Any]) -> None:
+        """Publish a new status payload for a device (must run on the event loop thread)."""
+        channel = self._channel(device_id)
+        channel.set_payload(payload)
+        channel.frames_published += 1
+        if not channel.subscribers:
+            return
+        full_frame = None
+        patch_frame = channel.patch_frame() if channel.has_delta_subscribers() else None
+        for subscriber in channel.subscribers:
+            if subscriber.protocol == PROTOCOL_DELTA:
+                if patch_frame is not None:
+                    self._offer_delta(channel, subscriber, patch_frame)
+            else:
+                full_frame = full_frame or channel.frame()
+                subscriber.offer(full_frame)
+
+    async def subscribe(self, device_id: str, protocol: str = PROTOCOL_FULL) -> Subscriber:
+        """Attach a new subscriber and queue the device's current frame for it."""
+        if protocol not in (PROTOCOL_FULL, PROTOCOL_DELTA):
+            raise ValueError(f"Unknown broadcast protocol: {protocol}")
+        channel = self._channel(device_id)
+        subscriber = Subscriber(device_id, self.queue_size, protocol)
+        if channel.last_payload is None and channel.provider is not None:
+            payload = await channel.provider()
+            if channel.last_payload is None:
+                channel.set_payload(payload)
+        if protocol == PROTOCOL_DELTA and not channel.has_delta_subscribers():
+            # First delta client: patches are diffed from what it is about to receive
+            channel.rebase()
+        self._queue_initial(channel, subscriber)
+        channel.subscribers.add(subscriber)
+        return subscriber
+
+    def resync(self, subscriber: Subscriber) -> None:
+        """Queue a fresh snapshot for a delta subscriber that detected a sequence gap."""
+        channel = self._channels.get(subscriber.device_id)
+        if channel is not None:
+            self._queue_initial(channel, subscriber)
+
+    def _queue_initial(self, channel: _DeviceChannel, subscriber: Subscriber) -> None:
+        if subscriber.protocol == PROTOCOL_DELTA:
+            if channel._delta_base is not None:
+                # Bring the base up to date so the snapshot and next patch line up
+                frame = channel.patch_frame()
+                if frame is not None:
+                    for other in channel.subscribers:
+                        if other.protocol == PROTOCOL_DELTA and other is not subscriber:
+                            self._offer_delta(channel, other, frame)
+            frame = channel.snapshot_frame()
+            if frame is not None and not subscriber.offer(frame):
+                subscriber.replace(frame)
+            return
+        frame = channel.frame()
+        if frame is not None:
+            subscriber.offer(frame)
+
+    @staticmethod
+    def _offer_delta(channel: _DeviceChannel, subscriber: Subscriber, frame: str) -> None:
+        # A delta client that fell a whole queue behind restarts from the current snapshot,
+        # which already includes ``frame``
+        if not subscriber.offer(frame):
+            subscriber.replace(channel.snapshot_frame())
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        channel = self._channels.get(subscriber.device_id)
+        if channel is not None:
+            channel.subscribers.discard(subscriber)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-device subscriber, frame and drop counts."""
+        return {
+            device_id: {
+                "subscribers": len(channel.subscribers),
+                "frames_published": channel.frames_published,
+                "patches_published": channel.patches_published,
+                "seq": channel.seq,
+                "frames_dropped": sum(s.dropped for s in channel.subscribers),
+            }
+            for device_id, channel in self._channels.items()
+        }
+
+
+# Process-wide hub shared by main.py and the device controllers
+broadcast_hub = BroadcastHub()
@@ -0,0 +1,135 @@
+"""
+Hardware Configuration Service
+
+Parses hardware_configuration.toml once with the stdlib ``tomllib`` and
+hands each device module a read-only view of its section. Tables become
+``MappingProxyType`` and arrays become tuples, so a view can be shared
+without copying. A background watcher reloads the file when its mtime
+changes. Each successful load bumps ``version`` and notifies registered
+listeners, which can recompile derived values such as validation limits.
+A file that fails to parse is logged and the previous configuration stays
+in effect.
+"""
+
+import asyncio
+import logging
+import os
+import tomllib
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# backend/src/core/config.py -> repository root
+CONFIG_PATH = Path(
+    os.environ.get("HARDWARE_CONFIG_PATH")
+    or Path(__file__).resolve().parents[3] / "hardware_configuration.toml"
+)
+
+ConfigListener = Callable[[int], None]
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of ``freeze``: plain, JSON-serializable dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class HardwareConfig:
+    """Versioned, read-only view of hardware_configuration.toml."""
+
+    def __init__(self, path: Path = CONFIG_PATH, watch_interval: float = 2.0):
+        self.path = Path(path)
+        self.watch_interval = watch_interval
+        self.version = 0
+        self._root: Mapping[str, Any] = _EMPTY
+        self._mtime_ns: Optional[int] = None
+        self._listeners: List[ConfigListener] = []
+        self._watch_task: Optional[asyncio.Task] = None
+        self.load()
+
+    def load(self) -> bool:
+        """(Re)parse the file; returns False and keeps the current config on failure."""
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except OSError as e:
+            logger.error(f"Failed to load config {self.path}: {e}")
+            return False
+        try:
+            with open(self.path, 'rb') as f:
+                root = freeze(tomllib.load(f))
+        except Exception as e:
+            # Remember the broken file's mtime so the watcher reports it once
+            self._mtime_ns = mtime_ns
+            logger.error(f"Failed to load config {self.path}: {e}")
+            return False
+        self._root = root
+        self._mtime_ns = mtime_ns
+        self.version += 1
+        for listener in list(self._listeners):
+            try:
+                listener(self.version)
+            except Exception as e:
+                logger.error(f"Config listener failed on reload: {e}")
+        return True
+
+    def section(self, name: str) -> Mapping[str, Any]:
+        """Read-only view of a top-level table (empty mapping when absent)."""
+        return self._root.get(name, _EMPTY)
+
+    def add_listener(self, listener: ConfigListener) -> None:
+        """Call ``listener(version)`` after every successful reload."""
+        self._listeners.append(listener)
+
+    def reload_if_changed(self) -> bool:
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime_ns == self._mtime_ns:
+            return False
+        logger.info(f"Reloading changed config file {self.path}")
+        return self.load()
+
+    async def start_watcher(self) -> None:
+        """Start polling the file's mtime for edits."""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch_loop())
+
+    async def stop_watcher(self) -> None:
+        task = self._watch_task
+        self._watch_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _watch_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                # stat is cheap; parsing only happens after the file actually changed
+                self.reload_if_changed()
+            except Exception as e:
+                logger.warning(f"Config watcher error: {e}")
+
+
+# Process-wide configuration shared by all device modules
+hardware_config = HardwareConfig()
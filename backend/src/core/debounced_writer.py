@@ -0,0 +1,144 @@
+"""
+Debounced Atomic File Writer
+
+Persistence helper for state that is held in memory and changes often
+(settings, logs). Callers mark the state dirty after each change. One
+background task waits ``debounce`` seconds, takes a snapshot, and writes it
+off the event loop through a temp file and rename, so readers never see a
+partial file.
+
+Every change bumps a generation counter. The task keeps writing until the
+generation it last wrote has caught up, so a change that lands while a
+write is already running gets its own follow-up write instead of being
+lost. Writes are serialized, and each one snapshots the state only once it
+holds the lock, so a later snapshot never lands on disk before an earlier one.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import IO, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write(path: Path, write: Callable[[IO], None], binary: bool = False, fsync: bool = False) -> None:
+    """Write ``path`` via ``write(file)`` on a temp file in the same directory, then rename it into place."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb' if binary else 'w') as f:
+            write(f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class DebouncedWriter:
+    """Coalesces change notifications into debounced writes of a snapshot.
+
+    ``snapshot()`` runs on the event loop when a write starts. ``write(data)``
+    runs in a worker thread, and its return value is passed to
+    ``on_written`` back on the loop. Without a running loop, ``mark_dirty``
+    writes synchronously.
+    """
+
+    def __init__(self, name: str, snapshot: Callable[[], Any], write: Callable[[Any], Any],
+                 debounce: float = 0.5, on_written: Optional[Callable[[Any], None]] = None):
+        self.name = name
+        self.debounce = debounce
+        self.writes = 0
+        self._snapshot = snapshot
+        self._write = write
+        self._on_written = on_written
+        self._generation = 0
+        self._written_generation = 0
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._sleeping = False
+        self._flushing = False
+
+    @property
+    def pending(self) -> bool:
+        """True while changes have not reached the file yet."""
+        return self._generation > self._written_generation
+
+    @property
+    def busy(self) -> bool:
+        """True while a write is scheduled or running."""
+        return self._task is not None and not self._task.done()
+
+    def mark_dirty(self) -> None:
+        """Record a change and make sure a write will follow it."""
+        self._generation += 1
+        if self.busy:
+            return  # the running task loops until this generation is written
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._finish(self._generation, self._write(self._snapshot()))
+            return
+        self._task = loop.create_task(self._run())
+
+    def _finish(self, generation: int, result: Any) -> None:
+        self._written_generation = max(self._written_generation, generation)
+        self.writes += 1
+        if self._on_written is not None:
+            self._on_written(result)
+
+    async def _run(self) -> None:
+        while self.pending:
+            if not self._flushing:
+                self._sleeping = True
+                try:
+                    await asyncio.sleep(self.debounce)
+                finally:
+                    self._sleeping = False
+            if not await self._write_now():
+                return  # leave it dirty; the next change or flush retries
+
+    async def _write_now(self) -> bool:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            generation = self._generation
+            data = self._snapshot()
+            try:
+                result = await asyncio.to_thread(self._write, data)
+            except Exception as e:
+                logger.error(f"Failed to write {self.name}: {e}")
+                return False
+            self._finish(generation, result)
+            return True
+
+    async def flush(self) -> None:
+        """Write pending changes now and wait until they are on disk (used on shutdown)."""
+        self._flushing = True
+        try:
+            # Changes made while flushing start a task that writes without the debounce
+            while self.pending or self.busy:
+                task = self._task
+                if task is not None and not task.done():
+                    if self._sleeping:
+                        # Only the debounce sleep is cancelled; a running write is awaited
+                        task.cancel()
+                        try:
+                            await task
+                        except asyncio.CancelledError:
+                            pass
+                    else:
+                        await task
+                elif not await self._write_now():
+                    break  # already logged; left pending for the next change
+        finally:
+            self._flushing = False
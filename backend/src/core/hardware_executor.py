@@ -0,0 +1,140 @@
+"""
+Hardware Executor
+
+Runs blocking vendor driver calls (ctypes DLLs, serial round trips) on a
+dedicated worker thread so they never stall the asyncio event loop.
+
+Submitted calls are arbitrated by priority class rather than arrival order:
+safety commands (stop, emission off, disarm) run before control commands
+(tune, scan start), which run before telemetry (status reads). A running
+call is never interrupted, but long lower-priority batches can call
+``preempt_point()`` between SDK calls to let queued higher-priority work run
+right there on the worker thread.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from .histogram import LatencyHistogram
+
+# Priority classes, most urgent first
+SAFETY = 0
+CONTROL = 1
+TELEMETRY = 2
+PRIORITY_NAMES = {SAFETY: "safety", CONTROL: "control", TELEMETRY: "telemetry"}
+
+
+class HardwareExecutor:
+    """Single-threaded, priority-arbitrated executor with an awaitable API for one device.
+
+    Every call submitted here runs on the same worker thread, one at a time,
+    which keeps access to non-thread-safe vendor SDKs serialized while the
+    event loop stays free to serve other requests and WebSockets.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._cond = threading.Condition()
+        self._queue: List[tuple] = []  # (priority, sequence, submitted, future, fn, args, kwargs)
+        self._sequence = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._worker_ident: Optional[int] = None
+        # Priority of each call currently on the worker stack (preempted calls stay below)
+        self._running: List[int] = []
+        # Time from submission until a call starts, per priority class
+        self.queue_wait: Dict[int, LatencyHistogram] = {p: LatencyHistogram() for p in PRIORITY_NAMES}
+        self.preemptions = 0
+
+    def _ensure_worker(self) -> None:
+        # Caller holds self._cond; a worker that is still draining after shutdown() just carries on
+        self._stopping = False
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _worker(self) -> None:
+        self._worker_ident = threading.get_ident()
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    self._thread = None
+                    return
+                job = heapq.heappop(self._queue)
+            self._execute(job)
+
+    def _execute(self, job: tuple) -> None:
+        priority, _seq, submitted, future, fn, args, kwargs = job
+        if not future.set_running_or_notify_cancel():
+            return  # the awaiting coroutine was cancelled before the call started
+        with self._cond:
+            self.queue_wait[priority].record(time.monotonic() - submitted)
+        self._running.append(priority)
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            self._running.pop()
+
+    def in_worker(self) -> bool:
+        """True when called from the executor's worker thread."""
+        return threading.get_ident() == self._worker_ident
+
+    def preempt_point(self) -> int:
+        """Run queued calls that outrank the current one; call between SDK calls of a long batch.
+
+        Only has an effect on the worker thread. Returns the number of calls run.
+        """
+        if not self.in_worker() or not self._running:
+            return 0
+        current = self._running[-1]
+        ran = 0
+        while True:
+            with self._cond:
+                if not self._queue or self._queue[0][0] >= current:
+                    return ran
+                job = heapq.heappop(self._queue)
+                self.preemptions += 1
+            self._execute(job)
+            ran += 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, priority: int = CONTROL, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the worker thread at ``priority`` and await its result."""
+        future: Future = Future()
+        with self._cond:
+            self._ensure_worker()
+            heapq.heappush(self._queue, (priority, next(self._sequence), time.monotonic(), future, fn, args, kwargs))
+            self._cond.notify()
+        # Cancelling the awaiting task cancels the call too if it has not started yet
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queued calls and queue wait summaries per priority class."""
+        with self._cond:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for job in self._queue:
+                queued[PRIORITY_NAMES[job[0]]] += 1
+            return {
+                "queued": queued,
+                "preemptions": self.preemptions,
+                "queue_wait": {PRIORITY_NAMES[p]: hist.summary() for p, hist in self.queue_wait.items()},
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker thread once queued calls are done; a later run() starts a fresh one."""
+        with self._cond:
+            thread = self._thread
+            self._stopping = True
+            self._cond.notify_all()
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
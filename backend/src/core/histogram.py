@@ -0,0 +1,69 @@
+"""
+Latency Histogram
+
+Fixed log-spaced buckets for operation latencies (seconds). Recording is
+O(buckets) and memory is constant, so histograms can stay attached to a
+controller for the life of the process.
+"""
+
+import bisect
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+# Upper bucket bounds in seconds (1 ms .. 60 s); anything slower lands in +Inf
+DEFAULT_BUCKETS: Sequence[float] = (
+    0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5,
+    1.0, 2.0, 5.0, 10.0, 20.0, 60.0,
+)
+
+
+class LatencyHistogram:
+    """Bucketed latency distribution with count, sum, min, max and timeouts."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets: List[float] = sorted(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.timeouts = 0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0..1) as the upper bound of the bucket holding it."""
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                bound = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "mean": (self.total / self.count) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "buckets": {
+                ("+Inf" if i == len(self.buckets) else str(self.buckets[i])): n
+                for i, n in enumerate(self.counts)
+            },
+        }
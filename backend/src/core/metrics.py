@@ -0,0 +1,229 @@
+"""
+Metrics Registry
+
+Process-wide latency histograms, counters and gauges exported in the
+Prometheus text exposition format (GET /metrics). Histograms are
+core.histogram.LatencyHistogram instances, so recording stays O(buckets)
+with constant memory; hot paths resolve their labelled child once and only
+call ``record()``/``inc()`` afterwards. Gauges and views over histograms that
+already live on a controller are callbacks evaluated at scrape time.
+
+Children may be recorded from the SDK executor threads; creating them and
+rendering take a lock, recording does not.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .histogram import LatencyHistogram
+
+# Starlette appends "; charset=utf-8" to text/* media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Iterable[str], values: Iterable[Any], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_histogram(lines: List[str], name: str, labelnames: Tuple[str, ...],
+                      values: LabelValues, hist: LatencyHistogram) -> None:
+    cumulative = 0
+    for bound, count in zip(hist.buckets, hist.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(labelnames, values, ('le', _number(bound)))} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(labelnames, values, ('le', '+Inf'))} {hist.count}")
+    lines.append(f"{name}_sum{_labels(labelnames, values)} {_number(hist.total)}")
+    lines.append(f"{name}_count{_labels(labelnames, values)} {hist.count}")
+
+
+class Counter:
+    """Monotonic counter child."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _Family:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str], factory: Callable[[], Any]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any) -> Any:
+        """Child for one label value combination (created on first use)."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def items(self) -> List[Tuple[LabelValues, Any]]:
+        with self._lock:
+            return list(self._children.items())
+
+
+class HistogramFamily(_Family):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames, LatencyHistogram)
+
+    def render(self, lines: List[str]) -> None:
+        for values, hist in self.items():
+            _render_histogram(lines, self.name, self.labelnames, values, hist)
+
+
+class CounterFamily(_Family):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames, Counter)
+
+    def render(self, lines: List[str]) -> None:
+        for values, counter in self.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, values)} {_number(counter.value)}")
+
+
+class _Callback:
+    """Gauge, counter or histogram view whose samples come from ``fn`` at scrape time.
+
+    ``fn`` returns a single value (no labels) or a dict of label value tuple -> value
+    (a LatencyHistogram for histogram views).
+    """
+
+    def __init__(self, kind: str, name: str, help: str, fn: Callable[[], Any], labelnames: Iterable[str] = ()):
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+
+    def render(self, lines: List[str]) -> None:
+        result = self.fn()
+        if result is None:
+            return
+        samples = result.items() if isinstance(result, dict) else [((), result)]
+        for values, value in samples:
+            values = values if isinstance(values, tuple) else (values,)
+            if value is None:
+                continue
+            if self.kind == "histogram":
+                _render_histogram(lines, self.name, self.labelnames, values, value)
+            else:
+                lines.append(f"{self.name}{_labels(self.labelnames, values)} {_number(float(value))}")
+
+
+class MetricsRegistry:
+    """Named metric families rendered together for /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.scrapes = 0
+
+    def _add(self, metric: Any) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if existing.kind != metric.kind:
+                    raise ValueError(f"Metric {metric.name} already registered as a {existing.kind}")
+                if isinstance(metric, _Callback):
+                    existing.fn = metric.fn  # re-registration (module reload) replaces the callback
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = ()) -> HistogramFamily:
+        return self._add(HistogramFamily(name, help, labelnames))
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> CounterFamily:
+        return self._add(CounterFamily(name, help, labelnames))
+
+    def gauge_callback(self, name: str, help: str, fn: Callable[[], Any], labelnames: Iterable[str] = ()) -> None:
+        self._add(_Callback("gauge", name, help, fn, labelnames))
+
+    def counter_callback(self, name: str, help: str, fn: Callable[[], Any], labelnames: Iterable[str] = ()) -> None:
+        self._add(_Callback("counter", name, help, fn, labelnames))
+
+    def histogram_callback(self, name: str, help: str, fn: Callable[[], Any], labelnames: Iterable[str] = ()) -> None:
+        self._add(_Callback("histogram", name, help, fn, labelnames))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        self.scrapes += 1
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            metric.render(lines)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+_http_latency = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request handling time by route template", ("method", "route", "status"))
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request, labelled by the matched route's path template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = "500"
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            # The router stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "<unmatched>"
+            _http_latency.labels(scope.get("method", ""), template, status).record(time.perf_counter() - start)
@@ -0,0 +1,131 @@
+"""
+JSON Settings Store
+
+Holds a JSON settings file in memory so request and scan paths never touch
+the filesystem. Updates are merged in memory immediately. The file is
+written after a short debounce, off the event loop, through a temp file
+and rename so readers never see a partial file (core.debounced_writer);
+an update made while a write runs gets its own follow-up write. A background watcher
+reloads the file when its mtime changes because of an external edit. A
+pending local write, or an update made while the edit is being read,
+still wins over the external edit.
+"""
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .debounced_writer import DebouncedWriter, atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class JsonSettingsStore:
+    """In-memory view of a JSON settings file with debounced atomic persistence."""
+
+    def __init__(self, path: Path, debounce: float = 0.5, watch_interval: float = 2.0):
+        self.path = Path(path)
+        self.watch_interval = watch_interval
+        self.version = 0
+        self._data: Dict[str, Any] = {}
+        self._mtime_ns: Optional[int] = None
+        self._writer = DebouncedWriter(f"settings file {self.path}", self.snapshot, self._write_file,
+                                       debounce, on_written=self._written)
+        self._watch_task: Optional[asyncio.Task] = None
+        self._data, self._mtime_ns = self._read_file()
+
+    def _read_file(self) -> tuple:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return {}, None
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("settings file must hold a JSON object")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable settings file {self.path}: {e}")
+            data = {}
+        return data, stat.st_mtime_ns
+
+    def _write_file(self, data: Dict[str, Any]) -> int:
+        atomic_write(self.path, lambda f: json.dump(data, f), fsync=True)
+        return self.path.stat().st_mtime_ns
+
+    def _written(self, mtime_ns: int) -> None:
+        self._mtime_ns = mtime_ns
+
+    @property
+    def writes(self) -> int:
+        return self._writer.writes
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Shallow copy of the current settings."""
+        return dict(self._data)
+
+    def update(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge ``values`` into the settings and schedule a write; returns the merged settings."""
+        self._data.update(values)
+        self.version += 1
+        self._schedule_write()
+        return self.snapshot()
+
+    def _schedule_write(self) -> None:
+        self._writer.mark_dirty()
+
+    async def flush(self) -> None:
+        """Write any pending change now (used on shutdown)."""
+        await self._writer.flush()
+
+    async def start_watcher(self) -> None:
+        """Start polling the file's mtime for external edits."""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch_loop())
+
+    async def stop(self) -> None:
+        """Stop the watcher and flush pending writes."""
+        task = self._watch_task
+        self._watch_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    async def _watch_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                await self._reload_if_changed()
+            except Exception as e:
+                logger.warning(f"Settings watcher error for {self.path}: {e}")
+
+    def _local_changes_since(self, version: int) -> bool:
+        return self.version != version or self._writer.busy or self._writer.pending
+
+    async def _reload_if_changed(self) -> bool:
+        version = self.version
+        if self._local_changes_since(version):
+            return False
+        try:
+            mtime_ns = (await asyncio.to_thread(self.path.stat)).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime_ns == self._mtime_ns:
+            return False
+        data, mtime_ns = await asyncio.to_thread(self._read_file)
+        # An update() made while the file was being read wins; its write replaces the edit
+        if self._local_changes_since(version):
+            return False
+        self._data, self._mtime_ns = data, mtime_ns
+        self.version += 1
+        logger.info(f"Reloaded externally edited settings file {self.path}")
+        return True
@@ -0,0 +1,54 @@
+"""
+Hardware Condition Waiting
+
+``wait_for_condition`` polls an async predicate starting with a short
+interval that backs off geometrically, so a completion that happens in
+tens of milliseconds is seen within tens of milliseconds while long waits
+still settle to a modest polling rate. Cancelling the awaiting task stops
+the wait at the next await point.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from core.histogram import LatencyHistogram
+
+
+class ConditionTimeout(Exception):
+    """Raised when a hardware condition is not met before its deadline."""
+
+    def __init__(self, name: str, timeout: float):
+        super().__init__(f"{name} not reached within {timeout:.2f}s")
+        self.name = name
+        self.timeout = timeout
+
+
+async def wait_for_condition(
+    predicate: Callable[[], Awaitable[bool]],
+    timeout: float,
+    *,
+    name: str = "condition",
+    initial_interval: float = 0.02,
+    max_interval: float = 0.25,
+    backoff: float = 1.5,
+    histogram: Optional[LatencyHistogram] = None,
+) -> float:
+    """Await ``predicate()`` becoming true; returns the elapsed seconds or raises ConditionTimeout."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + timeout
+    interval = initial_interval
+    while True:
+        if await predicate():
+            elapsed = loop.time() - start
+            if histogram is not None:
+                histogram.record(elapsed)
+            return elapsed
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            if histogram is not None:
+                histogram.record_timeout()
+            raise ConditionTimeout(name, timeout)
+        # Never sleep past the deadline; the predicate gets one last look at it
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * backoff, max_interval)
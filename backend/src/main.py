@@ -9,12 +9,18 @@ import pkgutil
 import sys
 from pathlib import Path
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 import json
 import asyncio
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import logging
+import time
+
+from core.broadcast import broadcast_hub, Subscriber, PROTOCOL_DELTA, PROTOCOL_FULL
+from core.config import hardware_config
+from core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, metrics
 
 # Ensure application loggers emit INFO to console (uvicorn only configures its own loggers)
 logging.basicConfig(
@@ -37,6 +43,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route request latency for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Pick up edits to hardware_configuration.toml while running
+app.add_event_handler("startup", hardware_config.start_watcher)
+app.add_event_handler("shutdown", hardware_config.stop_watcher)
+
 # Auto-discover and register device modules
 modules_path = Path(__file__).parent / "modules"
 if modules_path.exists():
@@ -68,27 +81,70 @@ async def root():
 async def health_check():
     return {"status": "healthy", "message": "API is running"}
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of latency histograms, error counters and device gauges"""
+    return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+_ws_send_latency = metrics.histogram(
+    "websocket_send_duration_seconds", "Time to hand one status frame to a WebSocket client", ("device",))
+metrics.gauge_callback(
+    "websocket_clients", "Connected WebSocket status subscribers per device",
+    lambda: {(device,): s["subscribers"] for device, s in broadcast_hub.stats().items()}, ("device",))
+metrics.counter_callback(
+    "websocket_frames_dropped_total", "Frames dropped for slow subscribers (currently connected clients)",
+    lambda: {(device,): s["frames_dropped"] for device, s in broadcast_hub.stats().items()}, ("device",))
+
+async def _stream_subscriber(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """Forward hub frames to one client until either side stops."""
+    async def _send() -> None:
+        send_latency = _ws_send_latency.labels(subscriber.device_id)
+        while True:
+            frame = await subscriber.queue.get()
+            start = time.perf_counter()
+            await websocket.send_text(frame)
+            send_latency.record(time.perf_counter() - start)
+
+    async def _receive() -> None:
+        # Handles client control messages; raises WebSocketDisconnect when the client goes away
+        while True:
+            data = await websocket.receive_text()
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get("type") == "resync":
+                broadcast_hub.resync(subscriber)
+
+    tasks = [asyncio.create_task(_send()), asyncio.create_task(_receive())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+
 # WebSocket endpoint for real-time device status updates
 @app.websocket("/ws/{device_id}")
 async def websocket_endpoint(websocket: WebSocket, device_id: str):
     await websocket.accept()
-    # Stream live status for known devices; fall back to echo otherwise
-    if device_id == 'daylight_mircat':
+    # Stream live status for devices registered with the broadcast hub; fall back to echo otherwise
+    # ?protocol=delta selects snapshot + patch frames instead of full status frames
+    if broadcast_hub.has_device(device_id):
+        protocol = websocket.query_params.get("protocol", PROTOCOL_FULL)
+        if protocol not in (PROTOCOL_FULL, PROTOCOL_DELTA):
+            await websocket.close(code=1008)
+            return
+        subscriber = await broadcast_hub.subscribe(device_id, protocol)
         try:
-            # Lazy import to avoid circulars
-            from modules.daylight_mircat.routes import mircat_controller
-            while True:
-                status = await mircat_controller.get_status()
-                await websocket.send_text(json.dumps({
-                    'device': device_id,
-                    'type': 'status',
-                    'payload': status
-                }))
-                await asyncio.sleep(0.5)
+            await _stream_subscriber(websocket, subscriber)
         except WebSocketDisconnect:
             print(f"WebSocket disconnected for device: {device_id}")
         except Exception as e:
             print(f"WebSocket error for {device_id}: {e}")
+        finally:
+            broadcast_hub.unsubscribe(subscriber)
     else:
         try:
             while True:
@@ -5,16 +5,39 @@ Real hardware integration with the MIRcat SDK providing comprehensive
 error handling, status reporting, and scan functionality.
 """
 
-import toml
 import os
 import time
 import asyncio
+import hashlib
+import math
+import struct
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
+from typing import Deque, Dict, Any, Optional, List, Union
 import logging
+from dataclasses import dataclass, field
 from enum import Enum
-from ctypes import CDLL, c_uint16, c_uint8, c_uint32, c_float, c_bool, byref, POINTER
+from ctypes import CDLL, c_uint16, c_uint8, c_uint32, c_float, c_bool, byref
 from ctypes.util import find_library
+
+from core.broadcast import broadcast_hub
+from core.config import hardware_config
+from core.hardware_executor import CONTROL, PRIORITY_NAMES, SAFETY, TELEMETRY, HardwareExecutor
+from core.histogram import LatencyHistogram
+from core.metrics import MetricsRegistry, metrics
+from core.waiting import ConditionTimeout, wait_for_condition
+
+from .scan_plan import (
+    DEFAULT_SWEEP_POINTS, ScanPlan, ScanPlanError, TuneTiming,
+    compile_multispectral, compile_step, compile_sweep,
+)
+from .scan_queue import MIRcatScanQueue
+from .sdk_bindings import MIRcatBindings
+from .parameter_log import LOG_DIR as PARAMETER_LOG_DIR, ParameterLogStore
+from .settings import MIRcatUserSettings, PROCESS_TRIGGER_MODE_CODES, PULSE_MODE_CODES
+from .trajectory import ScanTrajectoryRecorder
+from .tune_model import LOG_PATH as TUNE_LOG_PATH, TuneLatencyModel
 
 logger = logging.getLogger(__name__)
 
@@ -40,17 +63,137 @@ class ScanMode(Enum):
     STEP = "step"
     MULTISPECTRAL = "multispectral"
 
+_command_latency = metrics.histogram(
+    "mircat_sdk_command_duration_seconds", "_mircat_sdk_call command time on the SDK thread", ("command",))
+_command_failures = metrics.counter(
+    "mircat_sdk_command_failures_total", "_mircat_sdk_call commands that raised", ("command",))
+
+def _same_param(a: float, b: float) -> bool:
+    # SDK parameters travel as float32, so compare at that precision
+    return abs(a - b) <= max(1e-3, 1e-6 * abs(b))
+
+@dataclass
+class _StatusSweep:
+    """A status sweep that concurrent refreshes can join (adding groups) until its reads begin."""
+    groups: set
+    done: asyncio.Future
+    started: bool = False
+    read: frozenset = frozenset()
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+@dataclass(frozen=True)
+class MIRcatLimits:
+    """Validation ranges and defaults from [daylight_mircat.parameters], compiled once per config version."""
+    wavenumber_min: float
+    wavenumber_max: float
+    pulse_rate_min: float
+    pulse_rate_max: float
+    pulse_width_min: float
+    pulse_width_max: float
+    pulsed_current_default: float
+    step_size_min: float
+    num_qcls: int
+    laser_mode_options: tuple
+    use_advanced_sweep: bool
+    enable_software_pingpong: bool
+
+    @classmethod
+    def from_config(cls, params) -> "MIRcatLimits":
+        return cls(
+            wavenumber_min=float(params.get('wavenumber_min', 1638.81)),
+            wavenumber_max=float(params.get('wavenumber_max', 2077.27)),
+            pulse_rate_min=params.get('pulse_rate_min', 10),
+            pulse_rate_max=params.get('pulse_rate_max', 3000000),
+            pulse_width_min=params.get('pulse_width_min', 20),
+            pulse_width_max=params.get('pulse_width_max', 1000),
+            pulsed_current_default=float(params.get('pulsed_current_default', 500)),
+            step_size_min=float(params.get('step_size_min', 0.0)),
+            num_qcls=max(1, int(params.get('num_qcls', 1))),
+            laser_mode_options=tuple(params.get('laser_mode_options', ('Pulsed', 'CW', 'CW + Modulation'))),
+            use_advanced_sweep=bool(params.get('use_advanced_sweep', False)),
+            enable_software_pingpong=bool(params.get('enable_software_pingpong', False)),
+        )
+
 class MIRcatController:
     """Controller for Daylight MIRcat QCL Laser
     
     Provides real hardware integration with the MIRcat SDK.
     All state changes are driven by actual hardware responses.
     """
+
+    # Status poll schedule: field group -> (tier while scanning, tier while idle).
+    # Each tier maps to an interval in [daylight_mircat.polling]; groups are
+    # also re-read immediately after an action invalidates them.
+    STATUS_POLL_SCHEDULE: Dict[str, tuple] = {
+        "scan": ("fast", "slow"),
+        "tuned": ("fast", "medium"),
+        "armed": ("medium", "medium"),
+        "emission": ("medium", "medium"),
+        "interlocks": ("medium", "medium"),
+        "key_switch": ("medium", "medium"),
+        "temperature_stable": ("medium", "medium"),
+        "temperatures": ("slow", "slow"),
+        "pulse": ("slow", "slow"),
+        "pointing": ("slow", "slow"),
+        "sweep_bidirectional": ("slow", "slow"),
+    }
+
+    # SDK calls each status group costs in a sweep (every sweep also reads IsConnected)
+    STATUS_GROUP_SDK_CALLS: Dict[str, int] = {
+        "scan": 1,
+        "tuned": 1,
+        "armed": 1,
+        "emission": 1,
+        "interlocks": 1,
+        "key_switch": 1,
+        "temperature_stable": 1,
+        "temperatures": 1,
+        "pulse": 2,
+        "pointing": 2,
+        "sweep_bidirectional": 1,
+    }
+
+    # Default completion deadlines (seconds) per awaited hardware condition;
+    # overridable as <name>_timeout in [daylight_mircat.completion_wait]
+    COMPLETION_TIMEOUTS: Dict[str, float] = {
+        "tune": 5.0,
+        "arm": 15.0,
+        "arm_temperature": 60.0,
+        "disarm": 10.0,
+        "emission_on": 5.0,
+        "emission_off": 5.0,
+        "multispectral_temperature": 60.0,
+    }
+
+    # Multispectral element table size (SetNumMultiSpectralElements takes a uint8);
+    # longer lists are streamed through the table in chunks of this size
+    MULTISPECTRAL_TABLE_MAX = 255
+
+    # Single-call boolean status groups: group -> (status key, _mircat_sdk_call command)
+    _SIMPLE_STATUS_READS: Dict[str, tuple] = {
+        "interlocks": ("interlocks", "isinterlocked"),
+        "key_switch": ("key_switch", "iskeyswitch"),
+        "temperature_stable": ("temperature", "temperaturestable"),
+        "tuned": ("tuned", "istuned"),
+        "armed": ("armed", "isarmed"),
+        "emission": ("emission", "isemitting"),
+    }
+
+    # _mircat_sdk_call boolean queries: command -> SDK getter (without the MIRcatSDK_ prefix)
+    _SDK_FLAG_QUERIES: Dict[str, str] = {
+        "isarmed": "IsLaserArmed",
+        "istuned": "IsTuned",
+        "temperaturestable": "AreTECsAtSetTemperature",
+        "isinterlocked": "IsInterlockedStatusSet",
+        "iskeyswitch": "IsKeySwitchStatusSet",
+        "isemitting": "IsEmissionOn",
+    }
     
     def __init__(self):
         self.sdk_initialized = False
         self._sdk = None
         self._sdk_dir: Optional[Path] = None
+        self._bindings: Optional[MIRcatBindings] = None
         self.connected = False
         self.armed = False
         self.emission_on = False
@@ -60,8 +203,15 @@ class MIRcatController:
         self.current_scan_mode = None
         self.current_scan_number: Optional[int] = None
         self.current_scan_percent: Optional[int] = None
+        # Summary of the plan behind the last multispectral start (ordering and the entered index of
+        # each executed element, planned vs original duration)
+        self.last_multispectral_plan: Optional[Dict[str, Any]] = None
         
-        self.config = self._load_config()
+        # Read-only view of [daylight_mircat]; derived settings are recompiled on reload
+        self.config = hardware_config.section('daylight_mircat')
+        self.config_version = hardware_config.version
+        self._apply_config()
+        hardware_config.add_listener(self._on_config_reload)
         self.current_wavenumber = 0.0
         self.current_qcl = 0
         self.laser_mode = "Pulsed"
@@ -98,6 +248,106 @@ class MIRcatController:
         self._pingpong_task: Optional[asyncio.Task] = None
         self._pingpong_cancel: bool = False
         self._pingpong_active: bool = False
+        # Dead time between the last sample showing a segment running and the
+        # reverse segment started, overall and for the most recent reversals
+        self.pingpong_turnaround_gap = LatencyHistogram()
+        self.pingpong_turnarounds: Deque[Dict[str, Any]] = deque(maxlen=100)
+
+        # Chunked multispectral streaming for lists longer than the hardware table
+        self._multispectral_task: Optional[asyncio.Task] = None
+        self._multispectral_cancel: bool = False
+        self._multispectral_active: bool = False
+        self.multispectral_progress: Optional[Dict[str, Any]] = None
+        # Dead time between the last sample showing chunk k running and chunk k+1 started
+        self.multispectral_chunk_gap = LatencyHistogram()
+        # stop_scan request to StopScanInProgress call on the SDK thread
+        self.stop_latency = LatencyHistogram()
+
+        # Background status poller: owns the periodic SDK reads and publishes a
+        # versioned snapshot that get_status()/WebSocket readers serve from.
+        # Monotonic time each status group was last read from hardware
+        self._poll_last: Dict[str, float] = {}
+        self._status_snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_version = 0
+        self._snapshot_monotonic = 0.0
+        self._poller_task: Optional[asyncio.Task] = None
+        # Single-flight status sweeps: the sweep in flight and what coalescing saved
+        self._status_sweep: Optional[_StatusSweep] = None
+        self.status_coalescing: Dict[str, int] = {
+            "sweeps": 0,
+            "joined": 0,
+            "waited": 0,
+            "snapshot_hits": 0,
+            "sdk_calls_saved": 0,
+        }
+
+        # Completion waits poll fast at first and back off; each awaited
+        # condition keeps a latency histogram (see get_completion_latency)
+        self.completion_latency: Dict[str, LatencyHistogram] = {
+            name: LatencyHistogram() for name in self.COMPLETION_TIMEOUTS
+        }
+
+        # Scan trajectory recorder: samples GetScanStatus at sample_interval while a
+        # scan runs; the status poller reuses its newest sample
+        # (capacity is fixed at startup; the buffer is not reallocated on reload)
+        self.trajectory = ScanTrajectoryRecorder(int(self.config.get('trajectory', {}).get('capacity', 200000)))
+        self._trajectory_task: Optional[asyncio.Task] = None
+        self._trajectory_last: Optional[tuple] = None
+
+        # Persisted front-end settings, loaded once and kept in memory
+        self.user_settings = MIRcatUserSettings()
+
+        # Logged tune settle times and the fit used for tune timeouts and scan plan timing
+        # (log location and size are fixed at startup)
+        model_cfg = self.config.get('tune_model', {})
+        self.tune_model = TuneLatencyModel(
+            Path(model_cfg['log_path']) if model_cfg.get('log_path') else TUNE_LOG_PATH,
+            capacity=int(model_cfg.get('capacity', 5000)),
+            min_samples=int(model_cfg.get('min_samples', 10)),
+        )
+
+        # Telemetry log driven by the enableParameterLogging user setting
+        # (storage location, chunking and retention are fixed at startup)
+        log_cfg = self.config.get('parameter_log', {})
+        self.parameter_log = ParameterLogStore(
+            Path(log_cfg['directory']) if log_cfg.get('directory') else PARAMETER_LOG_DIR,
+            sample_rate=1.0 / self.parameter_log_interval,
+            chunk_seconds=float(log_cfg.get('chunk_seconds', 600.0)),
+            retention_days=float(log_cfg.get('retention_days', 30.0)),
+            max_total_mb=float(log_cfg.get('max_total_mb', 500.0)),
+        )
+        self._parameter_log_task: Optional[asyncio.Task] = None
+        self.parameter_log_errors = 0
+
+        # Fingerprint of the multispectral table last programmed into the
+        # controller; cleared on connect/disconnect and on any SDK error
+        self._multispectral_fingerprint: Optional[str] = None
+        self.multispectral_table_cache: Dict[str, int] = {"hits": 0, "misses": 0}
+
+        # Write-through cache of each QCL's pulse rate, pulse width and current:
+        # qcl -> name -> (value, monotonic time read or written). Refreshed on
+        # connect, updated by writes, status sweeps and the parameter logger.
+        self._qcl_params: Dict[int, Dict[str, tuple]] = {}
+        self.qcl_params_cache: Dict[str, int] = {
+            "writes": 0,
+            "skipped_writes": 0,
+            "current_reads": 0,
+            "skipped_current_reads": 0,
+        }
+
+        # Last wavelength trigger parameters SetWlTrigParams applied successfully
+        # (pulse mode, process mode, start, stop, interval, step time us, delay us);
+        # None when unknown, i.e. after connect, disconnect or a failed write
+        self._wl_trig_applied: Optional[tuple] = None
+        self.trigger_params_cache: Dict[str, int] = {"writes": 0, "skipped_writes": 0}
+
+        # Back-to-back scan jobs submitted through /scan/queue
+        self.scan_queue = MIRcatScanQueue(self)
+
+        # All SDK access is serialized on one worker thread so ctypes round
+        # trips never block the event loop. Calls are arbitrated by priority:
+        # safety (stop, emission off, disarm) > control > telemetry (status).
+        self._hw = HardwareExecutor("mircat-sdk")
 
         # Constants (mirroring SDK header values used here)
         self._UNITS_MICRONS = 1
@@ -105,16 +355,60 @@ class MIRcatController:
         self._COMM_SERIAL = 1
         self._SERIAL_PORT_AUTO = 0
         
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from hardware_configuration.toml"""
-        config_path = Path(__file__).parent.parent.parent.parent.parent / "hardware_configuration.toml"
-        try:
-            with open(config_path, 'r') as f:
-                config = toml.load(f)
-            return config.get('daylight_mircat', {})
-        except Exception as e:
-            logger.error(f"Failed to load config: {e}")
-            return {}
+    def _apply_config(self) -> None:
+        """Compile limits, poll tiers, wait settings and trajectory rate from self.config."""
+        self.limits = MIRcatLimits.from_config(self.config.get('parameters', {}))
+        polling_cfg = self.config.get('polling', {})
+        self.poll_intervals: Dict[str, float] = {
+            "fast": float(polling_cfg.get('fast_interval', 0.1)),
+            "medium": float(polling_cfg.get('medium_interval', 1.0)),
+            "slow": float(polling_cfg.get('slow_interval', 5.0)),
+        }
+        self.status_max_staleness = float(polling_cfg.get('max_staleness', 2.0))
+        wait_cfg = self.config.get('completion_wait', {})
+        self.completion_wait_intervals: Dict[str, float] = {
+            "initial_interval": float(wait_cfg.get('initial_interval', 0.02)),
+            "max_interval": float(wait_cfg.get('max_interval', 0.25)),
+            "backoff": float(wait_cfg.get('backoff', 1.5)),
+        }
+        self.completion_timeouts: Dict[str, float] = {
+            name: float(wait_cfg.get(f'{name}_timeout', default))
+            for name, default in self.COMPLETION_TIMEOUTS.items()
+        }
+        trajectory_cfg = self.config.get('trajectory', {})
+        self.trajectory_interval = float(trajectory_cfg.get('sample_interval', 0.05))
+        self.trajectory_idle_grace = float(trajectory_cfg.get('idle_grace', 0.5))
+        self.scan_plan_timing = TuneTiming.from_config(self.config.get('scan_plan', {}))
+        model_cfg = self.config.get('tune_model', {})
+        self.tune_timeout_settings: Dict[str, float] = {
+            "timeout_factor": float(model_cfg.get('timeout_factor', 2.0)),
+            "timeout_margin": float(model_cfg.get('timeout_margin', 1.0)),
+            "min_timeout": float(model_cfg.get('min_timeout', 1.0)),
+        }
+        self.qcl_params_max_age = float(self.config.get('qcl_params', {}).get('max_age', 60.0))
+        parameter_log_cfg = self.config.get('parameter_log', {})
+        self.parameter_log_interval = 1.0 / max(float(parameter_log_cfg.get('sample_rate', 10.0)), 0.01)
+        queue_cfg = self.config.get('scan_queue', {})
+        self.scan_queue_intervals: Dict[str, float] = {
+            "coarse_interval": float(queue_cfg.get('coarse_interval', 0.2)),
+            "dense_interval": float(queue_cfg.get('dense_interval', 0.005)),
+            "end_guard": float(queue_cfg.get('end_guard', 0.05)),
+            "start_grace": float(queue_cfg.get('start_grace', 1.0)),
+            "timeout_factor": float(queue_cfg.get('timeout_factor', 1.5)),
+            "timeout_margin": float(queue_cfg.get('timeout_margin', 10.0)),
+        }
+        pingpong_cfg = self.config.get('pingpong', {})
+        self.pingpong_intervals: Dict[str, float] = {
+            "coarse_interval": float(pingpong_cfg.get('coarse_interval', 0.2)),
+            "dense_interval": float(pingpong_cfg.get('dense_interval', 0.005)),
+            "end_guard": float(pingpong_cfg.get('end_guard', 0.05)),
+        }
+
+    def _on_config_reload(self, version: int) -> None:
+        self.config = hardware_config.section('daylight_mircat')
+        self.config_version = version
+        self._apply_config()
+        logger.info(f"MIRcat configuration reloaded (version {version})")
     
     def _ensure_sdk(self) -> None:
         """Load MIRcatSDK DLL and prepare function prototypes."""
@@ -170,250 +464,223 @@ class MIRcatController:
             self.last_error_code = MIRcatError.SDK_ERROR
             raise Exception(msg)
 
-        # Restypes for calls we use
-        self._sdk.MIRcatSDK_Initialize.restype = c_uint32
-        self._sdk.MIRcatSDK_DeInitialize.restype = c_uint32
-        self._sdk.MIRcatSDK_SetCommType.restype = c_uint32
-        self._sdk.MIRcatSDK_SetSerialParams.restype = c_uint32
-        self._sdk.MIRcatSDK_GetAPIVersion.restype = c_uint32
-        self._sdk.MIRcatSDK_GetNumInstalledQcls.restype = c_uint32
-        try:
-            from ctypes import POINTER as _PTR
-            self._sdk.MIRcatSDK_GetNumInstalledQcls.argtypes = [_PTR(c_uint8)]
-        except Exception:
-            pass
-        self._sdk.MIRcatSDK_IsLaserArmed.restype = c_uint32
-        self._sdk.MIRcatSDK_DisarmLaser.restype = c_uint32
-        self._sdk.MIRcatSDK_ArmDisarmLaser.restype = c_uint32
-        self._sdk.MIRcatSDK_IsEmissionOn.restype = c_uint32
-        self._sdk.MIRcatSDK_TurnEmissionOn.restype = c_uint32
-        self._sdk.MIRcatSDK_TurnEmissionOff.restype = c_uint32
-        self._sdk.MIRcatSDK_IsTuned.restype = c_uint32
-        self._sdk.MIRcatSDK_GetActualWW.restype = c_uint32
-        self._sdk.MIRcatSDK_GetTuneWW.restype = c_uint32
-        self._sdk.MIRcatSDK_TuneToWW.restype = c_uint32
-        self._sdk.MIRcatSDK_AreTECsAtSetTemperature.restype = c_uint32
-        self._sdk.MIRcatSDK_IsInterlockedStatusSet.restype = c_uint32
-        self._sdk.MIRcatSDK_IsKeySwitchStatusSet.restype = c_uint32
-        self._sdk.MIRcatSDK_GetQCLTemperature.restype = c_uint32
-        self._sdk.MIRcatSDK_GetTecCurrent.restype = c_uint32
-        self._sdk.MIRcatSDK_GetQCLCurrent.restype = c_uint32
-        self._sdk.MIRcatSDK_GetQCLPulseRate.restype = c_uint32
-        self._sdk.MIRcatSDK_GetQCLPulseWidth.restype = c_uint32
-        self._sdk.MIRcatSDK_SetQCLParams.restype = c_uint32
-        self._sdk.MIRcatSDK_SetAllQclParams.restype = c_uint32
-        self._sdk.MIRcatSDK_StartSweepScan.restype = c_uint32
-        # Ensure correct parameter marshaling for sweep scan start
-        try:
-            self._sdk.MIRcatSDK_StartSweepScan.argtypes = [
-                c_float,  # fStartWW
-                c_float,  # fStopWW
-                c_float,  # fScanSpeed
-                c_uint8,  # bUnits
-                c_uint16, # wNumScans
-                c_bool,   # bIsBiDirectional (C bool)
-                c_uint8   # u8PreferredQcl
-            ]
-        except Exception:
-            pass
-        self._sdk.MIRcatSDK_StartStepMeasureModeScan.restype = c_uint32
-        self._sdk.MIRcatSDK_IsSweepBidirectional.restype = c_uint32
-        try:
-            self._sdk.MIRcatSDK_IsSweepBidirectional.argtypes = [POINTER(c_bool)]
-        except Exception:
-            pass
-        # Optional helpers to introspect sweep params
-        try:
-            if hasattr(self._sdk, 'MIRcatSDK_GetSweepNumScans'):
-                self._sdk.MIRcatSDK_GetSweepNumScans.restype = c_uint32
-                from ctypes import POINTER as _PTR  # avoid top-level name collision
-                self._sdk.MIRcatSDK_GetSweepNumScans.argtypes = [_PTR(c_uint16)]
-        except Exception:
-            pass
-        self._sdk.MIRcatSDK_SetNumMultiSpectralElements.restype = c_uint32
-        self._sdk.MIRcatSDK_AddMultiSpectralElement.restype = c_uint32
-        self._sdk.MIRcatSDK_StartMultiSpectralModeScan.restype = c_uint32
-        self._sdk.MIRcatSDK_GetScanStatus.restype = c_uint32
-        self._sdk.MIRcatSDK_StopScanInProgress.restype = c_uint32
-        self._sdk.MIRcatSDK_SetWlTrigParams.restype = c_uint32
-        # Optional manual step API
-        if hasattr(self._sdk, 'MIRcatSDK_ManualStepScanInProgress'):
-            self._sdk.MIRcatSDK_ManualStepScanInProgress.restype = c_uint32
-
-        # Optional Advanced Sweep APIs (guarded by config; some SDKs expose these)
-        try:
-            if hasattr(self._sdk, 'MIRcatSDK_SetAdvancedSweepParams'):
-                self._sdk.MIRcatSDK_SetAdvancedSweepParams.restype = c_uint32
-                # uint8 units, float start, float stop, float speed, uint16 numScans, bool bidir
-                self._sdk.MIRcatSDK_SetAdvancedSweepParams.argtypes = [
-                    c_uint8, c_float, c_float, c_float, c_uint16, c_bool
-                ]
-            if hasattr(self._sdk, 'MIRcatSDK_SetAdvancedSweepChanParams'):
-                self._sdk.MIRcatSDK_SetAdvancedSweepChanParams.restype = c_uint32
-                # uint8 qcl, float chStart, float chStop, bool useChannel
-                self._sdk.MIRcatSDK_SetAdvancedSweepChanParams.argtypes = [
-                    c_uint8, c_float, c_float, c_bool
-                ]
-            if hasattr(self._sdk, 'MIRcatSDK_StartSweepAdvancedScan'):
-                self._sdk.MIRcatSDK_StartSweepAdvancedScan.restype = c_uint32
-                self._sdk.MIRcatSDK_StartSweepAdvancedScan.argtypes = []
-            if hasattr(self._sdk, 'MIRcatSDK_ReadWriteAdvancedSweepParams'):
-                self._sdk.MIRcatSDK_ReadWriteAdvancedSweepParams.restype = c_uint32
-                self._sdk.MIRcatSDK_ReadWriteAdvancedSweepParams.argtypes = [c_bool]
-        except Exception:
-            pass
-        # Optional getters for sweep configuration to aid debugging
-        try:
-            if hasattr(self._sdk, 'MIRcatSDK_GetSweepStartWW'):
-                self._sdk.MIRcatSDK_GetSweepStartWW.restype = c_uint32
-                self._sdk.MIRcatSDK_GetSweepStartWW.argtypes = [POINTER(c_float), POINTER(c_uint8)]
-            if hasattr(self._sdk, 'MIRcatSDK_GetSweepStopWW'):
-                self._sdk.MIRcatSDK_GetSweepStopWW.restype = c_uint32
-                self._sdk.MIRcatSDK_GetSweepStopWW.argtypes = [POINTER(c_float), POINTER(c_uint8)]
-            if hasattr(self._sdk, 'MIRcatSDK_GetSweepScanSpeed'):
-                self._sdk.MIRcatSDK_GetSweepScanSpeed.restype = c_uint32
-                self._sdk.MIRcatSDK_GetSweepScanSpeed.argtypes = [POINTER(c_float), POINTER(c_uint8)]
-            if hasattr(self._sdk, 'MIRcatSDK_GetSweepNumScans'):
-                self._sdk.MIRcatSDK_GetSweepNumScans.restype = c_uint32
-                self._sdk.MIRcatSDK_GetSweepNumScans.argtypes = [POINTER(c_uint16)]
-            if hasattr(self._sdk, 'MIRcatSDK_GetActiveQcl'):
-                self._sdk.MIRcatSDK_GetActiveQcl.restype = c_uint32
-                self._sdk.MIRcatSDK_GetActiveQcl.argtypes = [POINTER(c_uint8)]
-        except Exception:
-            pass
-        # Pointing compensation SDK hooks (read-only; do not modify device state)
-        try:
-            if hasattr(self._sdk, 'MIRcatSDK_PointingControlsSupported'):
-                self._sdk.MIRcatSDK_PointingControlsSupported.restype = c_uint32
-                self._sdk.MIRcatSDK_PointingControlsSupported.argtypes = [POINTER(c_bool)]
-            if hasattr(self._sdk, 'MIRcatSDK_PointingGetCompensationEnabled'):
-                self._sdk.MIRcatSDK_PointingGetCompensationEnabled.restype = c_uint32
-                self._sdk.MIRcatSDK_PointingGetCompensationEnabled.argtypes = [POINTER(c_bool), POINTER(c_bool)]
-        except Exception:
-            pass
+        # argtypes/restype for every prototype in MIRcatSDK.h the DLL exports
+        self._bindings = MIRcatBindings(self._sdk)
 
     # (removed) _log_sdk_info helper
 
     def _sdk_ok(self, ret: int) -> bool:
         return int(ret) == 0
 
-    def _mircat_sdk_call(self, command: str, value: Any = None) -> Union[bool, int, float, str]:
-        """Interface to selected MIRcat SDK operations using ctypes bindings."""
-        self._ensure_sdk()
-        try:
-            if command == 'init':
-                # Initialize controller first (per SDK docs)
-                ret = self._sdk.MIRcatSDK_Initialize()
-                if not self._sdk_ok(ret):
-                    raise Exception(f"Initialize failed (code {int(ret)})")
-                self.sdk_initialized = True
-                # Configure comms after initialization (avoid NOT_INITIALIZED errors)
-                comm = self.config.get('communication', {}).get('comm_type', 'SERIAL')
-                if str(comm).upper() in ('SERIAL', 'DEFAULT'):
-                    _ = self._sdk.MIRcatSDK_SetCommType(c_uint8(self._COMM_SERIAL))
-                    baud = int(self.config.get('communication', {}).get('baud_rate') or 115200)
-                    _ = self._sdk.MIRcatSDK_SetSerialParams(c_uint16(self._SERIAL_PORT_AUTO), c_uint32(baud))
-                return True
+    def _sdk_calls(self) -> MIRcatBindings:
+        """Out-parameter stubs for the loaded SDK, e.g. ``self._sdk_calls().IsTuned()`` (SDK executor thread only)."""
+        bindings = self._bindings
+        if bindings is None or bindings.lib is not self._sdk:
+            bindings = self._bindings = MIRcatBindings(self._sdk)
+        return bindings
 
-            elif command == 'isconnected':
-                # No direct API; rely on controller connection flag
-                return bool(self.connected and self.sdk_initialized)
+    async def _sdk_run(self, fn, *args: Any, priority: int = CONTROL) -> Any:
+        """Run a blocking SDK function (or batch of calls) on the SDK executor thread."""
+        return await self._hw.run(fn, *args, priority=priority)
 
-            elif command == 'isarmed':
-                is_armed = c_bool(False)
-                ret = self._sdk.MIRcatSDK_IsLaserArmed(byref(is_armed))
-                if not self._sdk_ok(ret):
-                    raise Exception(f"IsLaserArmed failed ({int(ret)})")
-                return bool(is_armed.value)
+    async def _sdk_call(self, command: str, value: Any = None,
+                        priority: int = CONTROL) -> Union[bool, int, float, str]:
+        """Awaitable wrapper around _mircat_sdk_call executed on the SDK thread."""
+        return await self._hw.run(self._mircat_sdk_call, command, value, priority=priority)
 
-            elif command == 'istuned':
-                is_tuned = c_bool(False)
-                ret = self._sdk.MIRcatSDK_IsTuned(byref(is_tuned))
-                if not self._sdk_ok(ret):
-                    raise Exception(f"IsTuned failed ({int(ret)})")
-                return bool(is_tuned.value)
+    async def _wait_for_sdk_flag(self, name: str, command: str, expected: bool = True,
+                                 timeout: Optional[float] = None) -> float:
+        """Wait until an SDK boolean query returns ``expected``; records latency under ``name``.
 
-            elif command == 'temperaturestable':
-                at_temp = c_bool(False)
-                ret = self._sdk.MIRcatSDK_AreTECsAtSetTemperature(byref(at_temp))
-                if not self._sdk_ok(ret):
-                    raise Exception(f"AreTECsAtSetTemperature failed ({int(ret)})")
-                return bool(at_temp.value)
+        ``timeout`` overrides the configured deadline for this wait.
+        """
+        async def _reached() -> bool:
+            return bool(await self._sdk_call(command)) == expected
 
-            elif command == 'isinterlocked':
-                interlock = c_bool(False)
-                ret = self._sdk.MIRcatSDK_IsInterlockedStatusSet(byref(interlock))
-                if not self._sdk_ok(ret):
-                    raise Exception(f"IsInterlockedStatusSet failed ({int(ret)})")
-                return bool(interlock.value)
+        return await wait_for_condition(
+            _reached,
+            self.completion_timeouts[name] if timeout is None else timeout,
+            name=name,
+            histogram=self.completion_latency[name],
+            **self.completion_wait_intervals,
+        )
 
-            elif command == 'iskeyswitch':
-                ks = c_bool(False)
-                ret = self._sdk.MIRcatSDK_IsKeySwitchStatusSet(byref(ks))
-                if not self._sdk_ok(ret):
-                    raise Exception(f"IsKeySwitchStatusSet failed ({int(ret)})")
-                return bool(ks.value)
-
-            elif command == 'emission':
-                if value:
-                    ret = self._sdk.MIRcatSDK_TurnEmissionOn()
-                    if not self._sdk_ok(ret):
-                        raise Exception(f"TurnEmissionOn failed ({int(ret)})")
-                else:
-                    ret = self._sdk.MIRcatSDK_TurnEmissionOff()
-                    if not self._sdk_ok(ret):
-                        raise Exception(f"TurnEmissionOff failed ({int(ret)})")
-                return True
+    def get_completion_latency(self) -> Dict[str, Any]:
+        """Per-operation completion latency summaries (seconds) and current wait settings."""
+        return {
+            "operations": {
+                name: {"timeout": self.completion_timeouts[name], **hist.summary()}
+                for name, hist in self.completion_latency.items()
+            },
+            "multispectral_chunk_gap": self.multispectral_chunk_gap.summary(),
+            "pingpong_turnaround_gap": self.pingpong_turnaround_gap.summary(),
+            "pingpong_turnarounds": list(self.pingpong_turnarounds),
+            "stop_latency": self.stop_latency.summary(),
+            "status_coalescing": dict(self.status_coalescing),
+            "executor": self._hw.stats(),
+            **self.completion_wait_intervals,
+        }
 
-            elif command == 'isemitting':
-                is_on = c_bool(False)
-                ret = self._sdk.MIRcatSDK_IsEmissionOn(byref(is_on))
-                if not self._sdk_ok(ret):
-                    raise Exception(f"IsEmissionOn failed ({int(ret)})")
-                return bool(is_on.value)
-
-            elif command == 'arm':
-                # Ensure armed state
-                if not self._mircat_sdk_call('isarmed'):
-                    ret = self._sdk.MIRcatSDK_ArmDisarmLaser()
-                    if not self._sdk_ok(ret):
-                        raise Exception(f"ArmDisarmLaser failed ({int(ret)})")
-                return True
+    def register_metrics(self, registry: MetricsRegistry) -> None:
+        """Export device gauges and the controller's latency histograms to /metrics."""
+        gauges = {
+            "mircat_connected": ("SDK connection state", lambda: self.connected),
+            "mircat_armed": ("Laser armed", lambda: self.armed),
+            "mircat_emission_on": ("Laser emission on", lambda: self.emission_on),
+            "mircat_tuned": ("Laser tuned", lambda: self.tuned),
+            "mircat_scan_in_progress": ("Scan running", lambda: self.scan_in_progress),
+            "mircat_scan_percent": ("Current scan percent complete", lambda: self.current_scan_percent),
+            "mircat_scan_number": ("Current scan number", lambda: self.current_scan_number),
+            "mircat_wavenumber_cm1": ("Last known wavenumber (cm-1)", lambda: self.current_wavenumber),
+        }
+        for name, (help_text, fn) in gauges.items():
+            registry.gauge_callback(name, help_text, fn)
+        registry.gauge_callback(
+            "mircat_executor_queued", "SDK calls waiting per priority class",
+            lambda: {(p,): n for p, n in self._hw.stats()["queued"].items()}, ("priority",))
+        registry.histogram_callback(
+            "mircat_executor_queue_wait_seconds", "Time SDK calls waited for the worker thread",
+            lambda: {(PRIORITY_NAMES[p],): hist for p, hist in self._hw.queue_wait.items()}, ("priority",))
+        registry.histogram_callback(
+            "mircat_completion_seconds", "Awaited hardware condition latency",
+            lambda: {(name,): hist for name, hist in self.completion_latency.items()}, ("operation",))
+        registry.counter_callback(
+            "mircat_completion_timeouts_total", "Awaited hardware conditions that timed out",
+            lambda: {(name,): hist.timeouts for name, hist in self.completion_latency.items()}, ("operation",))
+        registry.histogram_callback(
+            "mircat_stop_latency_seconds", "stop_scan request to StopScanInProgress", lambda: self.stop_latency)
+        registry.histogram_callback(
+            "mircat_pingpong_turnaround_gap_seconds", "Ping-pong reversal dead time",
+            lambda: self.pingpong_turnaround_gap)
+        registry.histogram_callback(
+            "mircat_multispectral_chunk_gap_seconds", "Streamed multispectral chunk dead time",
+            lambda: self.multispectral_chunk_gap)
+        registry.counter_callback(
+            "mircat_status_coalescing_total", "Status refresh coalescing events and SDK calls saved",
+            lambda: {(kind,): n for kind, n in self.status_coalescing.items()}, ("kind",))
 
-            elif command == 'disarm':
-                # Explicitly disarm laser
-                ret = self._sdk.MIRcatSDK_DisarmLaser()
-                if not self._sdk_ok(ret):
-                    raise Exception(f"DisarmLaser failed ({int(ret)})")
-                return True
+    def _tune_timeout(self, from_wn: Optional[float], to_wn: float, qcl: int) -> float:
+        """Deadline for one tune: scaled model prediction plus margin, or the configured tune timeout."""
+        predicted = self.tune_model.predict(from_wn, to_wn, qcl)
+        if predicted is None:
+            return self.completion_timeouts["tune"]
+        settings = self.tune_timeout_settings
+        return max(settings["min_timeout"], predicted * settings["timeout_factor"] + settings["timeout_margin"])
 
-            elif command == 'wavenumber':
-                # Tune to wavenumber in cm^-1 on given QCL (default 1)
-                qcl = int(self.current_qcl or 1)
-                ret = self._sdk.MIRcatSDK_TuneToWW(c_float(float(value)), c_uint8(self._UNITS_CM1), c_uint8(qcl))
-                if not self._sdk_ok(ret):
-                    raise Exception(f"TuneToWW failed ({int(ret)}) for {value} cm^-1 on QCL {qcl}")
-                # Update internal setpoint
-                self.current_wavenumber = float(value)
-                return True
+    def _tune_timing(self) -> TuneTiming:
+        """Scan plan tuning model for the selected QCL: the learned fit when available, else [scan_plan]."""
+        return self.tune_model.timing(int(self.current_qcl or 1), self.scan_plan_timing)
 
-            elif command == 'temperature':
-                # Return current QCL temperature (float)
-                qcl = int(self.current_qcl or 1)
-                temp = c_float(0)
-                ret = self._sdk.MIRcatSDK_GetQCLTemperature(c_uint8(qcl), byref(temp))
-                if not self._sdk_ok(ret):
-                    raise Exception(f"GetQCLTemperature failed ({int(ret)}) for QCL {qcl}")
-                return float(temp.value)
+    def get_tune_model(self) -> Dict[str, Any]:
+        """Logged tunes, per-QCL fits and the timing and timeout settings derived from them."""
+        timing = self._tune_timing()
+        return {
+            **self.tune_model.summary(),
+            "timeout_settings": {"default_timeout": self.completion_timeouts["tune"], **self.tune_timeout_settings},
+            # JSON has no inf; a rate that is not finite is reported as null
+            "plan_timing": {"settle_time": timing.settle_time,
+                            "rate": timing.rate if math.isfinite(timing.rate) else None,
+                            "learned": timing is not self.scan_plan_timing},
+        }
 
-            else:
+    def _mircat_sdk_call(self, command: str, value: Any = None) -> Union[bool, int, float, str]:
+        """Interface to selected MIRcat SDK operations using ctypes bindings."""
+        self._ensure_sdk()
+        start = time.perf_counter()
+        try:
+            getter = self._SDK_FLAG_QUERIES.get(command)
+            if getter is not None:
+                ret, (flag,) = getattr(self._sdk_calls(), getter)()
+                if not self._sdk_ok(ret):
+                    raise Exception(f"{getter} failed ({int(ret)})")
+                return bool(flag)
+            handler = self._SDK_COMMANDS.get(command)
+            if handler is None:
                 raise Exception(f"Unknown MIRcat SDK command: {command}")
+            return handler(self, value)
 
         except Exception as e:
+            _command_failures.labels(command).inc()
             self.last_error = str(e)
             self.last_error_code = MIRcatError.COMMUNICATION_ERROR
+            self._multispectral_fingerprint = None
             logger.error(f"MIRcat SDK call failed: {command} - {e}")
             raise
+        finally:
+            _command_latency.labels(command).record(time.perf_counter() - start)
+
+    def _cmd_init(self, value: Any) -> bool:
+        # Initialize controller first (per SDK docs)
+        ret = self._sdk.MIRcatSDK_Initialize()
+        if not self._sdk_ok(ret):
+            raise Exception(f"Initialize failed (code {int(ret)})")
+        self.sdk_initialized = True
+        # Configure comms after initialization (avoid NOT_INITIALIZED errors)
+        comm = self.config.get('communication', {}).get('comm_type', 'SERIAL')
+        if str(comm).upper() in ('SERIAL', 'DEFAULT'):
+            _ = self._sdk.MIRcatSDK_SetCommType(self._COMM_SERIAL)
+            baud = int(self.config.get('communication', {}).get('baud_rate') or 115200)
+            _ = self._sdk.MIRcatSDK_SetSerialParams(self._SERIAL_PORT_AUTO, baud)
+        return True
+
+    def _cmd_isconnected(self, value: Any) -> bool:
+        # No direct API; rely on controller connection flag
+        return bool(self.connected and self.sdk_initialized)
+
+    def _cmd_emission(self, value: Any) -> bool:
+        if value:
+            ret = self._sdk.MIRcatSDK_TurnEmissionOn()
+            if not self._sdk_ok(ret):
+                raise Exception(f"TurnEmissionOn failed ({int(ret)})")
+        else:
+            ret = self._sdk.MIRcatSDK_TurnEmissionOff()
+            if not self._sdk_ok(ret):
+                raise Exception(f"TurnEmissionOff failed ({int(ret)})")
+        return True
+
+    def _cmd_arm(self, value: Any) -> bool:
+        # Ensure armed state
+        if not self._mircat_sdk_call("isarmed"):
+            ret = self._sdk.MIRcatSDK_ArmDisarmLaser()
+            if not self._sdk_ok(ret):
+                raise Exception(f"ArmDisarmLaser failed ({int(ret)})")
+        return True
+
+    def _cmd_disarm(self, value: Any) -> bool:
+        # Explicitly disarm laser
+        ret = self._sdk.MIRcatSDK_DisarmLaser()
+        if not self._sdk_ok(ret):
+            raise Exception(f"DisarmLaser failed ({int(ret)})")
+        return True
+
+    def _cmd_wavenumber(self, value: Any) -> bool:
+        # Tune to wavenumber in cm^-1 on given QCL (default 1)
+        qcl = int(self.current_qcl or 1)
+        ret = self._sdk.MIRcatSDK_TuneToWW(float(value), self._UNITS_CM1, qcl)
+        if not self._sdk_ok(ret):
+            raise Exception(f"TuneToWW failed ({int(ret)}) for {value} cm^-1 on QCL {qcl}")
+        # Update internal setpoint
+        self.current_wavenumber = float(value)
+        return True
+
+    def _cmd_temperature(self, value: Any) -> float:
+        # Return current QCL temperature (float)
+        qcl = int(self.current_qcl or 1)
+        ret, (temp,) = self._sdk_calls().GetQCLTemperature(qcl)
+        if not self._sdk_ok(ret):
+            raise Exception(f"GetQCLTemperature failed ({int(ret)}) for QCL {qcl}")
+        return float(temp)
+
+    # _mircat_sdk_call command -> handler (boolean queries go through _SDK_FLAG_QUERIES)
+    _SDK_COMMANDS = {
+        "init": _cmd_init,
+        "isconnected": _cmd_isconnected,
+        "emission": _cmd_emission,
+        "arm": _cmd_arm,
+        "disarm": _cmd_disarm,
+        "wavenumber": _cmd_wavenumber,
+        "temperature": _cmd_temperature,
+    }
 
     async def connect(self) -> bool:
         """Connect to MIRcat device using real SDK - requires actual hardware"""
@@ -421,11 +688,18 @@ class MIRcatController:
             logger.info("Attempting to connect to real MIRcat hardware...")
             
             # Initialize real MIRcat SDK and mark connected
-            self._mircat_sdk_call("init")
+            self._multispectral_fingerprint = None
+            self._qcl_params.clear()
+            self._wl_trig_applied = None
+            await self._sdk_call("init")
             self.connected = True
+            await self._refresh_qcl_params()
             
-            # Get real hardware status
-            await self._update_hardware_status()
+            # Get real hardware status, then hand periodic reads to the poller
+            self._invalidate_status()
+            await self._update_hardware_status(force=True)
+            await self.start_status_poller()
+            await self.start_parameter_logger()
             
             logger.info("Successfully connected to MIRcat hardware")
             return True
@@ -441,6 +715,14 @@ class MIRcatController:
         """Disconnect from MIRcat device"""
         try:
             logger.info("Disconnecting from MIRcat...")
+            self._multispectral_fingerprint = None
+            self._qcl_params.clear()
+            self._wl_trig_applied = None
+            await self.scan_queue.cancel(stop_scan=False)
+            await self.stop_status_poller()
+            await self.stop_parameter_logger()
+            await self._stop_multispectral_stream()
+            await self._stop_trajectory_recording()
             
             # Safely shutdown
             if self.emission_on:
@@ -449,13 +731,13 @@ class MIRcatController:
             if self.armed:
                 # Only disarm; do not power off the system
                 try:
-                    self._mircat_sdk_call("disarm")
+                    await self._sdk_call("disarm")
                 except Exception as e:
                     logger.warning(f"Disarm during disconnect reported error: {e}")
             # De-initialize SDK connection if loaded
             try:
                 if self._sdk is not None and self.sdk_initialized:
-                    ret = self._sdk.MIRcatSDK_DeInitialize()
+                    ret = await self._sdk_run(self._sdk.MIRcatSDK_DeInitialize)
                     if int(ret) != 0:
                         logger.warning(f"MIRcatSDK_DeInitialize returned code {int(ret)}")
             except Exception as e:
@@ -483,6 +765,7 @@ class MIRcatController:
                 "case_temp_2": 0.0,
                 "pcb_temperature": 0.0
             })
+            self._publish_snapshot()
             
             logger.info("MIRcat disconnected successfully")
             return True
@@ -503,31 +786,27 @@ class MIRcatController:
             logger.info("Arming MIRcat laser...")
             
             # Check interlocks first
-            interlocked = self._mircat_sdk_call("isinterlocked")
+            interlocked = await self._sdk_call("isinterlocked")
             if not interlocked:
                 self.last_error = "Interlocks not enabled - check safety interlock connection"
                 self.last_error_code = MIRcatError.INTERLOCK_FAULT
                 raise Exception("Interlocks not enabled")
             
             # Arm the laser
-            self._mircat_sdk_call("arm")
+            await self._sdk_call("arm")
             
-            # Poll for armed state up to 15s
-            for _ in range(60):
-                if self._mircat_sdk_call("isarmed"):
-                    break
-                await asyncio.sleep(0.25)
-            else:
+            # Poll for armed state
+            try:
+                await self._wait_for_sdk_flag("arm", "isarmed")
+            except ConditionTimeout:
                 self.last_error = "Arming sequence failed"
                 self.last_error_code = MIRcatError.HARDWARE_ERROR
                 raise Exception("Arming failed")
             
             # After arming, wait for TECs at set temperature (SDK sample flow)
-            for _ in range(240):  # up to 60s (0.25s * 240)
-                if self._mircat_sdk_call("temperaturestable"):
-                    break
-                await asyncio.sleep(0.25)
-            else:
+            try:
+                await self._wait_for_sdk_flag("arm_temperature", "temperaturestable")
+            except ConditionTimeout:
                 self.last_error = "Temperature not stable after arming"
                 self.last_error_code = MIRcatError.TEMPERATURE_UNSTABLE
                 raise Exception("Temperature not stable after arming")
@@ -536,7 +815,7 @@ class MIRcatController:
             self.last_error = None
             self.last_error_code = None
             
-            await self._update_hardware_status()
+            await self._update_hardware_status(force=True)
             logger.info("MIRcat laser armed successfully")
             return True
             
@@ -554,19 +833,17 @@ class MIRcatController:
                 await self.turn_emission_off()
             
             # Disarm laser
-            self._mircat_sdk_call("disarm")
+            await self._sdk_call("disarm", priority=SAFETY)
             
-            # Wait until laser is reported disarmed (max 10s)
-            for _ in range(40):
-                if not self._mircat_sdk_call("isarmed"):
-                    break
-                await asyncio.sleep(0.25)
-            else:
+            # Wait until laser is reported disarmed
+            try:
+                await self._wait_for_sdk_flag("disarm", "isarmed", expected=False)
+            except ConditionTimeout:
                 self.last_error = "Disarm timeout"
                 self.last_error_code = MIRcatError.HARDWARE_ERROR
                 raise Exception("Disarm timeout")
             
-            await self._update_hardware_status()
+            await self._update_hardware_status(force=True)
             logger.info("MIRcat laser disarmed successfully")
             return True
             
@@ -594,19 +871,17 @@ class MIRcatController:
         
         try:
             logger.info("Turning MIRcat emission on...")
-            self._mircat_sdk_call("emission", 1)
+            await self._sdk_call("emission", 1)
             
-            # Wait until emission is on (max 5s)
-            for _ in range(20):
-                if self._mircat_sdk_call("isemitting"):
-                    break
-                await asyncio.sleep(0.25)
-            else:
+            # Wait until emission is on
+            try:
+                await self._wait_for_sdk_flag("emission_on", "isemitting")
+            except ConditionTimeout:
                 self.last_error = "Emission on timeout"
                 self.last_error_code = MIRcatError.EMISSION_TIMEOUT
                 raise Exception("Emission on timeout")
             
-            await self._update_hardware_status()
+            await self._update_hardware_status(force=True)
             logger.info("MIRcat emission turned on successfully")
             return True
             
@@ -618,19 +893,17 @@ class MIRcatController:
         """Turn laser emission off"""
         try:
             logger.info("Turning MIRcat emission off...")
-            self._mircat_sdk_call("emission", 0)
+            await self._sdk_call("emission", 0, priority=SAFETY)
             
-            # Wait until emission is off (max 5s)
-            for _ in range(20):
-                if not self._mircat_sdk_call("isemitting"):
-                    break
-                await asyncio.sleep(0.25)
-            else:
+            # Wait until emission is off
+            try:
+                await self._wait_for_sdk_flag("emission_off", "isemitting", expected=False)
+            except ConditionTimeout:
                 self.last_error = "Emission off timeout"
                 self.last_error_code = MIRcatError.EMISSION_TIMEOUT
                 raise Exception("Emission off timeout")
             
-            await self._update_hardware_status()
+            await self._update_hardware_status(force=True)
             logger.info("MIRcat emission turned off successfully")
             return True
             
@@ -650,26 +923,29 @@ class MIRcatController:
             logger.info(f"Tuning MIRcat to {wavenumber} cm-1...")
             
             # Check temperature stability before tuning
-            temp_stable = self._mircat_sdk_call("temperaturestable")
+            temp_stable = await self._sdk_call("temperaturestable")
             if not temp_stable:
                 self.last_error = "Temperature not stable - wait for thermal equilibrium before tuning"
                 self.last_error_code = MIRcatError.TEMPERATURE_UNSTABLE
                 raise Exception("Temperature not stable")
             
             # Tune to wavenumber
-            self._mircat_sdk_call("wavenumber", wavenumber)
+            from_wn = self._plan_start_wavenumber()
+            qcl = int(self.current_qcl or 1)
+            timeout = self._tune_timeout(from_wn, wavenumber, qcl)
+            t_issued = time.monotonic()
+            await self._sdk_call("wavenumber", wavenumber)
             
-            # Wait for tuning to complete (up to 5 seconds)
-            for _ in range(10):
-                if self._mircat_sdk_call("istuned"):
-                    break
-                await asyncio.sleep(0.5)
-            else:
+            # Wait for tuning to complete
+            try:
+                await self._wait_for_sdk_flag("tune", "istuned", timeout=timeout)
+                self.tune_model.record(from_wn, float(wavenumber), qcl, time.monotonic() - t_issued)
+            except ConditionTimeout:
                 self.last_error = "Tuning timeout - laser failed to reach target wavenumber"
                 self.last_error_code = MIRcatError.TUNING_TIMEOUT
                 raise Exception("Tuning timeout")
             
-            await self._update_hardware_status()
+            await self._update_hardware_status(force=True)
             logger.info(f"MIRcat tuned to {wavenumber} cm-1 successfully")
             return True
             
@@ -679,7 +955,7 @@ class MIRcatController:
     
     async def set_laser_mode(self, mode: str) -> bool:
         """Set laser operation mode"""
-        valid_modes = self.config.get('parameters', {}).get('laser_mode_options', ['Pulsed', 'CW', 'CW + Modulation'])
+        valid_modes = list(self.limits.laser_mode_options)
         
         if mode not in valid_modes:
             self.last_error = f"Invalid laser mode. Valid modes: {valid_modes}"
@@ -690,6 +966,7 @@ class MIRcatController:
             logger.info(f"Setting MIRcat laser mode to {mode}...")
             # SDK call would be implemented here
             self.laser_mode = mode
+            self._publish_snapshot()
             
             logger.info(f"MIRcat laser mode set to {mode} successfully")
             return True
@@ -701,17 +978,21 @@ class MIRcatController:
     
     async def set_pulse_parameters(self, pulse_rate: int, pulse_width: int, current_mA: Optional[float] = None) -> bool:
         """Set pulse rate and width for pulsed mode. Optionally include current (mA)."""
+        return await self._apply_pulse_parameters(pulse_rate, pulse_width, current_mA) is not None
+
+    async def _apply_pulse_parameters(self, pulse_rate: int, pulse_width: int,
+                                      current_mA: Optional[float] = None) -> Optional[bool]:
+        """set_pulse_parameters; returns True when SetQCLParams was written, False when the
+        cached parameters already matched, and None when the write failed."""
         if self.laser_mode != "Pulsed":
             self.last_error = "Pulse parameters only valid in Pulsed mode"
             self.last_error_code = MIRcatError.INVALID_PARAMETER
             raise Exception("Pulse parameters only valid in Pulsed mode")
         
         # Validate parameters against config
-        params = self.config.get('parameters', {})
-        min_rate = params.get('pulse_rate_min', 10)
-        max_rate = params.get('pulse_rate_max', 3000000)
-        min_width = params.get('pulse_width_min', 20)
-        max_width = params.get('pulse_width_max', 1000)
+        limits = self.limits
+        min_rate, max_rate = limits.pulse_rate_min, limits.pulse_rate_max
+        min_width, max_width = limits.pulse_width_min, limits.pulse_width_max
         
         if not (min_rate <= pulse_rate <= max_rate):
             self.last_error = f"Pulse rate {pulse_rate} outside valid range {min_rate}-{max_rate}"
@@ -724,41 +1005,219 @@ class MIRcatController:
             raise Exception(f"Pulse width {pulse_width} outside valid range {min_width}-{max_width}")
         
         try:
-            logger.info(f"Setting pulse parameters: rate={pulse_rate}, width={pulse_width}")
             qcl = int(self.current_qcl or 1)
-            # Determine current to use
-            if current_mA is None:
-                cur = c_float(0)
-                try:
-                    if self._sdk_ok(self._sdk.MIRcatSDK_GetQCLCurrent(c_uint8(qcl), byref(cur))):
-                        current_mA = float(cur.value)
-                except Exception:
-                    current_mA = None
+            # Without a requested current the write keeps the QCL's current, so only rate and width matter
+            wanted = (float(pulse_rate), float(pulse_width)) + (() if current_mA is None else (float(current_mA),))
+            names = ("pulse_rate", "pulse_width", "current")[:len(wanted)]
+            cached = self._cached_qcl_params(qcl, *names)
+            if cached is not None and all(_same_param(a, b) for a, b in zip(cached, wanted)):
+                self.qcl_params_cache["skipped_writes"] += 1
+                self.pulse_rate, self.pulse_width = cached[0], cached[1]
+                self._publish_snapshot()
+                logger.info(f"Pulse parameters unchanged on QCL {qcl} (rate={pulse_rate}, width={pulse_width}); skipped SetQCLParams")
+                return False
+
+            logger.info(f"Setting pulse parameters: rate={pulse_rate}, width={pulse_width}")
             if current_mA is None:
-                current_mA = float(self.config.get('parameters', {}).get('pulsed_current_default', 500))
-            # Apply to current QCL with current
-            ret = self._sdk.MIRcatSDK_SetQCLParams(
-                c_uint8(qcl), c_float(float(pulse_rate)), c_float(float(pulse_width)), c_float(float(current_mA))
-            )
-            if not self._sdk_ok(ret):
-                raise Exception(f"SetQCLParams failed ({int(ret)})")
-            # Read back
-            pr = c_float(0)
-            pw = c_float(0)
-            ret1 = self._sdk.MIRcatSDK_GetQCLPulseRate(c_uint8(qcl), byref(pr))
-            ret2 = self._sdk.MIRcatSDK_GetQCLPulseWidth(c_uint8(qcl), byref(pw))
-            if not (self._sdk_ok(ret1) and self._sdk_ok(ret2)):
+                cached_current = self._cached_qcl_params(qcl, "current")
+                if cached_current is not None:
+                    current_mA = cached_current[0]
+                    self.qcl_params_cache["skipped_current_reads"] += 1
+                else:
+                    self.qcl_params_cache["current_reads"] += 1
+            default_current = self.limits.pulsed_current_default
+            self.qcl_params_cache["writes"] += 1
+            try:
+                readback, current_used = await self._sdk_run(
+                    self._write_qcl_params, qcl, float(pulse_rate), float(pulse_width), current_mA, default_current
+                )
+            except Exception:
+                # The write may have been partly applied; re-read before trusting the cache again
+                self._qcl_params.pop(qcl, None)
+                raise
+            if readback is None:
                 logger.warning("Readback of pulse parameters failed after setting")
+                self._qcl_params.pop(qcl, None)
             else:
-                self.pulse_rate = float(pr.value)
-                self.pulse_width = float(pw.value)
+                self.pulse_rate, self.pulse_width = readback
+                self._poll_last["pulse"] = time.monotonic()
+                self._update_qcl_params(qcl, pulse_rate=readback[0], pulse_width=readback[1], current=current_used)
+            self._publish_snapshot()
             logger.info("Pulse parameters set successfully")
             return True
         
         except Exception as e:
             self.last_error = f"Failed to set pulse parameters: {str(e)}"
             logger.error(f"Failed to set pulse parameters: {e}")
-            return False
+            return None
+
+    def _write_qcl_params(self, qcl: int, pulse_rate: float, pulse_width: float,
+                          current_mA: Optional[float], default_current: float) -> tuple:
+        """Apply QCL pulse params and read them back (runs on the SDK executor thread).
+
+        Returns ((pulse rate, pulse width) read back or None, current written).
+        """
+        # Determine current to use
+        if current_mA is None:
+            cur = c_float(0)
+            try:
+                if self._sdk_ok(self._sdk.MIRcatSDK_GetQCLCurrent(c_uint8(qcl), byref(cur))):
+                    current_mA = float(cur.value)
+            except Exception:
+                current_mA = None
+        if current_mA is None:
+            current_mA = default_current
+        # Apply to current QCL with current
+        ret = self._sdk.MIRcatSDK_SetQCLParams(
+            c_uint8(qcl), c_float(pulse_rate), c_float(pulse_width), c_float(float(current_mA))
+        )
+        if not self._sdk_ok(ret):
+            raise Exception(f"SetQCLParams failed ({int(ret)})")
+        # Read back
+        ret1, (pr,) = self._sdk_calls().GetQCLPulseRate(qcl)
+        ret2, (pw,) = self._sdk_calls().GetQCLPulseWidth(qcl)
+        if not (self._sdk_ok(ret1) and self._sdk_ok(ret2)):
+            return None, float(current_mA)
+        return (float(pr), float(pw)), float(current_mA)
+
+    def _read_qcl_params(self, qcls: List[int]) -> Dict[int, Dict[str, float]]:
+        """Read pulse rate, pulse width and current of each QCL (runs on the SDK executor thread)."""
+        calls = self._sdk_calls()
+        params: Dict[int, Dict[str, float]] = {}
+        for qcl in qcls:
+            values: Dict[str, float] = {}
+            for name, getter in (("pulse_rate", "GetQCLPulseRate"), ("pulse_width", "GetQCLPulseWidth"),
+                                 ("current", "GetQCLCurrent")):
+                try:
+                    ret, (value,) = getattr(calls, getter)(qcl)
+                except Exception:
+                    continue
+                if self._sdk_ok(ret):
+                    values[name] = float(value)
+            params[qcl] = values
+        return params
+
+    async def _refresh_qcl_params(self) -> None:
+        """Reload the QCL parameter cache from hardware (on connect); failures leave entries unknown."""
+        try:
+            params = await self._sdk_run(self._read_qcl_params, list(range(1, self.limits.num_qcls + 1)))
+        except Exception as e:
+            logger.warning(f"QCL parameter cache refresh failed: {e}")
+            return
+        for qcl, values in params.items():
+            self._update_qcl_params(qcl, **values)
+
+    def _cached_qcl_params(self, qcl: int, *names: str) -> Optional[tuple]:
+        """Cached values of ``names`` for ``qcl`` if all are known and younger than qcl_params max_age, else None."""
+        entry = self._qcl_params.get(qcl)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        values = []
+        for name in names:
+            value, updated = entry.get(name, (None, 0.0))
+            if value is None or (self.qcl_params_max_age > 0 and now - updated > self.qcl_params_max_age):
+                return None
+            values.append(value)
+        return tuple(values)
+
+    def _update_qcl_params(self, qcl: int, **values: Optional[float]) -> None:
+        now = time.monotonic()
+        entry = self._qcl_params.setdefault(int(qcl), {})
+        for name, value in values.items():
+            if value is not None:
+                entry[name] = (float(value), now)
+
+    def get_qcl_params(self) -> Dict[str, Any]:
+        """Cached QCL parameters with their age, plus write/read skip counters."""
+        now = time.monotonic()
+        return {
+            "max_age": self.qcl_params_max_age,
+            "qcls": {
+                str(qcl): {name: {"value": value, "age": now - updated} for name, (value, updated) in entry.items()}
+                for qcl, entry in sorted(self._qcl_params.items())
+            },
+            **self.qcl_params_cache,
+        }
+
+    # Scan plans: validated per-point columns and predicted timing, no hardware access
+    def _plan_start_wavenumber(self) -> Optional[float]:
+        """Where the first tune of a new scan starts from, when known."""
+        if self.tuned and self.current_wavenumber:
+            return float(self.current_wavenumber)
+        return None
+
+    def _checked_plan(self, mode: str, compile_plan, *args: Any) -> ScanPlan:
+        """Compile a plan before starting a scan; invalid requests set last_error and re-raise."""
+        try:
+            return compile_plan(*args)
+        except ScanPlanError as e:
+            self.last_error = f"Invalid {mode} scan: {e}"
+            self.last_error_code = MIRcatError.INVALID_PARAMETER
+            raise
+
+    def plan_sweep_scan(self, start_wn: float, end_wn: float, scan_speed: float, num_scans: int = 1,
+                        bidirectional: bool = False, points: int = DEFAULT_SWEEP_POINTS) -> ScanPlan:
+        """Sweep plan sampled at ``points`` positions per pass"""
+        limits = self.limits
+        return compile_sweep(
+            float(start_wn), float(end_wn), float(scan_speed), int(num_scans), bool(bidirectional),
+            limits.wavenumber_min, limits.wavenumber_max, self._tune_timing(),
+            self._plan_start_wavenumber(), points,
+        )
+
+    def plan_step_scan(self, start_wn: float, end_wn: float, step_size: float, dwell_time: int,
+                       num_scans: int = 1) -> ScanPlan:
+        """Step and measure plan using the same dwell settings as start_step_scan"""
+        _proc_mode, _pulse_mode, step_time_ms, step_delay_ms = self._step_trigger_settings(dwell_time)
+        limits = self.limits
+        return compile_step(
+            float(start_wn), float(end_wn), float(step_size), int(num_scans), step_time_ms, step_delay_ms,
+            limits.wavenumber_min, limits.wavenumber_max, self._tune_timing(),
+            self._plan_start_wavenumber(), limits.step_size_min,
+        )
+
+    def plan_multispectral_scan(self, wavelength_list: List[Dict], num_scans: int = 1,
+                                keep_laser_on: bool = False, ordering: str = "as_entered") -> ScanPlan:
+        """Multispectral plan; out-of-range wavenumbers are clamped as when starting the scan.
+
+        ``ordering="optimized"`` reorders the elements to minimize predicted tuning time.
+        """
+        return self.plan_multispectral_columns(
+            [float(entry.get('wavenumber')) for entry in wavelength_list],
+            [int(entry.get('dwell_time')) for entry in wavelength_list],
+            [int(entry.get('off_time')) for entry in wavelength_list],
+            num_scans, keep_laser_on, ordering,
+        )
+
+    def plan_multispectral_columns(self, wavenumbers: List[float], dwell_ms: List[int], off_ms: List[int],
+                                   num_scans: int = 1, keep_laser_on: bool = False,
+                                   ordering: str = "as_entered") -> ScanPlan:
+        """plan_multispectral_scan for a list already split into columns"""
+        limits = self.limits
+        return compile_multispectral(
+            wavenumbers, dwell_ms, off_ms, int(num_scans), bool(keep_laser_on),
+            limits.wavenumber_min, limits.wavenumber_max, self._tune_timing(),
+            self._plan_start_wavenumber(), ordering,
+        )
+
+    def _step_trigger_settings(self, dwell_time: int) -> tuple:
+        """(process trigger mode, pulse mode, step time ms, step delay ms) from the in-memory user settings."""
+        proc_mode = 1  # internal default
+        pulse_mode = 1
+        step_time_ms = dwell_time
+        step_delay_ms = 0
+        try:
+            settings = self.user_settings
+            proc_mode = settings.process_trigger_mode_code(proc_mode)
+            pulse_mode = settings.pulse_mode_code(pulse_mode)
+            if settings.internal_step_time_ms() is not None:
+                step_time_ms = settings.internal_step_time_ms()
+            if settings.internal_step_delay_ms() is not None:
+                step_delay_ms = settings.internal_step_delay_ms()
+        except Exception as e:
+            logger.warning(f"Reading user settings failed: {e}")
+        return proc_mode, pulse_mode, step_time_ms, step_delay_ms
 
     # Scan Operations - ALL require real MIRcat hardware
     async def start_sweep_scan(self, start_wn: float, end_wn: float, scan_speed: float, 
@@ -777,6 +1236,8 @@ class MIRcatController:
             self.last_error = "Laser must be armed before starting scan"
             self.last_error_code = MIRcatError.NOT_ARMED
             raise Exception("Laser must be armed before starting scan")
+
+        self._checked_plan("sweep", self.plan_sweep_scan, start_wn, end_wn, scan_speed, num_scans, bidirectional)
         
         try:
             qcl = int(self.current_qcl or 1)
@@ -786,112 +1247,27 @@ class MIRcatController:
                 ns = 65535
             logger.info(f"Starting sweep scan: {start_wn} to {end_wn} cm-1, speed={scan_speed}, scans={ns}, bidirectional={bool(bidirectional)}")
 
-            # Cancel any manual tune mode per SDK guidance
-            try:
-                if hasattr(self._sdk, 'MIRcatSDK_CancelManualTuneMode'):
-                    _ = self._sdk.MIRcatSDK_CancelManualTuneMode()
-            except Exception:
-                pass
-
-            # Do not touch pointing compensation from here (SDK-only behavior per user request)
-
-            # Use Advanced sweep only when explicitly enabled in config
-            used_advanced = False
-            use_adv_cfg = bool(self.config.get('parameters', {}).get('use_advanced_sweep', False))
-            can_advanced = all(
-                hasattr(self._sdk, name) for name in (
-                    'MIRcatSDK_SetAdvancedSweepParams',
-                    'MIRcatSDK_StartSweepAdvancedScan'
-                )
+            use_adv_cfg = self.limits.use_advanced_sweep
+            used_advanced = await self._sdk_run(
+                self._start_sweep_hw, start_wn, end_wn, scan_speed, ns, bool(bidirectional), qcl, use_adv_cfg
             )
-            if bidirectional and use_adv_cfg and can_advanced:
-                try:
-                    retp = self._sdk.MIRcatSDK_SetAdvancedSweepParams(
-                        c_uint8(self._UNITS_CM1), c_float(float(start_wn)), c_float(float(end_wn)), c_float(float(scan_speed)),
-                        c_uint16(ns), c_bool(True)
-                    )
-                    if not self._sdk_ok(retp):
-                        raise Exception(f"SetAdvancedSweepParams failed ({int(retp)})")
-                    # Configure channel usage: enable current QCL only; disable others
-                    try:
-                        n = c_uint8(0)
-                        if self._sdk_ok(self._sdk.MIRcatSDK_GetNumInstalledQcls(byref(n))):
-                            total = int(n.value) or 1
-                        else:
-                            total = 1
-                    except Exception:
-                        total = 1
-                    if hasattr(self._sdk, 'MIRcatSDK_SetAdvancedSweepChanParams'):
-                        for ch in range(1, max(1, total) + 1):
-                            use = (ch == qcl)
-                            retc = self._sdk.MIRcatSDK_SetAdvancedSweepChanParams(
-                                c_uint8(ch), c_float(float(start_wn)), c_float(float(end_wn)), c_bool(use)
-                            )
-                            if not self._sdk_ok(retc):
-                                logger.warning(f"SetAdvancedSweepChanParams returned {int(retc)} for QCL {ch}")
-                    if hasattr(self._sdk, 'MIRcatSDK_ReadWriteAdvancedSweepParams'):
-                        _ = self._sdk.MIRcatSDK_ReadWriteAdvancedSweepParams(c_bool(True))
-                    reta = self._sdk.MIRcatSDK_StartSweepAdvancedScan()
-                    if not self._sdk_ok(reta):
-                        raise Exception(f"StartSweepAdvancedScan failed ({int(reta)})")
-                    used_advanced = True
-                except Exception as adv_e:
-                    logger.warning(f"Advanced sweep start failed ({adv_e}); falling back to standard sweep API")
-
-            if not used_advanced:
-                # Prefer the currently selected QCL (1..4); firmware may require explicit channel for bidirectional sweeps
-                ret = self._sdk.MIRcatSDK_StartSweepScan(
-                    c_float(float(start_wn)), c_float(float(end_wn)), c_float(float(scan_speed)),
-                    c_uint8(self._UNITS_CM1), c_uint16(ns), c_bool(True if bidirectional else False), c_uint8(qcl)
-                )
-                if not self._sdk_ok(ret):
-                    raise Exception(f"StartSweepScan failed ({int(ret)})")
 
             self.scan_in_progress = True
             self.current_scan_mode = ScanMode.SWEEP
+            self._invalidate_status("scan", "sweep_bidirectional")
+            await self._start_trajectory_recording()
+            self._publish_snapshot()
             # Final confirmation log and optional software fallback
             try:
-                f_bidir = c_bool(False)
-                if self._sdk_ok(self._sdk.MIRcatSDK_IsSweepBidirectional(byref(f_bidir))):
-                    self.status["sweep_bidirectional"] = bool(f_bidir.value)
-                # Readback of configured sweep parameters for diagnosis
-                try:
-                    sv = c_float(0); st = c_float(0); sp = c_float(0)
-                    u1 = c_uint8(0); u2 = c_uint8(0); u3 = c_uint8(0)
-                    ns_read = c_uint16(0)
-                    act_qcl = c_uint8(0)
-                    if hasattr(self._sdk, 'MIRcatSDK_GetSweepStartWW'):
-                        _ = self._sdk.MIRcatSDK_GetSweepStartWW(byref(st), byref(u1))
-                    if hasattr(self._sdk, 'MIRcatSDK_GetSweepStopWW'):
-                        _ = self._sdk.MIRcatSDK_GetSweepStopWW(byref(sp), byref(u2))
-                    if hasattr(self._sdk, 'MIRcatSDK_GetSweepScanSpeed'):
-                        _ = self._sdk.MIRcatSDK_GetSweepScanSpeed(byref(sv), byref(u3))
-                    if hasattr(self._sdk, 'MIRcatSDK_GetSweepNumScans'):
-                        _ = self._sdk.MIRcatSDK_GetSweepNumScans(byref(ns_read))
-                    if hasattr(self._sdk, 'MIRcatSDK_GetActiveQcl'):
-                        _ = self._sdk.MIRcatSDK_GetActiveQcl(byref(act_qcl))
-                    # Also try advanced readback when available
-                    adv_bidir = None
-                    try:
-                        if hasattr(self._sdk, 'MIRcatSDK_GetAdvancedSweepParams'):
-                            au = c_uint8(0); astart = c_float(0); astop=c_float(0); aspeed=c_float(0); ans=c_uint16(0); abidir=c_bool(False)
-                            if self._sdk_ok(self._sdk.MIRcatSDK_GetAdvancedSweepParams(byref(au), byref(astart), byref(astop), byref(aspeed), byref(ans), byref(abidir))):
-                                adv_bidir = bool(abidir.value)
-                    except Exception:
-                        pass
-                    logger.info(
-                        f"Sweep config readback: bidir={self.status.get('sweep_bidirectional')}, adv_bidir={adv_bidir}, "
-                        f"start={float(st.value) if st.value else None}, stop={float(sp.value) if sp.value else None}, "
-                        f"speed={float(sv.value) if sv.value else None}, ns={int(ns_read.value)}, act_qcl={int(act_qcl.value)}"
-                    )
-                except Exception:
-                    pass
+                bidir_read = await self._sdk_run(self._read_sweep_config)
+                if bidir_read is not None:
+                    self.status["sweep_bidirectional"] = bidir_read
                 logger.info(f"Sweep bidirectional set: {bool(self.status.get('sweep_bidirectional'))} (advanced={used_advanced})")
                 # Optional software fallback is disabled by default unless explicitly enabled in config
-                enable_sw_pp = bool(self.config.get('parameters', {}).get('enable_software_pingpong', False))
+                enable_sw_pp = self.limits.enable_software_pingpong
                 if bidirectional and not bool(self.status.get('sweep_bidirectional')) and enable_sw_pp:
                     try:
-                        _ = self._sdk.MIRcatSDK_StopScanInProgress()
+                        _ = await self._sdk_run(self._sdk.MIRcatSDK_StopScanInProgress)
                     except Exception:
                         pass
                     logger.info("Switching to controller-managed ping-pong sweep fallback (forward/reverse segments)")
@@ -906,6 +1282,110 @@ class MIRcatController:
             logger.error(f"Failed to start sweep scan: {e}")
             return False
 
+    def _start_sweep_hw(self, start_wn: float, end_wn: float, scan_speed: float, ns: int,
+                        bidirectional: bool, qcl: int, use_adv_cfg: bool) -> bool:
+        """Program and start a sweep (runs on the SDK executor thread); returns True if the advanced API was used."""
+        # Cancel any manual tune mode per SDK guidance
+        try:
+            if hasattr(self._sdk, 'MIRcatSDK_CancelManualTuneMode'):
+                _ = self._sdk.MIRcatSDK_CancelManualTuneMode()
+        except Exception:
+            pass
+
+        # Do not touch pointing compensation from here (SDK-only behavior per user request)
+
+        # Use Advanced sweep only when explicitly enabled in config
+        used_advanced = False
+        can_advanced = all(
+            hasattr(self._sdk, name) for name in (
+                'MIRcatSDK_SetAdvancedSweepParams',
+                'MIRcatSDK_StartSweepAdvancedScan'
+            )
+        )
+        if bidirectional and use_adv_cfg and can_advanced:
+            try:
+                retp = self._sdk.MIRcatSDK_SetAdvancedSweepParams(
+                    c_uint8(self._UNITS_CM1), c_float(float(start_wn)), c_float(float(end_wn)), c_float(float(scan_speed)),
+                    c_uint16(ns), c_bool(True)
+                )
+                if not self._sdk_ok(retp):
+                    raise Exception(f"SetAdvancedSweepParams failed ({int(retp)})")
+                # Configure channel usage: enable current QCL only; disable others
+                try:
+                    n = c_uint8(0)
+                    if self._sdk_ok(self._sdk.MIRcatSDK_GetNumInstalledQcls(byref(n))):
+                        total = int(n.value) or 1
+                    else:
+                        total = 1
+                except Exception:
+                    total = 1
+                if hasattr(self._sdk, 'MIRcatSDK_SetAdvancedSweepChanParams'):
+                    for ch in range(1, max(1, total) + 1):
+                        use = (ch == qcl)
+                        retc = self._sdk.MIRcatSDK_SetAdvancedSweepChanParams(
+                            c_uint8(ch), c_float(float(start_wn)), c_float(float(end_wn)), c_bool(use)
+                        )
+                        if not self._sdk_ok(retc):
+                            logger.warning(f"SetAdvancedSweepChanParams returned {int(retc)} for QCL {ch}")
+                if hasattr(self._sdk, 'MIRcatSDK_ReadWriteAdvancedSweepParams'):
+                    _ = self._sdk.MIRcatSDK_ReadWriteAdvancedSweepParams(c_bool(True))
+                reta = self._sdk.MIRcatSDK_StartSweepAdvancedScan()
+                if not self._sdk_ok(reta):
+                    raise Exception(f"StartSweepAdvancedScan failed ({int(reta)})")
+                used_advanced = True
+            except Exception as adv_e:
+                logger.warning(f"Advanced sweep start failed ({adv_e}); falling back to standard sweep API")
+
+        if not used_advanced:
+            # Prefer the currently selected QCL (1..4); firmware may require explicit channel for bidirectional sweeps
+            ret = self._sdk.MIRcatSDK_StartSweepScan(
+                c_float(float(start_wn)), c_float(float(end_wn)), c_float(float(scan_speed)),
+                c_uint8(self._UNITS_CM1), c_uint16(ns), c_bool(True if bidirectional else False), c_uint8(qcl)
+            )
+            if not self._sdk_ok(ret):
+                raise Exception(f"StartSweepScan failed ({int(ret)})")
+        return used_advanced
+
+    def _read_sweep_config(self) -> Optional[bool]:
+        """Read back the configured sweep for diagnosis (runs on the SDK executor thread); returns the bidirectional flag."""
+        bidir = None
+        f_bidir = c_bool(False)
+        if self._sdk_ok(self._sdk.MIRcatSDK_IsSweepBidirectional(byref(f_bidir))):
+            bidir = bool(f_bidir.value)
+        # Readback of configured sweep parameters for diagnosis
+        try:
+            sv = c_float(0); st = c_float(0); sp = c_float(0)
+            u1 = c_uint8(0); u2 = c_uint8(0); u3 = c_uint8(0)
+            ns_read = c_uint16(0)
+            act_qcl = c_uint8(0)
+            if hasattr(self._sdk, 'MIRcatSDK_GetSweepStartWW'):
+                _ = self._sdk.MIRcatSDK_GetSweepStartWW(byref(st), byref(u1))
+            if hasattr(self._sdk, 'MIRcatSDK_GetSweepStopWW'):
+                _ = self._sdk.MIRcatSDK_GetSweepStopWW(byref(sp), byref(u2))
+            if hasattr(self._sdk, 'MIRcatSDK_GetSweepScanSpeed'):
+                _ = self._sdk.MIRcatSDK_GetSweepScanSpeed(byref(sv), byref(u3))
+            if hasattr(self._sdk, 'MIRcatSDK_GetSweepNumScans'):
+                _ = self._sdk.MIRcatSDK_GetSweepNumScans(byref(ns_read))
+            if hasattr(self._sdk, 'MIRcatSDK_GetActiveQcl'):
+                _ = self._sdk.MIRcatSDK_GetActiveQcl(byref(act_qcl))
+            # Also try advanced readback when available
+            adv_bidir = None
+            try:
+                if hasattr(self._sdk, 'MIRcatSDK_GetAdvancedSweepParams'):
+                    au = c_uint8(0); astart = c_float(0); astop=c_float(0); aspeed=c_float(0); ans=c_uint16(0); abidir=c_bool(False)
+                    if self._sdk_ok(self._sdk.MIRcatSDK_GetAdvancedSweepParams(byref(au), byref(astart), byref(astop), byref(aspeed), byref(ans), byref(abidir))):
+                        adv_bidir = bool(abidir.value)
+            except Exception:
+                pass
+            logger.info(
+                f"Sweep config readback: bidir={bidir}, adv_bidir={adv_bidir}, "
+                f"start={float(st.value) if st.value else None}, stop={float(sp.value) if sp.value else None}, "
+                f"speed={float(sv.value) if sv.value else None}, ns={int(ns_read.value)}, act_qcl={int(act_qcl.value)}"
+            )
+        except Exception:
+            pass
+        return bidir
+
     async def _start_pingpong_manager(self, start_wn: float, end_wn: float, scan_speed: float, num_scans: int) -> None:
         # Cancel any existing ping-pong manager
         try:
@@ -928,67 +1408,40 @@ class MIRcatController:
             # Each loop is forward then reverse; infinite when num_scans <= 0
             loops_remaining = None if (num_scans is None or int(num_scans) <= 0) else int(num_scans)
             qcl = int(self.current_qcl or 1)
-            # Helper: start a single-direction sweep with ns=1
-            async def _start_segment(a: float, b: float) -> None:
-                try:
-                    if hasattr(self._sdk, 'MIRcatSDK_CancelManualTuneMode'):
-                        _ = self._sdk.MIRcatSDK_CancelManualTuneMode()
-                except Exception:
-                    pass
-                ret = self._sdk.MIRcatSDK_StartSweepScan(
-                    c_float(float(a)), c_float(float(b)), c_float(float(scan_speed)),
-                    c_uint8(self._UNITS_CM1), c_uint16(1), c_bool(False), c_uint8(qcl)
-                )
-                if not self._sdk_ok(ret):
-                    raise Exception(f"StartSweepScan segment failed ({int(ret)}) {a}->{b}")
-
-            # Helper: wait until scan finishes (with timeout safety)
-            async def _wait_complete(max_seconds: float) -> None:
-                t0 = time.time()
-                while True:
-                    if self._pingpong_cancel:
-                        break
-                    try:
-                        in_prog = c_bool(False); active=c_bool(False); paused=c_bool(False)
-                        cur_scan = c_uint16(0); cur_pct=c_uint16(0); cur_ww=c_float(0)
-                        units=c_uint8(0); tec=c_bool(False); motion=c_bool(False)
-                        if self._sdk_ok(self._sdk.MIRcatSDK_GetScanStatus(byref(in_prog), byref(active), byref(paused),
-                                                  byref(cur_scan), byref(cur_pct), byref(cur_ww), byref(units), byref(tec), byref(motion))):
-                            if not bool(in_prog.value):
-                                break
-                    except Exception:
-                        # Fall back to small delay if status call fails
-                        pass
-                    await asyncio.sleep(0.2)
-                    if (time.time() - t0) > max_seconds * 2.0 + 5.0:
-                        # Safety stop to avoid runaway
-                        try:
-                            _ = self._sdk.MIRcatSDK_StopScanInProgress()
-                        except Exception:
-                            pass
-                        break
-
-            while True:
-                if self._pingpong_cancel:
-                    break
-                # Forward
-                await _start_segment(start_wn, end_wn)
-                est_time = abs(float(end_wn) - float(start_wn)) / max(0.001, float(scan_speed))
-                await _wait_complete(est_time)
-                if self._pingpong_cancel:
-                    break
-                # Reverse
-                await _start_segment(end_wn, start_wn)
-                est_time = abs(float(end_wn) - float(start_wn)) / max(0.001, float(scan_speed))
-                await _wait_complete(est_time)
-
-                if loops_remaining is not None:
+            segments = ((float(start_wn), float(end_wn)), (float(end_wn), float(start_wn)))
+            sweep_time = abs(float(end_wn) - float(start_wn)) / max(0.001, float(scan_speed))
+            self.pingpong_turnarounds.clear()
+            # Only the first segment includes a real tune to its start; reversals start in place
+            lead_timeout = self._tune_timeout(self._plan_start_wavenumber(), segments[0][0], qcl)
+            # Manual tune mode only needs cancelling before the first segment
+            started = await self._sdk_run(self._start_sweep_segment, *segments[0], scan_speed, qcl, True)
+            direction = 0
+            reversal = 0
+            while not self._pingpong_cancel:
+                if direction == 1 and loops_remaining is not None:
                     loops_remaining -= 1
                     if loops_remaining <= 0:
+                        await self._wait_pingpong_segment(started, sweep_time, None, scan_speed, qcl,
+                                                          lead_timeout)
                         break
+                direction ^= 1
+                result = await self._wait_pingpong_segment(started, sweep_time, segments[direction], scan_speed, qcl,
+                                                           lead_timeout)
+                if result is None:
+                    break
+                last_running, started = result
+                lead_timeout = self._tune_timeout(segments[direction][0], segments[direction][0], qcl)
+                reversal += 1
+                gap = max(0.0, started - last_running)
+                self.pingpong_turnaround_gap.record(gap)
+                self.pingpong_turnarounds.append({
+                    "reversal": reversal,
+                    "direction": "reverse" if direction else "forward",
+                    "gap_ms": round(gap * 1000.0, 3),
+                })
             # Ensure stop at end
             try:
-                _ = self._sdk.MIRcatSDK_StopScanInProgress()
+                _ = await self._sdk_run(self._sdk.MIRcatSDK_StopScanInProgress)
             except Exception:
                 pass
         except Exception as e:
@@ -999,6 +1452,180 @@ class MIRcatController:
             self._pingpong_active = False
             self._pingpong_cancel = False
             # status will reflect hardware scan status on next update
+
+    async def _wait_pingpong_segment(self, started: float, sweep_time: float, next_segment: Optional[tuple],
+                                     scan_speed: float, qcl: int, lead_timeout: float) -> Optional[tuple]:
+        """Wait for the running segment to end and start ``next_segment`` right away.
+
+        The end is predicted from the sweep time and the live percent; reads are
+        sparse until ``end_guard`` before that and dense after it. The segment is
+        stopped once it runs past twice its sweep time plus ``lead_timeout`` (the
+        deadline for its lead-in tune). Returns
+        (monotonic time last seen running, monotonic time next segment started),
+        or None when cancelled or the segment overran its safety timeout.
+        """
+        intervals = self.pingpong_intervals
+        # Includes any lead-in tune; refined once the hardware reports progress
+        predicted_end = started + sweep_time
+        last_running = started
+        while not self._pingpong_cancel:
+            t, scan, next_started = await self._sdk_run(self._advance_pingpong, next_segment, scan_speed, qcl)
+            if scan is not None and not scan[0]:
+                return None if next_started is None else (last_running, next_started)
+            if scan is not None:
+                last_running = t
+                percent = scan[2]
+                if percent == 0:
+                    # Still tuning to the segment start
+                    predicted_end = max(predicted_end, t + sweep_time)
+                else:
+                    predicted_end = t + sweep_time * max(0, 100 - percent) / 100.0
+            if t - started > sweep_time * 2.0 + lead_timeout:
+                # Safety stop to avoid runaway
+                logger.warning("Ping-pong segment overran its expected time; stopping")
+                try:
+                    _ = await self._sdk_run(self._sdk.MIRcatSDK_StopScanInProgress)
+                except Exception:
+                    pass
+                return None
+            delay = predicted_end - intervals["end_guard"] - time.monotonic()
+            await asyncio.sleep(min(intervals["coarse_interval"], max(intervals["dense_interval"], delay)))
+        return None
+
+    def _advance_pingpong(self, next_segment: Optional[tuple], scan_speed: float, qcl: int) -> tuple:
+        """Sample the scan status and, once the segment is done, start the next one in the same job.
+
+        Runs on the SDK executor thread. Returns (sample time, _read_scan_status
+        result, monotonic time the next segment started or None).
+        """
+        t, scan = self._sample_scan_status()
+        # A stop request may have been queued ahead of this job; never start past it
+        if scan is None or scan[0] or next_segment is None or self._pingpong_cancel:
+            return t, scan, None
+        return t, scan, self._start_sweep_segment(*next_segment, scan_speed, qcl)
+
+    def _start_sweep_segment(self, a: float, b: float, scan_speed: float, qcl: int,
+                             cancel_manual_tune: bool = False) -> float:
+        """Start a single-direction, single-pass sweep segment (runs on the SDK executor thread).
+
+        Returns the monotonic time the segment was accepted.
+        """
+        if cancel_manual_tune:
+            try:
+                if hasattr(self._sdk, 'MIRcatSDK_CancelManualTuneMode'):
+                    _ = self._sdk.MIRcatSDK_CancelManualTuneMode()
+            except Exception:
+                pass
+        ret = self._sdk.MIRcatSDK_StartSweepScan(
+            c_float(float(a)), c_float(float(b)), c_float(float(scan_speed)),
+            c_uint8(self._UNITS_CM1), c_uint16(1), c_bool(False), c_uint8(qcl)
+        )
+        if not self._sdk_ok(ret):
+            raise Exception(f"StartSweepScan segment failed ({int(ret)}) {a}->{b}")
+        return time.monotonic()
+
+    def _read_scan_status(self) -> Optional[tuple]:
+        """Read GetScanStatus (runs on the SDK executor thread).
+
+        Returns (in_progress, scan_number, percent, wavelength, units, motion) or None on failure.
+        """
+        ret, (in_prog, _active, _paused, cur_scan, cur_pct, cur_ww, units, _tec, motion) = self._sdk_calls().GetScanStatus()
+        if not self._sdk_ok(ret):
+            return None
+        return (bool(in_prog), int(cur_scan), int(cur_pct), float(cur_ww), int(units), bool(motion))
+
+    def _sample_scan_status(self) -> tuple:
+        """Timestamped GetScanStatus read (runs on the SDK executor thread).
+
+        Returns (monotonic time at the middle of the call, _read_scan_status result).
+        """
+        t0 = time.monotonic()
+        scan = self._read_scan_status()
+        return (t0 + time.monotonic()) / 2.0, scan
+
+    async def sample_scan_status(self) -> tuple:
+        """Timestamped GetScanStatus read on the SDK worker; see _sample_scan_status."""
+        return await self._sdk_run(self._sample_scan_status)
+
+    def software_scan_active(self) -> bool:
+        """True while a software-managed scan (ping-pong, streamed multispectral) is running."""
+        return self._pingpong_active or self._multispectral_active
+
+    def scan_completed(self) -> None:
+        """Record a scan end seen by the caller's own GetScanStatus read (the scan queue's)."""
+        self.scan_in_progress = False
+        self._invalidate_status("scan")
+
+    def scan_externally_paced(self, mode: str) -> bool:
+        """True when a ``mode`` scan advances on external or manual process triggers, not its plan."""
+        if mode != "step":
+            return False
+        proc_mode, _pulse_mode, _step_time_ms, _step_delay_ms = self._step_trigger_settings(0)
+        return proc_mode != 1
+
+    def _scan_wavenumber(self, value: float, units: int) -> Optional[float]:
+        """Convert a GetScanStatus wavelength reading to cm-1 (None when not reported)."""
+        if value <= 0:
+            return None
+        if units == int(self._UNITS_CM1):
+            return value
+        return 10000.0 / value
+
+    async def _start_trajectory_recording(self) -> None:
+        """Begin a new trajectory for the scan that was just started."""
+        await self._stop_trajectory_recording()
+        mode = self.current_scan_mode.value if self.current_scan_mode else None
+        scan_id = self.trajectory.start(mode)
+        self._trajectory_task = asyncio.create_task(self._trajectory_loop())
+        logger.info(f"Recording scan trajectory {scan_id} ({mode}) every {self.trajectory_interval * 1000:.0f} ms")
+
+    async def _stop_trajectory_recording(self) -> None:
+        task = self._trajectory_task
+        self._trajectory_task = None
+        self._trajectory_last = None
+        self.trajectory.finish()
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _trajectory_loop(self) -> None:
+        # Samples until the hardware reports no scan (and no ping-pong segment)
+        # for trajectory_idle_grace seconds, or until stopped
+        idle_since: Optional[float] = None
+        try:
+            while self.connected and self.trajectory.active:
+                try:
+                    t, scan = await self._sdk_run(self._sample_scan_status, priority=TELEMETRY)
+                except Exception as e:
+                    logger.warning(f"Trajectory sample failed: {e}")
+                    scan = None
+                if scan is not None:
+                    in_prog, cur_scan, cur_pct, cur_ww, units, motion = scan
+                    wn = self._scan_wavenumber(cur_ww, units)
+                    self.trajectory.append(t, float('nan') if wn is None else wn, cur_scan, cur_pct, motion)
+                    self._trajectory_last = (t, scan)
+                    if in_prog or self._pingpong_active or self._multispectral_active:
+                        idle_since = None
+                    elif idle_since is None:
+                        idle_since = t
+                    elif t - idle_since >= self.trajectory_idle_grace:
+                        break
+                await asyncio.sleep(self.trajectory_interval)
+        finally:
+            self.trajectory.finish()
+            logger.info(f"Scan trajectory {self.trajectory.scan_id} finished with {self.trajectory.written} samples")
+
+    def _recent_trajectory_scan(self) -> Optional[tuple]:
+        """Newest recorder sample if it is fresher than the fast poll tier, else None."""
+        if self._trajectory_task is None or self._trajectory_task.done() or self._trajectory_last is None:
+            return None
+        t, scan = self._trajectory_last
+        if time.monotonic() - t > self.poll_intervals["fast"]:
+            return None
+        return scan
 
     async def start_step_scan(self, start_wn: float, end_wn: float, step_size: float,
                              dwell_time: int, num_scans: int = 1) -> bool:
@@ -1013,53 +1640,20 @@ class MIRcatController:
             self.last_error_code = MIRcatError.NOT_ARMED
             raise Exception("Laser must be armed before starting scan")
         
+        self._checked_plan("step", self.plan_step_scan, start_wn, end_wn, step_size, dwell_time, num_scans)
+
         try:
-            # Load settings for trigger mode and dwell
-            proc_mode = 1  # internal default
-            pulse_mode = 1
-            step_time_ms = dwell_time
-            step_delay_ms = 0
-            try:
-                settings_path = Path(__file__).parent / 'user_settings.json'
-                if settings_path.exists():
-                    import json as _json
-                    with open(settings_path, 'r') as f:
-                        data = _json.load(f)
-                    mode_map = {
-                        'Use Internal Step Mode': 1, 'internal': 1,
-                        'Use External Step Mode': 2, 'external': 2,
-                        'Use Manual Step Mode': 3, 'manual': 3,
-                    }
-                    pulse_map = {
-                        'Use Internal Pulse Mode': 1, 'internal': 1,
-                        'Use External Trigger Mode': 2, 'external_trigger': 2,
-                        'Use External Pulse Mode': 3, 'external_pulse': 3,
-                        'Use Wavelength Trigger Pulse Mode': 4, 'wavelength_trigger': 4,
-                    }
-                    proc_mode = mode_map.get(data.get('processTriggerMode'), proc_mode)
-                    pulse_mode = pulse_map.get(data.get('pulseMode'), pulse_mode)
-                    if data.get('internalStepTime') is not None:
-                        step_time_ms = int(data.get('internalStepTime'))
-                    if data.get('internalStepDelay') is not None:
-                        step_delay_ms = int(data.get('internalStepDelay'))
-            except Exception as e:
-                logger.warning(f"Reading user settings failed: {e}")
-
+            proc_mode, pulse_mode, step_time_ms, step_delay_ms = self._step_trigger_settings(dwell_time)
             logger.info(f"Starting step scan: {start_wn} to {end_wn} cm-1, step={step_size}, dwell={step_time_ms}ms, proc_mode={proc_mode}")
             # Configure dwell/trigger params
             try:
                 dwell_us = int(max(0, step_time_ms) * 1000)
                 delay_us = int(max(0, step_delay_ms) * 1000)
-                retp = self._sdk.MIRcatSDK_SetWlTrigParams(
-                    c_uint8(pulse_mode), c_uint8(proc_mode),
-                    c_float(float(start_wn)), c_float(float(end_wn)), c_float(float(step_size)),
-                    c_uint8(self._UNITS_CM1), c_uint32(dwell_us), c_uint32(delay_us)
-                )
-                if not self._sdk_ok(retp):
-                    logger.warning(f"SetWlTrigParams returned code {int(retp)}")
+                await self._set_wl_trig_params(pulse_mode, proc_mode, start_wn, end_wn, step_size, dwell_us, delay_us)
             except Exception as e:
                 logger.warning(f"SetWlTrigParams failed (continuing): {e}")
-            ret = self._sdk.MIRcatSDK_StartStepMeasureModeScan(
+            ret = await self._sdk_run(
+                self._sdk.MIRcatSDK_StartStepMeasureModeScan,
                 c_float(float(start_wn)), c_float(float(end_wn)), c_float(float(step_size)),
                 c_uint8(self._UNITS_CM1), c_uint16(int(num_scans))
             )
@@ -1067,6 +1661,9 @@ class MIRcatController:
                 raise Exception(f"StartStepMeasureModeScan failed ({int(ret)})")
             self.scan_in_progress = True
             self.current_scan_mode = ScanMode.STEP
+            self._invalidate_status("scan")
+            await self._start_trajectory_recording()
+            self._publish_snapshot()
             return True
         except Exception as e:
             self.last_error = f"Failed to start step scan: {str(e)}"
@@ -1075,8 +1672,8 @@ class MIRcatController:
             return False
 
     async def start_multispectral_scan(self, wavelength_list: List[Dict], num_scans: int = 1,
-                                      keep_laser_on: bool = False) -> bool:
-        """Start multi-spectral scan mode"""
+                                      keep_laser_on: bool = False, ordering: str = "as_entered") -> bool:
+        """Start multi-spectral scan mode (elements reordered for tuning time when ``ordering="optimized"``)"""
         if not self.connected:
             self.last_error = "MIRcat device not connected"
             self.last_error_code = MIRcatError.NOT_CONNECTED
@@ -1086,19 +1683,25 @@ class MIRcatController:
             self.last_error = "Laser must be armed before starting scan"
             self.last_error_code = MIRcatError.NOT_ARMED
             raise Exception("Laser must be armed before starting scan")
+
+        # Optimizing the order of a long list takes a few hundred ms; keep it off the event loop
+        plan = await asyncio.to_thread(self._checked_plan, "multispectral", self.plan_multispectral_scan,
+                                       wavelength_list, num_scans, keep_laser_on, ordering)
+        self.last_multispectral_plan = {**plan.summary(), "order": plan.order_indices()}
         
         try:
             logger.info(f"Starting multispectral scan with {len(wavelength_list)} wavelengths")
             # Ensure TECs are at set temperature (avoid SDK error 95)
             try:
-                stable = self._mircat_sdk_call("temperaturestable")
+                stable = await self._sdk_call("temperaturestable")
                 if not stable:
-                    logger.info("TECs not at set temperature; waiting up to 60s before starting multispectral scan...")
-                    for _ in range(120):  # 0.5s * 120 = 60s
-                        if self._mircat_sdk_call("temperaturestable"):
-                            stable = True
-                            break
-                        await asyncio.sleep(0.5)
+                    timeout = self.completion_timeouts["multispectral_temperature"]
+                    logger.info(f"TECs not at set temperature; waiting up to {timeout:.0f}s before starting multispectral scan...")
+                    try:
+                        await self._wait_for_sdk_flag("multispectral_temperature", "temperaturestable")
+                        stable = True
+                    except ConditionTimeout:
+                        pass
                 if not stable:
                     raise Exception("TECs not at set temperature (code 95)")
             except Exception as e:
@@ -1106,50 +1709,194 @@ class MIRcatController:
                 self.last_error_code = MIRcatError.TEMPERATURE_UNSTABLE
                 logger.error(self.last_error)
                 return False
-            # Program the table (clamp to valid wn range)
-            count = max(0, len(wavelength_list))
-            ret = self._sdk.MIRcatSDK_SetNumMultiSpectralElements(c_uint8(count))
-            if not self._sdk_ok(ret):
-                raise Exception(f"SetNumMultiSpectralElements failed ({int(ret)})")
-            for entry in wavelength_list:
-                wn = float(entry.get('wavenumber'))
-                try:
-                    params = self.config.get('parameters', {})
-                    wn_min = float(params.get('wavenumber_min', 1638.81))
-                    wn_max = float(params.get('wavenumber_max', 2077.27))
-                    if wn < wn_min: wn = wn_min
-                    if wn > wn_max: wn = wn_max
-                except Exception:
-                    pass
-                # SDK uses microseconds for internal timing parameters in step-type scans.
-                # Convert ms from UI to µs for Multi-Spectral elements.
-                dwell_ms = int(entry.get('dwell_time'))
-                off_ms = int(entry.get('off_time'))
-                dwell_us = max(0, dwell_ms) * 1000
-                off_us = 0 if keep_laser_on else max(0, off_ms) * 1000
-                # Clamp to uint32 range to avoid overflow
-                dwell_us = min(dwell_us, 0xFFFFFFFF)
-                off_us = min(off_us, 0xFFFFFFFF)
-                ret = self._sdk.MIRcatSDK_AddMultiSpectralElement(
-                    c_float(wn), c_uint8(self._UNITS_CM1), c_uint32(dwell_us), c_uint32(off_us)
-                )
-                if not self._sdk_ok(ret):
-                    raise Exception(f"AddMultiSpectralElement failed ({int(ret)}) for {wn}")
+            # Table from the compiled plan (wavenumbers clamped to the tuning range, times in µs)
+            if plan.clamped:
+                logger.warning(f"{plan.clamped} multispectral wavenumbers clamped to the tuning range")
+            if plan.order is not None and plan.duration is not None:
+                logger.info(f"Multispectral order '{plan.parameters['order_strategy']}': predicted "
+                            f"{plan.duration:.2f}s vs {plan.original_duration:.2f}s as entered")
+            elements = plan.elements()
             # Support infinite scans by mapping 0/negative to max uint16
             ns = int(num_scans)
             if ns <= 0:
                 ns = 65535
-            ret = self._sdk.MIRcatSDK_StartMultiSpectralModeScan(c_uint16(ns))
-            if not self._sdk_ok(ret):
-                raise Exception(f"StartMultiSpectralModeScan failed ({int(ret)})")
+            await self._stop_multispectral_stream()
+            if self.scan_in_progress:
+                # The table can't be reprogrammed under a running scan (a streamed chunk
+                # keeps going after its feeder is cancelled); "no scan in progress" is fine.
+                # The scan queue clears the flag when it has seen the previous run end.
+                logger.info("Stopping the scan in progress before reprogramming the multispectral table")
+                await self._sdk_run(self._sdk.MIRcatSDK_StopScanInProgress)
+                self.scan_in_progress = False
+            if len(elements) > self.MULTISPECTRAL_TABLE_MAX:
+                await self._start_multispectral_stream(elements, int(num_scans), keep_laser_on)
+            else:
+                self.multispectral_progress = None
+                await self._program_multispectral_table(elements, ns, keep_laser_on)
             self.scan_in_progress = True
             self.current_scan_mode = ScanMode.MULTISPECTRAL
+            self._invalidate_status("scan")
+            await self._start_trajectory_recording()
+            self._publish_snapshot()
             return True
         except Exception as e:
             self.last_error = f"Failed to start multispectral scan: {str(e)}"
             self.last_error_code = MIRcatError.HARDWARE_ERROR
             logger.error(f"Failed to start multispectral scan: {e}")
             return False
+
+    async def _program_multispectral_table(self, elements: List[tuple], ns: int, keep_laser_on: bool) -> float:
+        """Program (unless already loaded) and start one table; returns the monotonic start time."""
+        # Skip the per-element table upload when the same table is already programmed
+        fingerprint = self._multispectral_table_fingerprint(elements, keep_laser_on)
+        reuse = fingerprint == self._multispectral_fingerprint
+        self.multispectral_table_cache["hits" if reuse else "misses"] += 1
+        self._multispectral_fingerprint = None
+        await self._sdk_run(self._program_multispectral_hw, elements, ns, not reuse)
+        self._multispectral_fingerprint = fingerprint
+        return time.monotonic()
+
+    async def _start_multispectral_stream(self, elements: List[tuple], num_scans: int, keep_laser_on: bool) -> None:
+        """Start the first chunk of an over-long list and hand the rest to a background task."""
+        size = self.MULTISPECTRAL_TABLE_MAX
+        chunks = [elements[i:i + size] for i in range(0, len(elements), size)]
+        logger.info(f"Streaming {len(elements)} multispectral elements as {len(chunks)} chunks of up to {size}")
+        self._multispectral_cancel = False
+        self._multispectral_active = True
+        self.multispectral_progress = {
+            "scan": 1,
+            "scans": num_scans if num_scans > 0 else None,
+            "chunk": 1,
+            "chunks": len(chunks),
+            "elements_done": 0,
+            "elements_total": len(elements),
+            "percent": 0,
+        }
+        try:
+            await self._program_multispectral_table(chunks[0], 1, keep_laser_on)
+        except Exception:
+            self._multispectral_active = False
+            raise
+        self._multispectral_task = asyncio.create_task(
+            self._multispectral_stream_loop(chunks, num_scans, keep_laser_on)
+        )
+
+    async def _stop_multispectral_stream(self) -> None:
+        task = self._multispectral_task
+        self._multispectral_task = None
+        if task and not task.done():
+            self._multispectral_cancel = True
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._multispectral_active = False
+        self._multispectral_cancel = False
+
+    async def _multispectral_stream_loop(self, chunks: List[List[tuple]], num_scans: int, keep_laser_on: bool) -> None:
+        # Chunk 0 of scan 1 is already running; infinite repeats when num_scans <= 0
+        progress = self.multispectral_progress
+        index = 0
+        scan = 1
+        try:
+            while not self._multispectral_cancel:
+                last_running = await self._wait_multispectral_chunk(chunks[index])
+                if self._multispectral_cancel:
+                    break
+                index += 1
+                if index == len(chunks):
+                    index = 0
+                    scan += 1
+                    if 0 < num_scans < scan:
+                        break
+                # Next chunk goes out in one SDK batch right after completion is seen
+                started = await self._program_multispectral_table(chunks[index], 1, keep_laser_on)
+                self.multispectral_chunk_gap.record(max(0.0, started - last_running))
+                progress.update({
+                    "scan": scan,
+                    "chunk": index + 1,
+                    "elements_done": sum(len(c) for c in chunks[:index]),
+                })
+                self._update_multispectral_percent(len(chunks[index]), 0)
+                self.current_scan_number = scan
+                self.current_scan_percent = progress["percent"]
+                self._publish_snapshot()
+            if not self._multispectral_cancel:
+                progress.update({"elements_done": progress["elements_total"], "percent": 100})
+        except Exception as e:
+            logger.error(f"Multispectral stream error: {e}")
+            self.last_error = f"Multispectral stream: {e}"
+            self.last_error_code = MIRcatError.HARDWARE_ERROR
+        finally:
+            self._multispectral_active = False
+            self._multispectral_cancel = False
+            self._invalidate_status("scan")
+
+    async def _wait_multispectral_chunk(self, chunk: List[tuple]) -> float:
+        """Wait for the running chunk to finish; returns the monotonic time it was last seen running."""
+        # Sleep through most of the programmed dwell/off time, then poll closely for the end
+        expected = sum(dwell_us + off_us for _wn, dwell_us, off_us in chunk) / 1e6
+        await asyncio.sleep(expected * 0.9)
+        last_running = time.monotonic()
+
+        async def _chunk_done() -> bool:
+            nonlocal last_running
+            if self._multispectral_cancel:
+                return True
+            t, scan = await self._sdk_run(self._sample_scan_status)
+            if scan is None:
+                return False
+            if scan[0]:
+                last_running = t
+                self._update_multispectral_percent(len(chunk), scan[2])
+                return False
+            return True
+
+        await wait_for_condition(
+            _chunk_done,
+            expected + 10.0 + 0.5 * len(chunk),
+            name="multispectral chunk",
+            initial_interval=0.005,
+            max_interval=0.05,
+        )
+        return last_running
+
+    def _update_multispectral_percent(self, chunk_len: int, chunk_percent: int) -> None:
+        """Express a chunk's hardware percent against the whole streamed list."""
+        progress = self.multispectral_progress
+        done = progress["elements_done"] + chunk_len * min(100, chunk_percent) / 100.0
+        progress["percent"] = int(100 * done / progress["elements_total"])
+
+    @staticmethod
+    def _multispectral_table_fingerprint(elements: List[tuple], keep_laser_on: bool) -> str:
+        """Digest of the table as the SDK receives it (float32 wavenumbers, uint32 µs times)."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(b"\x01" if keep_laser_on else b"\x00")
+        for wn, dwell_us, off_us in elements:
+            digest.update(struct.pack("<fII", wn, dwell_us, off_us))
+        return digest.hexdigest()
+
+    def _program_multispectral_hw(self, elements: List[tuple], ns: int, program: bool = True) -> None:
+        """Program the multispectral element table and start the scan (runs on the SDK executor thread).
+
+        With ``program`` False the table already in the controller is reused.
+        """
+        if len(elements) > self.MULTISPECTRAL_TABLE_MAX:
+            raise Exception(f"Multispectral table holds at most {self.MULTISPECTRAL_TABLE_MAX} elements ({len(elements)} given)")
+        if program:
+            ret = self._sdk.MIRcatSDK_SetNumMultiSpectralElements(c_uint8(len(elements)))
+            if not self._sdk_ok(ret):
+                raise Exception(f"SetNumMultiSpectralElements failed ({int(ret)})")
+            for wn, dwell_us, off_us in elements:
+                ret = self._sdk.MIRcatSDK_AddMultiSpectralElement(
+                    c_float(wn), c_uint8(self._UNITS_CM1), c_uint32(dwell_us), c_uint32(off_us)
+                )
+                if not self._sdk_ok(ret):
+                    raise Exception(f"AddMultiSpectralElement failed ({int(ret)}) for {wn}")
+        ret = self._sdk.MIRcatSDK_StartMultiSpectralModeScan(c_uint16(ns))
+        if not self._sdk_ok(ret):
+            raise Exception(f"StartMultiSpectralModeScan failed ({int(ret)})")
 
     async def stop_scan(self) -> bool:
         """Stop any active scan"""
@@ -1160,6 +1907,18 @@ class MIRcatController:
         
         try:
             logger.info("Stopping scan...")
+            t_request = time.monotonic()
+            pingpong = self._pingpong_task is not None and not self._pingpong_task.done()
+            managed = pingpong or self._multispectral_active or self.scan_queue.running
+            # Keep the ping-pong manager from starting another segment, then halt
+            # the hardware ahead of any queued control or status calls
+            if pingpong:
+                self._pingpong_cancel = True
+            ret, t_called = await self._sdk_run(self._stop_scan_hw, priority=SAFETY)
+            self.stop_latency.record(t_called - t_request)
+            # An explicit stop also ends a running scan queue
+            await self.scan_queue.cancel(stop_scan=False)
+            await self._stop_multispectral_stream()
             # Cancel controller-managed ping-pong if active
             if self._pingpong_task and not self._pingpong_task.done():
                 self._pingpong_cancel = True
@@ -1167,12 +1926,17 @@ class MIRcatController:
                     await asyncio.wait_for(self._pingpong_task, timeout=2.0)
                 except Exception:
                     pass
-            ret = self._sdk.MIRcatSDK_StopScanInProgress()
-            if not self._sdk_ok(ret):
+            if managed:
+                # Again once the software-managed sequences are down, in case one started a
+                # run meanwhile; "no scan in progress" is the expected answer here
+                await self._sdk_run(self._sdk.MIRcatSDK_StopScanInProgress, priority=SAFETY)
+            elif not self._sdk_ok(ret):
                 raise Exception(f"StopScanInProgress failed ({int(ret)})")
+            await self._stop_trajectory_recording()
             self.scan_in_progress = False
             self.current_scan_mode = None
-            await self._update_hardware_status()
+            self._invalidate_status("scan")
+            await self._update_hardware_status(force=True)
             return True
         except Exception as e:
             self.last_error = f"Failed to stop scan: {str(e)}"
@@ -1180,6 +1944,11 @@ class MIRcatController:
             logger.error(f"Failed to stop scan: {e}")
             return False
 
+    def _stop_scan_hw(self) -> tuple:
+        """StopScanInProgress (runs on the SDK executor thread); returns (result, monotonic call time)."""
+        t_called = time.monotonic()
+        return self._sdk.MIRcatSDK_StopScanInProgress(), t_called
+
     async def manual_step(self) -> bool:
         """Manually advance a Step & Measure scan by one step (manual mode)."""
         if not self.connected:
@@ -1189,7 +1958,7 @@ class MIRcatController:
         try:
             if not hasattr(self._sdk, 'MIRcatSDK_ManualStepScanInProgress'):
                 raise Exception("ManualStepScanInProgress not supported in SDK")
-            ret = self._sdk.MIRcatSDK_ManualStepScanInProgress()
+            ret = await self._sdk_run(self._sdk.MIRcatSDK_ManualStepScanInProgress)
             if not self._sdk_ok(ret):
                 raise Exception(f"ManualStepScanInProgress failed ({int(ret)})")
             return True
@@ -1203,29 +1972,38 @@ class MIRcatController:
         """Clear last error info in controller."""
         self.last_error = None
         self.last_error_code = None
+        self._publish_snapshot()
         return True
 
-    async def apply_trigger_settings(self, data: Dict[str, Any]) -> bool:
-        """Apply pulse and process trigger modes + wavelength trigger params from persisted settings."""
+    async def apply_user_settings(self, update: Dict[str, Any]) -> List[str]:
+        """Apply the hardware-affecting fields of a saved settings update.
+
+        Returns the SDK setters this call wrote successfully; skipped (unchanged)
+        and failed writes are left out.
+        """
+        writes: List[str] = []
+        if update.get('laserMode') is not None:
+            await self.set_laser_mode(update['laserMode'])
+        # Only set pulse params when in Pulsed mode
+        try:
+            effective_mode = update.get('laserMode') or self.laser_mode
+            if effective_mode == 'Pulsed' and update.get('pulseRate') is not None and update.get('pulseWidth') is not None:
+                if await self._apply_pulse_parameters(update['pulseRate'], update['pulseWidth'],
+                                                      update.get('pulsedCurrent')):
+                    writes.append("SetQCLParams")
+        except Exception as e:
+            logger.warning(f"Applying pulse params skipped/failed: {e}")
+        writes.extend(await self.apply_trigger_settings(self.user_settings.snapshot()))
+        # Publish the QCL and trigger parameter cache counters this moved so the response is current
+        self._publish_snapshot()
+        return writes
+
+    async def apply_trigger_settings(self, data: Dict[str, Any]) -> List[str]:
+        """Apply pulse and process trigger modes + wavelength trigger params from persisted settings.
+
+        Returns the SDK setters written successfully (SetWlTrigParams is skipped when unchanged).
+        """
         try:
-            pulse_mode_map = {
-                'Use Internal Pulse Mode': 1,
-                'Use External Trigger Mode': 2,
-                'Use External Pulse Mode': 3,
-                'Use Wavelength Trigger Pulse Mode': 4,
-                'internal': 1,
-                'external_trigger': 2,
-                'external_pulse': 3,
-                'wavelength_trigger': 4,
-            }
-            proc_mode_map = {
-                'Use Internal Step Mode': 1,
-                'Use External Step Mode': 2,
-                'Use Manual Step Mode': 3,
-                'internal': 1,
-                'external': 2,
-                'manual': 3,
-            }
             pulseMode = data.get('pulseMode')
             processTriggerMode = data.get('processTriggerMode')
             wlTrigStart = float(data.get('wlTrigStart') or 0)
@@ -1233,112 +2011,127 @@ class MIRcatController:
             wlTrigInterval = float(data.get('wlTrigInterval') or 0)
             internalStepTime = int(data.get('internalStepTime') or 0)
             internalStepDelay = int(data.get('internalStepDelay') or 0)
-            pbPulseMode = pulse_mode_map.get(pulseMode or 'internal', 1)
-            pbProcTrigMode = proc_mode_map.get(processTriggerMode or 'internal', 1)
+            pbPulseMode = PULSE_MODE_CODES.get(pulseMode or 'internal', 1)
+            pbProcTrigMode = PROCESS_TRIGGER_MODE_CODES.get(processTriggerMode or 'internal', 1)
             # Call combined parameter setter if available
             if hasattr(self._sdk, 'MIRcatSDK_SetWlTrigParams'):
-                ret = self._sdk.MIRcatSDK_SetWlTrigParams(
-                    c_uint8(pbPulseMode), c_uint8(pbProcTrigMode),
-                    c_float(wlTrigStart), c_float(wlTrigStop), c_float(wlTrigInterval),
-                    c_uint8(self._UNITS_CM1), c_uint32(internalStepTime * 1000), c_uint32(internalStepDelay * 1000)
-                )
-                if not self._sdk_ok(ret):
-                    logger.warning(f"SetWlTrigParams returned {int(ret)}")
-            return True
+                if await self._set_wl_trig_params(
+                    pbPulseMode, pbProcTrigMode, wlTrigStart, wlTrigStop, wlTrigInterval,
+                    internalStepTime * 1000, internalStepDelay * 1000,
+                ):
+                    return ["SetWlTrigParams"]
+            return []
         except Exception as e:
             logger.warning(f"apply_trigger_settings failed: {e}")
+            return []
+
+    async def _set_wl_trig_params(self, pulse_mode: int, proc_mode: int, start_wn: float, stop_wn: float,
+                                  interval: float, step_time_us: int, delay_us: int) -> bool:
+        """SetWlTrigParams unless the same parameters are already applied; returns whether a new set was applied."""
+        # Compare at the float32 precision the SDK receives
+        params = (int(pulse_mode), int(proc_mode), c_float(float(start_wn)).value, c_float(float(stop_wn)).value,
+                  c_float(float(interval)).value, int(step_time_us), int(delay_us))
+        if params == self._wl_trig_applied:
+            self.trigger_params_cache["skipped_writes"] += 1
+            return False
+        self._wl_trig_applied = None
+        self.trigger_params_cache["writes"] += 1
+        ret = await self._sdk_run(
+            self._sdk.MIRcatSDK_SetWlTrigParams,
+            c_uint8(params[0]), c_uint8(params[1]), c_float(params[2]), c_float(params[3]), c_float(params[4]),
+            c_uint8(self._UNITS_CM1), c_uint32(params[5]), c_uint32(params[6])
+        )
+        if not self._sdk_ok(ret):
+            logger.warning(f"SetWlTrigParams returned {int(ret)}")
             return False
+        self._wl_trig_applied = params
+        return True
+
+    def _invalidate_status(self, *groups: str) -> None:
+        """Force the given status groups (default: all) to be re-read on the next sweep."""
+        if not groups:
+            self._poll_last.clear()
+        for group in groups:
+            self._poll_last.pop(group, None)
+
+    def _group_interval(self, group: str) -> float:
+        scanning_tier, idle_tier = self.STATUS_POLL_SCHEDULE[group]
+        return self.poll_intervals[scanning_tier if self.scan_in_progress else idle_tier]
+
+    def _due_status_groups(self, force: bool = False) -> frozenset:
+        """Status groups whose poll interval has elapsed (force adds all fast/medium groups)."""
+        now = time.monotonic()
+        due = set()
+        for group, tiers in self.STATUS_POLL_SCHEDULE.items():
+            last = self._poll_last.get(group)
+            if last is None or (now - last) >= self._group_interval(group):
+                due.add(group)
+            elif force and "slow" not in tiers:
+                due.add(group)
+        return frozenset(due)
 
-    async def _update_hardware_status(self) -> None:
-        """Update status from real MIRcat hardware via SDK calls"""
+    def _poll_tick(self) -> float:
+        """Sleep between poller sweeps: the shortest interval currently in use."""
+        return min(self._group_interval(group) for group in self.STATUS_POLL_SCHEDULE)
+
+    async def _update_hardware_status(self, force: bool = False) -> None:
+        """Update status from real MIRcat hardware via SDK calls
+
+        Only groups that are due per STATUS_POLL_SCHEDULE are read; ``force``
+        (used after actions) also re-reads every fast and medium group.
+
+        Refreshes are single-flight. A caller joins a sweep whose reads have
+        not begun yet, adding its groups to it. A non-forced caller also waits
+        for a sweep that is already reading and then reads only what is still
+        due. Forced callers never reuse reads that may predate their action.
+        """
         try:
             if self.connected:
-                # Get real hardware status from MIRcat device
-                self.status.update({
-                    "connected": self._mircat_sdk_call("isconnected"),
-                    "interlocks": self._mircat_sdk_call("isinterlocked"),
-                    "key_switch": self._mircat_sdk_call("iskeyswitch"),
-                    "temperature": self._mircat_sdk_call("temperaturestable"),
-                    "pointing_correction": False,
-                    "pointing_supported": None,
-                    "pointing_x_enabled": None,
-                    "pointing_y_enabled": None,
-                    "system_fault": False,  # Could be derived from specific error reads if available
-                    "tuned": self._mircat_sdk_call("istuned"),
-                    "armed": self._mircat_sdk_call("isarmed"),
-                    "emission": self._mircat_sdk_call("isemitting"),
-                    "case_temp_1": self._mircat_sdk_call("temperature"),
-                    "case_temp_2": self._mircat_sdk_call("temperature"),
-                    "pcb_temperature": self._mircat_sdk_call("temperature")
-                })
-                # Read-only pointing compensation state when supported
-                try:
-                    if hasattr(self._sdk, 'MIRcatSDK_PointingControlsSupported') and hasattr(self._sdk, 'MIRcatSDK_PointingGetCompensationEnabled'):
-                        supp = c_bool(False)
-                        if self._sdk_ok(self._sdk.MIRcatSDK_PointingControlsSupported(byref(supp))):
-                            self.status["pointing_supported"] = bool(supp.value)
-                            if bool(supp.value):
-                                xe = c_bool(False); ye = c_bool(False)
-                                if self._sdk_ok(self._sdk.MIRcatSDK_PointingGetCompensationEnabled(byref(xe), byref(ye))):
-                                    self.status["pointing_x_enabled"] = bool(xe.value)
-                                    self.status["pointing_y_enabled"] = bool(ye.value)
-                                    self.status["pointing_correction"] = bool(xe.value) or bool(ye.value)
-                                    # Log on change
-                                    cur_enabled = self.status["pointing_correction"]
-                                    if self._last_pointing_supported != self.status["pointing_supported"] or self._last_pointing_enabled != cur_enabled:
-                                        logger.info(f"Pointing status: supported={self.status['pointing_supported']}, x_enabled={self.status['pointing_x_enabled']}, y_enabled={self.status['pointing_y_enabled']}")
-                                        self._last_pointing_supported = self.status["pointing_supported"]
-                                        self._last_pointing_enabled = cur_enabled
-                        else:
-                            self.status["pointing_supported"] = None
-                except Exception:
-                    # On failure, do not overwrite previous values (avoid masking real issues)
-                    pass
-
-                # (diagnostic logging removed by request)
-                
-                # Update internal state from real hardware
-                self.armed = self.status["armed"]
-                self.tuned = self.status["tuned"]
-                self.temperature_stable = self.status["temperature"]
-                self.emission_on = self.status["emission"]
-                # Read pulse parameters (ignore failures silently)
-                try:
-                    qcl = int(self.current_qcl or 1)
-                    pr = c_float(0); pw = c_float(0)
-                    if self._sdk_ok(self._sdk.MIRcatSDK_GetQCLPulseRate(c_uint8(qcl), byref(pr))):
-                        self.pulse_rate = float(pr.value)
-                    if self._sdk_ok(self._sdk.MIRcatSDK_GetQCLPulseWidth(c_uint8(qcl), byref(pw))):
-                        self.pulse_width = float(pw.value)
-                except Exception:
-                    pass
-                # Read scan status
-                try:
-                    in_prog = c_bool(False); active=c_bool(False); paused=c_bool(False)
-                    cur_scan = c_uint16(0); cur_pct=c_uint16(0); cur_ww=c_float(0)
-                    units=c_uint8(0); tec=c_bool(False); motion=c_bool(False)
-                    if self._sdk_ok(self._sdk.MIRcatSDK_GetScanStatus(byref(in_prog), byref(active), byref(paused),
-                                              byref(cur_scan), byref(cur_pct), byref(cur_ww), byref(units), byref(tec), byref(motion))):
-                        self.scan_in_progress = bool(in_prog.value)
-                        self.current_scan_number = int(cur_scan.value)
-                        self.current_scan_percent = int(cur_pct.value)
-                        if cur_ww.value > 0:
-                            if int(units.value) == int(self._UNITS_CM1):
-                                self.current_wavenumber = float(cur_ww.value)
-                            else:
-                                try:
-                                    self.current_wavenumber = 10000.0 / float(cur_ww.value)
-                                except Exception:
-                                    pass
-                except Exception:
-                    pass
-                # Read sweep bidirectional flag when available
+                groups = self._due_status_groups(force)
+                while groups and self._status_sweep is not None:
+                    sweep = self._status_sweep
+                    with sweep.lock:
+                        joined = not sweep.started
+                        if joined:
+                            self._count_saved_status_reads(groups & sweep.groups, True)
+                            sweep.groups |= groups
+                    if joined:
+                        self.status_coalescing["joined"] += 1
+                        await asyncio.shield(sweep.done)
+                        return
+                    if force:
+                        break
+                    self.status_coalescing["waited"] += 1
+                    await asyncio.shield(sweep.done)
+                    remaining = self._due_status_groups()
+                    self._count_saved_status_reads(groups - remaining, not remaining)
+                    groups = remaining
+                if not groups:
+                    # Every group was read within its poll interval, so the state is current;
+                    # republish it so the snapshot's age reflects that
+                    self._publish_snapshot()
+                    return
+                sweep = _StatusSweep(set(groups), asyncio.get_running_loop().create_future())
+                self._status_sweep = sweep
+                self.status_coalescing["sweeps"] += 1
                 try:
-                    bidir = c_bool(False)
-                    if self._sdk_ok(self._sdk.MIRcatSDK_IsSweepBidirectional(byref(bidir))):
-                        self.status["sweep_bidirectional"] = bool(bidir.value)
-                except Exception:
-                    pass
+                    # While a trajectory is recording, its newest sample stands in for the scan read
+                    shared_scan = self._recent_trajectory_scan() if "scan" in groups else None
+                    if shared_scan is not None:
+                        sweep.groups.discard("scan")
+                    # The whole sweep runs as one telemetry batch on the SDK executor thread
+                    readings = await self._sdk_run(self._read_status_sweep, sweep, priority=TELEMETRY)
+                    if shared_scan is not None and "scan" not in sweep.read:
+                        readings["scan"] = shared_scan
+                    now = time.monotonic()
+                    for group in sweep.read | groups:
+                        self._poll_last[group] = now
+                    self._apply_hardware_status(readings)
+                finally:
+                    if self._status_sweep is sweep:
+                        self._status_sweep = None
+                    # Joined callers resume after this sweep's snapshot is published below
+                    sweep.done.set_result(None)
             else:
                 # Reset all status when disconnected
                 self.status.update({
@@ -1364,11 +2157,287 @@ class MIRcatController:
             # If we can't read status, assume device disconnected
             self.connected = False
             self.status["connected"] = False
-    
-    async def get_status(self) -> Dict[str, Any]:
-        """Get current device status with error information"""
-        await self._update_hardware_status()
-        
+            self._multispectral_fingerprint = None
+        self._publish_snapshot()
+
+    def _count_saved_status_reads(self, groups, whole_sweep: bool) -> None:
+        """Add the SDK calls a coalesced refresh did not make (``whole_sweep``: its IsConnected too)."""
+        saved = sum(self.STATUS_GROUP_SDK_CALLS.get(group, 1) for group in groups)
+        self.status_coalescing["sdk_calls_saved"] += saved + (1 if whole_sweep else 0)
+
+    def _read_status_sweep(self, sweep: _StatusSweep) -> Dict[str, Any]:
+        """Close ``sweep`` to joiners and read its groups (runs on the SDK executor thread)."""
+        with sweep.lock:
+            sweep.started = True
+            sweep.read = frozenset(sweep.groups)
+        return self._read_hardware_status(sweep.read)
+
+    def _read_hardware_status(self, groups: frozenset) -> Dict[str, Any]:
+        """Read the requested status groups (runs on the SDK executor thread).
+
+        Queued safety and control calls are let in between groups.
+        """
+        preempt = self._hw.preempt_point
+        status: Dict[str, Any] = {
+            "connected": self._mircat_sdk_call("isconnected"),
+            "system_fault": False,  # Could be derived from specific error reads if available
+        }
+        readings: Dict[str, Any] = {"status": status}
+        calls = self._sdk_calls()
+        for group, (key, command) in self._SIMPLE_STATUS_READS.items():
+            if group in groups:
+                preempt()
+                status[key] = self._mircat_sdk_call(command)
+        if "temperatures" in groups:
+            preempt()
+            # GetQCLTemperature is the only temperature the SDK exposes; read it once
+            temp = self._mircat_sdk_call("temperature")
+            status["case_temp_1"] = temp
+            status["case_temp_2"] = temp
+            status["pcb_temperature"] = temp
+        # Read-only pointing compensation state when supported
+        if "pointing" in groups:
+            preempt()
+            status.update({
+                "pointing_correction": False,
+                "pointing_supported": None,
+                "pointing_x_enabled": None,
+                "pointing_y_enabled": None,
+            })
+            try:
+                if hasattr(self._sdk, 'MIRcatSDK_PointingControlsSupported') and hasattr(self._sdk, 'MIRcatSDK_PointingGetCompensationEnabled'):
+                    ret, (supp,) = calls.PointingControlsSupported()
+                    if self._sdk_ok(ret):
+                        status["pointing_supported"] = bool(supp)
+                        if bool(supp):
+                            ret, (xe, ye) = calls.PointingGetCompensationEnabled()
+                            if self._sdk_ok(ret):
+                                status["pointing_x_enabled"] = bool(xe)
+                                status["pointing_y_enabled"] = bool(ye)
+                                status["pointing_correction"] = bool(xe) or bool(ye)
+            except Exception:
+                pass
+        # Read pulse parameters (ignore failures silently)
+        if "pulse" in groups:
+            preempt()
+            try:
+                qcl = int(self.current_qcl or 1)
+                readings["pulse_qcl"] = qcl
+                ret, (pr,) = calls.GetQCLPulseRate(qcl)
+                if self._sdk_ok(ret):
+                    readings["pulse_rate"] = float(pr)
+                ret, (pw,) = calls.GetQCLPulseWidth(qcl)
+                if self._sdk_ok(ret):
+                    readings["pulse_width"] = float(pw)
+            except Exception:
+                pass
+        # Read scan status
+        if "scan" in groups:
+            preempt()
+            try:
+                readings["scan"] = self._read_scan_status()
+            except Exception:
+                pass
+        # Read sweep bidirectional flag when available
+        if "sweep_bidirectional" in groups:
+            preempt()
+            try:
+                ret, (bidir,) = calls.IsSweepBidirectional()
+                if self._sdk_ok(ret):
+                    status["sweep_bidirectional"] = bool(bidir)
+            except Exception:
+                pass
+        return readings
+
+    def _apply_hardware_status(self, readings: Dict[str, Any]) -> None:
+        """Fold a status sweep from _read_hardware_status into controller state."""
+        self.status.update(readings["status"])
+        if self.status.get("pointing_supported"):
+            # Log pointing state on change
+            cur_enabled = self.status["pointing_correction"]
+            if self._last_pointing_supported != self.status["pointing_supported"] or self._last_pointing_enabled != cur_enabled:
+                logger.info(f"Pointing status: supported={self.status['pointing_supported']}, x_enabled={self.status['pointing_x_enabled']}, y_enabled={self.status['pointing_y_enabled']}")
+                self._last_pointing_supported = self.status["pointing_supported"]
+                self._last_pointing_enabled = cur_enabled
+
+        # Update internal state from real hardware
+        self.armed = self.status["armed"]
+        self.tuned = self.status["tuned"]
+        self.temperature_stable = self.status["temperature"]
+        self.emission_on = self.status["emission"]
+        if "pulse_rate" in readings:
+            self.pulse_rate = readings["pulse_rate"]
+        if "pulse_width" in readings:
+            self.pulse_width = readings["pulse_width"]
+        if "pulse_qcl" in readings:
+            self._update_qcl_params(readings["pulse_qcl"], pulse_rate=readings.get("pulse_rate"),
+                                    pulse_width=readings.get("pulse_width"))
+        scan = readings.get("scan")
+        if scan is not None:
+            in_prog, cur_scan, cur_pct, cur_ww, units, _motion = scan
+            if self._multispectral_active:
+                # Streamed list: the hardware only sees one chunk, report the whole list
+                progress = self.multispectral_progress
+                self.scan_in_progress = True
+                self.current_scan_number = progress["scan"]
+                self.current_scan_percent = progress["percent"]
+            else:
+                self.scan_in_progress = in_prog
+                self.current_scan_number = cur_scan
+                self.current_scan_percent = cur_pct
+            wn = self._scan_wavenumber(cur_ww, units)
+            if wn is not None:
+                self.current_wavenumber = wn
+
+    async def start_status_poller(self) -> None:
+        """Start the background task that refreshes the status snapshot."""
+        if self._poller_task and not self._poller_task.done():
+            return
+        self._poller_task = asyncio.create_task(self._status_poll_loop())
+
+    async def stop_status_poller(self) -> None:
+        """Stop the background status poller if running."""
+        task = self._poller_task
+        self._poller_task = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _status_poll_loop(self) -> None:
+        # Single owner of periodic SDK status reads; exits once disconnected
+        while self.connected:
+            await self._update_hardware_status()
+            await asyncio.sleep(self._poll_tick())
+
+    async def start_parameter_logger(self) -> None:
+        """Start the task that samples parameters into the parameter log while logging is enabled."""
+        if self._parameter_log_task and not self._parameter_log_task.done():
+            return
+        self._parameter_log_task = asyncio.create_task(self._parameter_log_loop())
+
+    async def stop_parameter_logger(self) -> None:
+        """Stop the parameter logger and write out its open chunk."""
+        task = self._parameter_log_task
+        self._parameter_log_task = None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.parameter_log.flush()
+
+    async def _parameter_log_loop(self) -> None:
+        # Samples on a fixed grid while connected; ticks missed behind a slow
+        # SDK call are skipped rather than bunched up. Turning logging off
+        # closes the open chunk so it reaches disk.
+        next_tick = time.monotonic()
+        while self.connected:
+            if self.user_settings.get('enableParameterLogging'):
+                try:
+                    readings = await self._sdk_run(self._read_logged_parameters, priority=TELEMETRY)
+                    self.parameter_log.append(self._parameter_log_row(readings))
+                    self._update_qcl_params(readings["qcl"], current=readings.get("qcl_current"))
+                except Exception as e:
+                    self.parameter_log_errors += 1
+                    if self.parameter_log_errors == 1 or self.parameter_log_errors % 100 == 0:
+                        logger.warning(f"Parameter log sample failed ({self.parameter_log_errors} so far): {e}")
+            elif self.parameter_log.open_rows:
+                await self.parameter_log.flush()
+            next_tick += self.parameter_log_interval
+            now = time.monotonic()
+            if next_tick < now:
+                next_tick = now
+            await asyncio.sleep(next_tick - now)
+        await self.parameter_log.flush()
+
+    def _read_logged_parameters(self) -> Dict[str, Any]:
+        """Read the logged analog parameters (runs on the SDK executor thread).
+
+        The flags, pulse parameters and scan position that the status poller
+        already keeps current are taken from controller state instead.
+        """
+        calls = self._sdk_calls()
+        qcl = int(self.current_qcl or 1)
+        readings: Dict[str, Any] = {"time": time.time(), "qcl": qcl}
+        ret, (temp,) = calls.GetQCLTemperature(qcl)
+        if self._sdk_ok(ret):
+            readings["qcl_temperature"] = temp
+        ret, (tec_ma,) = calls.GetTecCurrent(qcl)
+        if self._sdk_ok(ret):
+            readings["tec_current"] = tec_ma
+        ret, (at_temp,) = calls.AreTECsAtSetTemperature()
+        if self._sdk_ok(ret):
+            readings["tecs_at_temperature"] = at_temp
+        ret, (qcl_ma,) = calls.GetQCLCurrent(qcl)
+        if self._sdk_ok(ret):
+            readings["qcl_current"] = qcl_ma
+        return readings
+
+    def _parameter_log_row(self, readings: Dict[str, Any]) -> Dict[str, Any]:
+        """One parameter log row from fresh analog readings plus the latest polled state."""
+        return {
+            **readings,
+            "pulse_rate": self.pulse_rate,
+            "pulse_width": self.pulse_width,
+            "tuned": self.tuned,
+            "armed": self.armed,
+            "emission": self.emission_on,
+            "scan_in_progress": self.scan_in_progress,
+            "wavenumber": self.current_wavenumber,
+            "scan_number": self.current_scan_number,
+            "scan_percent": self.current_scan_percent,
+        }
+
+    async def get_parameter_log(self, start: Optional[float] = None, end: Optional[float] = None,
+                                columns: Optional[List[str]] = None, max_points: Optional[int] = 2000,
+                                envelope: bool = False) -> Dict[str, Any]:
+        """Logged parameters between epoch times ``start`` and ``end``, downsampled for plotting."""
+        return await self.parameter_log.query(start, end, columns, max_points, envelope)
+
+    def get_parameter_log_info(self) -> Dict[str, Any]:
+        return {
+            "enabled": bool(self.user_settings.get('enableParameterLogging')),
+            "running": bool(self._parameter_log_task and not self._parameter_log_task.done()),
+            "sample_interval": self.parameter_log_interval,
+            "errors": self.parameter_log_errors,
+            **self.parameter_log.info(),
+        }
+
+    def _publish_snapshot(self) -> Dict[str, Any]:
+        """Publish a new versioned status snapshot from current controller state."""
+        snapshot = self._build_status()
+        self._snapshot_version += 1
+        self._snapshot_monotonic = time.monotonic()
+        snapshot["snapshot_version"] = self._snapshot_version
+        snapshot["snapshot_time"] = time.time()
+        self._status_snapshot = snapshot
+        self._broadcast_state_update(snapshot)
+        return snapshot
+
+    def _broadcast_state_update(self, snapshot: Dict[str, Any]) -> None:
+        """Broadcast state update via WebSocket"""
+        broadcast_hub.publish("daylight_mircat", snapshot)
+
+    async def get_status(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Get current device status with error information
+
+        Served from the latest published snapshot. A hardware refresh is only
+        done inline when the snapshot is older than ``max_age`` seconds
+        (defaults to the configured ``max_staleness``).
+        """
+        limit = self.status_max_staleness if max_age is None else float(max_age)
+        if self._status_snapshot is None or (time.monotonic() - self._snapshot_monotonic) > limit:
+            await self._update_hardware_status()
+        else:
+            self.status_coalescing["snapshot_hits"] += 1
+        return self._status_snapshot
+
+    def _build_status(self) -> Dict[str, Any]:
+        """Assemble the status payload from controller state (no SDK access)."""
         return {
             "connected": self.connected,
             "armed": self.armed,
@@ -1384,7 +2453,12 @@ class MIRcatController:
             "current_scan_number": self.current_scan_number,
             "current_scan_percent": self.current_scan_percent,
             "current_scan_mode": self.current_scan_mode.value if self.current_scan_mode else None,
-            "status": self.status,
+            "multispectral_table_cache": dict(self.multispectral_table_cache),
+            "qcl_params_cache": dict(self.qcl_params_cache),
+            "trigger_params_cache": dict(self.trigger_params_cache),
+            "config_version": self.config_version,
+            "multispectral_progress": dict(self.multispectral_progress) if self.multispectral_progress else None,
+            "status": dict(self.status),
             "last_error": self.last_error,
             "last_error_code": self.last_error_code.value if self.last_error_code else None
         }
@@ -0,0 +1,315 @@
+"""
+MIRcat Parameter Log
+
+Telemetry store behind the ``enableParameterLogging`` user setting. The
+controller appends one row per sample period (QCL temperature, TEC state,
+QCL current, pulse parameters, tuned/armed/emission flags and scan
+position) to preallocated NumPy columns. Once a chunk covers
+``chunk_seconds`` it is written off the event loop as one compressed .npz
+file holding one array per column. The file is named after its first and
+last sample time (epoch ms), so a query only opens the chunks that overlap
+it. Chunks past the retention age or the size budget are deleted oldest
+first.
+
+Queries return time-bucketed means (and optionally min/max envelopes) so a
+day of 10 Hz samples comes back as a few thousand points. Only the
+requested columns are decompressed, and recently read chunks are cached.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.debounced_writer import atomic_write
+
+logger = logging.getLogger(__name__)
+
+LOG_DIR = (Path(__file__).parent / 'parameter_log').resolve()
+
+# Column name -> stored dtype; floats are NaN when a reading was not available
+PARAMETER_LOG_COLUMNS: Dict[str, np.dtype] = {
+    'time': np.dtype('<f8'),                 # wall-clock epoch seconds
+    'qcl': np.dtype('u1'),
+    'qcl_temperature': np.dtype('<f4'),      # deg C
+    'tec_current': np.dtype('<f4'),          # mA
+    'tecs_at_temperature': np.dtype('u1'),
+    'qcl_current': np.dtype('<f4'),          # mA
+    'pulse_rate': np.dtype('<f4'),           # Hz
+    'pulse_width': np.dtype('<f4'),          # ns
+    'tuned': np.dtype('u1'),
+    'armed': np.dtype('u1'),
+    'emission': np.dtype('u1'),
+    'scan_in_progress': np.dtype('u1'),
+    'wavenumber': np.dtype('<f4'),           # cm-1
+    'scan_number': np.dtype('<u2'),
+    'scan_percent': np.dtype('u1'),
+}
+
+_CHUNK_NAME = re.compile(r'^(\d+)-(\d+)\.npz$')
+
+
+def downsample(time_s: np.ndarray, columns: Dict[str, np.ndarray], start: float, end: float,
+               max_points: int, envelope: bool = False) -> Dict[str, np.ndarray]:
+    """Average ``columns`` over ``max_points`` equal time buckets spanning [start, end].
+
+    Buckets without samples are dropped. Means and envelopes ignore NaNs.
+    With ``envelope`` each column also gets ``<name>_min`` and ``<name>_max``.
+    """
+    edges = np.linspace(start, end, max(1, int(max_points)) + 1)
+    starts = np.unique(np.searchsorted(time_s, edges[:-1], side='left'))
+    starts = starts[starts < time_s.size]
+    counts = np.diff(np.append(starts, time_s.size))
+    result = {'time': np.add.reduceat(time_s, starts) / counts}
+    for name, values in columns.items():
+        values = values.astype(np.float64)
+        finite = np.isfinite(values)
+        n = np.add.reduceat(finite, starts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[name] = np.add.reduceat(np.where(finite, values, 0.0), starts) / n
+        if envelope:
+            result[f"{name}_min"] = np.fmin.reduceat(values, starts)
+            result[f"{name}_max"] = np.fmax.reduceat(values, starts)
+    return result
+
+
+def _json_column(values: np.ndarray) -> list:
+    # JSON has no NaN; missing readings and empty-bucket means become null
+    if values.dtype.kind == 'f' and np.isnan(values).any():
+        return np.where(np.isnan(values), None, values).tolist()
+    return values.tolist()
+
+
+class ParameterLogStore:
+    """Open chunk of parameter samples plus the rotated chunk files on disk."""
+
+    def __init__(self, directory: Path = LOG_DIR, sample_rate: float = 10.0, chunk_seconds: float = 600.0,
+                 retention_days: float = 30.0, max_total_mb: float = 500.0, cache_chunks: int = 160):
+        self.directory = Path(directory)
+        self.chunk_seconds = float(chunk_seconds)
+        self.retention_days = float(retention_days)
+        self.max_total_bytes = int(float(max_total_mb) * 1024 * 1024)
+        # Headroom so a chunk fills by time, not by rows, even if samples bunch up
+        self.chunk_rows = max(16, int(self.chunk_seconds * max(float(sample_rate), 0.1) * 1.25) + 16)
+        self.samples = 0
+        self.writes = 0
+        self._buffer = {name: np.zeros(self.chunk_rows, dtype=dtype) for name, dtype in PARAMETER_LOG_COLUMNS.items()}
+        self._rows = 0
+        # Closed chunks on disk, oldest first: (first time, last time, path, bytes)
+        self._chunks: List[Tuple[float, float, Path, int]] = self._scan_directory()
+        # Rotated chunks whose file is still being written: path -> columns
+        self._pending: Dict[Path, Dict[str, np.ndarray]] = {}
+        self._write_tasks: set = set()
+        # Decompressed columns of recently queried chunks (160 x 10 min covers a day)
+        self._cache: "OrderedDict[Path, Dict[str, np.ndarray]]" = OrderedDict()
+        self._cache_size = int(cache_chunks)
+        self._cache_lock = threading.Lock()
+
+    @property
+    def open_rows(self) -> int:
+        return self._rows
+
+    def _scan_directory(self) -> List[Tuple[float, float, Path, int]]:
+        chunks = []
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return chunks
+        for entry in entries:
+            match = _CHUNK_NAME.match(entry.name)
+            if match:
+                chunks.append((int(match.group(1)) / 1000.0, int(match.group(2)) / 1000.0,
+                               Path(entry.path), entry.stat().st_size))
+        chunks.sort(key=lambda c: c[0])
+        return chunks
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Add one sample (missing columns are stored as zero/NaN); rotates the chunk when it is full."""
+        i = self._rows
+        for name, column in self._buffer.items():
+            value = row.get(name)
+            if value is None:
+                column[i] = np.nan if column.dtype.kind == 'f' else 0
+            else:
+                column[i] = value
+        self._rows += 1
+        self.samples += 1
+        t0 = self._buffer['time'][0]
+        if self._rows >= self.chunk_rows or self._buffer['time'][i] - t0 >= self.chunk_seconds:
+            self.rotate()
+
+    def _open_columns(self) -> Dict[str, np.ndarray]:
+        return {name: column[:self._rows].copy() for name, column in self._buffer.items()}
+
+    def rotate(self) -> None:
+        """Close the open chunk and write it in the background."""
+        if self._rows == 0:
+            return
+        columns = self._open_columns()
+        self._rows = 0
+        first, last = float(columns['time'][0]), float(columns['time'][-1])
+        path = self.directory / f"{int(first * 1000)}-{int(last * 1000)}.npz"
+        self._pending[path] = columns
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_chunk(path, columns)
+            self._delete_files(self._chunk_written(path, first, last))
+            return
+        task = loop.create_task(self._write_pending(path, first, last))
+        self._write_tasks.add(task)
+        task.add_done_callback(self._write_tasks.discard)
+
+    async def _write_pending(self, path: Path, first: float, last: float) -> None:
+        try:
+            await asyncio.to_thread(self._write_chunk, path, self._pending[path])
+        except Exception as e:
+            logger.error(f"Failed to write parameter log chunk {path}: {e}")
+            self._pending.pop(path, None)
+            return
+        victims = self._chunk_written(path, first, last)
+        if victims:
+            await asyncio.to_thread(self._delete_files, victims)
+
+    def _write_chunk(self, path: Path, columns: Dict[str, np.ndarray]) -> None:
+        atomic_write(path, lambda f: np.savez_compressed(f, **columns), binary=True)
+
+    def _chunk_written(self, path: Path, first: float, last: float) -> List[Path]:
+        """Index a written chunk and return the chunk files that retention now drops."""
+        self._pending.pop(path, None)
+        self.writes += 1
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        self._chunks.append((first, last, path, size))
+        self._chunks.sort(key=lambda c: c[0])
+        cutoff = time.time() - self.retention_days * 86400.0
+        total = sum(c[3] for c in self._chunks)
+        victims = []
+        while len(self._chunks) > 1 and (self._chunks[0][1] < cutoff or total > self.max_total_bytes):
+            _first, _last, old_path, old_size = self._chunks.pop(0)
+            total -= old_size
+            victims.append(old_path)
+        if victims:
+            with self._cache_lock:
+                for victim in victims:
+                    self._cache.pop(victim, None)
+        return victims
+
+    @staticmethod
+    def _delete_files(paths: Sequence[Path]) -> None:
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not delete parameter log chunk {path}: {e}")
+
+    def _load_chunk(self, path: Path, names: Sequence[str]) -> Dict[str, np.ndarray]:
+        # Chunk files never change once written, so cached columns stay valid
+        with self._cache_lock:
+            cached = self._cache.get(path)
+            if cached is not None:
+                self._cache.move_to_end(path)
+            cached = dict(cached or {})
+        missing = [name for name in names if name not in cached]
+        if missing:
+            with np.load(path, allow_pickle=False) as data:
+                for name in missing:
+                    cached[name] = data[name] if name in data.files else np.full(
+                        data['time'].size, np.nan, dtype=np.float32)
+            with self._cache_lock:
+                self._cache[path] = cached
+                self._cache.move_to_end(path)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return {name: cached[name] for name in names}
+
+    async def query(self, start: Optional[float] = None, end: Optional[float] = None,
+                    columns: Optional[Sequence[str]] = None, max_points: Optional[int] = 2000,
+                    envelope: bool = False) -> Dict[str, Any]:
+        """Samples with epoch time in [start, end], downsampled to at most ``max_points`` buckets.
+
+        ``max_points`` None or <= 0 returns the raw samples.
+        """
+        names = [c for c in (columns or PARAMETER_LOG_COLUMNS) if c != 'time']
+        unknown = [c for c in names if c not in PARAMETER_LOG_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown parameter log column(s): {', '.join(unknown)}")
+        lo = -np.inf if start is None else float(start)
+        hi = np.inf if end is None else float(end)
+        # Gather in-memory parts on the event loop; file reads happen in a worker thread
+        chunks = [(c[2], None) for c in self._chunks if c[1] >= lo and c[0] <= hi]
+        chunks += [(path, cols) for path, cols in self._pending.items()
+                   if cols['time'][-1] >= lo and cols['time'][0] <= hi]
+        if self._rows:
+            chunks.append((None, self._open_columns()))
+        return await asyncio.to_thread(self._query, chunks, names, lo, hi, max_points, envelope)
+
+    def _query(self, chunks: list, names: List[str], lo: float, hi: float,
+               max_points: Optional[int], envelope: bool) -> Dict[str, Any]:
+        wanted = ['time'] + names
+        parts = []
+        for path, cols in chunks:
+            if cols is None:
+                try:
+                    cols = self._load_chunk(path, wanted)
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable parameter log chunk {path}: {e}")
+                    continue
+            t = cols['time']
+            a, b = np.searchsorted(t, lo, side='left'), np.searchsorted(t, hi, side='right')
+            if b > a:
+                parts.append({name: cols[name][a:b] for name in wanted})
+        parts.sort(key=lambda p: p['time'][0])
+        if parts:
+            merged = {name: np.concatenate([p[name] for p in parts]) for name in wanted}
+        else:
+            merged = {name: np.zeros(0, dtype=PARAMETER_LOG_COLUMNS[name]) for name in wanted}
+        t = merged.pop('time')
+        rows = int(t.size)
+        downsampled = bool(max_points) and max_points > 0 and rows > max_points
+        if downsampled:
+            result = downsample(t, merged, float(t[0]), float(t[-1]), int(max_points), envelope)
+        else:
+            result = {'time': t, **merged}
+        return {
+            "rows": rows,
+            "points": int(result['time'].size),
+            "downsampled": downsampled,
+            "bucket_seconds": float(t[-1] - t[0]) / max_points if downsampled else None,
+            "columns": {name: _json_column(values) for name, values in result.items()},
+        }
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "directory": str(self.directory),
+            "chunks": len(self._chunks),
+            "bytes": sum(c[3] for c in self._chunks),
+            "first_time": self._chunks[0][0] if self._chunks else (
+                float(self._buffer['time'][0]) if self._rows else None),
+            "open_rows": self._rows,
+            "pending_writes": len(self._pending),
+            "samples": self.samples,
+            "writes": self.writes,
+            "chunk_seconds": self.chunk_seconds,
+            "retention_days": self.retention_days,
+            "max_total_bytes": self.max_total_bytes,
+            "columns": {name: dtype.str for name, dtype in PARAMETER_LOG_COLUMNS.items()},
+        }
+
+    async def flush(self) -> None:
+        """Close the open chunk and wait for every pending chunk write (used on stop and shutdown)."""
+        self.rotate()
+        tasks = list(self._write_tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
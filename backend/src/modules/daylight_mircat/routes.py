@@ -5,11 +5,16 @@ REST API endpoints for controlling the Daylight MIRcat QCL laser
 """
 
 from fastapi import APIRouter, HTTPException, FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import asyncio
 import logging
 import json
-from pathlib import Path
+
+from core.broadcast import broadcast_hub
+from core.config import thaw
+from core.metrics import metrics
 
 from .controller import MIRcatController
 
@@ -55,6 +60,42 @@ class MultispectralScanRequest(BaseModel):
     wavelength_list: List[MultispectralEntry]
     number_of_scans: int = 1
     keep_laser_on_between_steps: bool = False
+    ordering: str = "as_entered"  # or "optimized" to minimize tuning time between elements
+
+class ScanPlanRequest(BaseModel):
+    mode: str  # "sweep", "step" or "multispectral"; the matching section must be set
+    sweep: Optional[SweepScanRequest] = None
+    step: Optional[StepScanRequest] = None
+    multispectral: Optional[MultispectralScanRequest] = None
+    sweep_points: int = 1001  # 2 to scan_plan.MAX_PLAN_POINTS; step plans are held to the same maximum
+    max_points: Optional[int] = None
+
+class ScanQueueJob(BaseModel):
+    mode: str  # "sweep", "step" or "multispectral"; the matching section must be set
+    sweep: Optional[SweepScanRequest] = None
+    step: Optional[StepScanRequest] = None
+    multispectral: Optional[MultispectralScanRequest] = None
+    repeats: int = 1
+
+class ScanQueueRequest(BaseModel):
+    jobs: List[ScanQueueJob]
+
+def _scan_job_params(job: ScanQueueJob) -> Dict[str, Any]:
+    """Controller start/plan keyword arguments for one queued job"""
+    if job.mode == "sweep" and job.sweep is not None:
+        r = job.sweep
+        return {"start_wn": r.start_wavenumber, "end_wn": r.end_wavenumber, "scan_speed": r.scan_speed,
+                "num_scans": r.number_of_scans, "bidirectional": r.bidirectional_scanning}
+    if job.mode == "step" and job.step is not None:
+        r = job.step
+        return {"start_wn": r.start_wavenumber, "end_wn": r.end_wavenumber, "step_size": r.step_size,
+                "dwell_time": r.dwell_time, "num_scans": r.number_of_scans}
+    if job.mode == "multispectral" and job.multispectral is not None:
+        r = job.multispectral
+        return {"wavelength_list": [entry.dict() for entry in r.wavelength_list],
+                "num_scans": r.number_of_scans, "keep_laser_on": r.keep_laser_on_between_steps,
+                "ordering": r.ordering}
+    raise ValueError(f"Scan mode '{job.mode}' needs a matching '{job.mode}' section")
 
 class UserSettings(BaseModel):
     selectQCL: int | None = None
@@ -229,20 +270,75 @@ async def set_pulse_parameters(request: PulseParametersRequest):
 
 # Status endpoints
 @router.get("/status")
-async def get_status():
-    """Get current device status"""
+async def get_status(max_age: Optional[float] = None):
+    """Get current device status (cached snapshot; max_age overrides the staleness bound)"""
     try:
-        status = await mircat_controller.get_status()
+        status = await mircat_controller.get_status(max_age=max_age)
         return status
     except Exception as e:
         logger.error(f"Get status error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/latency")
+async def get_completion_latency():
+    """Get completion latency histograms for tune, arm, disarm and emission waits"""
+    try:
+        return mircat_controller.get_completion_latency()
+    except Exception as e:
+        logger.error(f"Get latency error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/tune/model")
+async def get_tune_model():
+    """Get the logged tune timings and the fitted tune latency model"""
+    try:
+        return mircat_controller.get_tune_model()
+    except Exception as e:
+        logger.error(f"Get tune model error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/qcl/params")
+async def get_qcl_params():
+    """Get the cached QCL pulse parameters and how many SDK writes and reads the cache saved"""
+    try:
+        return mircat_controller.get_qcl_params()
+    except Exception as e:
+        logger.error(f"Get QCL params error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/parameter_log")
+async def get_parameter_log(start: Optional[float] = None, end: Optional[float] = None,
+                            columns: Optional[str] = None, max_points: Optional[int] = 2000,
+                            envelope: bool = False):
+    """Get logged parameters between epoch times ``start`` and ``end``
+
+    ``columns`` is a comma-separated subset (default: all). Results longer
+    than ``max_points`` are averaged into time buckets (``envelope`` adds
+    per-bucket min/max); ``max_points=0`` returns the raw samples.
+    """
+    try:
+        names = [c.strip() for c in columns.split(',') if c.strip()] if columns else None
+        return await mircat_controller.get_parameter_log(start, end, names, max_points, envelope)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Get parameter log error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/parameter_log/info")
+async def get_parameter_log_info():
+    """Get parameter logger state and stored chunk summary"""
+    try:
+        return mircat_controller.get_parameter_log_info()
+    except Exception as e:
+        logger.error(f"Get parameter log info error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/config")
 async def get_config():
     """Get device configuration parameters"""
     try:
-        return mircat_controller.config
+        return thaw(mircat_controller.config)
     except Exception as e:
         logger.error(f"Get config error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -299,17 +395,86 @@ async def start_multispectral_scan(request: MultispectralScanRequest):
         success = await mircat_controller.start_multispectral_scan(
             wavelength_list,
             request.number_of_scans,
-            request.keep_laser_on_between_steps
+            request.keep_laser_on_between_steps,
+            request.ordering
         )
         if success:
             status = await mircat_controller.get_status()
-            return {"message": "Multispectral scan started successfully", **status, "parameters": request.dict()}
+            return {"message": "Multispectral scan started successfully", **status, "parameters": request.dict(),
+                    "plan": mircat_controller.last_multispectral_plan}
         else:
             raise HTTPException(status_code=500, detail="Failed to start multispectral scan")
     except Exception as e:
         logger.error(f"Start multispectral scan error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/scan/plan")
+async def preview_scan_plan(request: ScanPlanRequest):
+    """Compile a scan request into per-point columns and predicted timing without touching the hardware
+
+    ``max_points`` decimates the returned columns; the summary always covers the full plan.
+    """
+    try:
+        if request.mode == "sweep" and request.sweep is not None:
+            r = request.sweep
+            plan = mircat_controller.plan_sweep_scan(
+                r.start_wavenumber, r.end_wavenumber, r.scan_speed, r.number_of_scans,
+                r.bidirectional_scanning, request.sweep_points
+            )
+        elif request.mode == "step" and request.step is not None:
+            r = request.step
+            plan = mircat_controller.plan_step_scan(
+                r.start_wavenumber, r.end_wavenumber, r.step_size, r.dwell_time, r.number_of_scans
+            )
+        elif request.mode == "multispectral" and request.multispectral is not None:
+            r = request.multispectral
+            entries = r.wavelength_list
+            # The order optimizer can take a few hundred ms on long lists
+            plan = await asyncio.to_thread(
+                mircat_controller.plan_multispectral_columns,
+                [entry.wavenumber for entry in entries],
+                [entry.dwell_time for entry in entries],
+                [entry.off_time for entry in entries],
+                r.number_of_scans, r.keep_laser_on_between_steps, r.ordering
+            )
+        else:
+            raise ValueError(f"Scan mode '{request.mode}' needs a matching '{request.mode}' section")
+        # Columns are plain floats already; skip FastAPI's per-element encoder for large plans
+        return JSONResponse({**plan.summary(), "columns": plan.to_columns(request.max_points)})
+    except Exception as e:
+        logger.error(f"Scan plan error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/scan/queue")
+async def submit_scan_queue(request: ScanQueueRequest):
+    """Run a list of scan jobs back to back; every job is validated before the first one starts"""
+    try:
+        if not mircat_controller.connected:
+            raise Exception("MIRcat device not connected")
+        jobs = [
+            {"mode": job.mode, "params": _scan_job_params(job), "repeats": job.repeats}
+            for job in request.jobs
+        ]
+        return {"message": "Scan queue started", **(await mircat_controller.scan_queue.submit(jobs))}
+    except Exception as e:
+        logger.error(f"Scan queue error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/scan/queue")
+async def get_scan_queue():
+    """Queue state, per-job run timing and total idle time between runs"""
+    return mircat_controller.scan_queue.info()
+
+@router.post("/scan/queue/cancel")
+async def cancel_scan_queue(stop_scan: bool = True):
+    """Stop the queue; ``stop_scan=false`` lets the scan currently running finish"""
+    try:
+        await mircat_controller.scan_queue.cancel(stop_scan)
+        return {"message": "Scan queue cancelled", **mircat_controller.scan_queue.info()}
+    except Exception as e:
+        logger.error(f"Scan queue cancel error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/scan/stop")
 async def stop_scan():
     """Stop any active scan"""
@@ -326,6 +491,55 @@ async def stop_scan():
         logger.error(f"Stop scan error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/scan/trajectory")
+async def get_scan_trajectory(start: Optional[float] = None, end: Optional[float] = None,
+                              since: Optional[int] = None, limit: Optional[int] = 10000):
+    """Get recorded scan trajectory samples as columns
+
+    ``start``/``end`` select by monotonic sample time; ``since`` selects by
+    sample index (use the returned ``next_index`` to page or follow).
+    """
+    try:
+        recorder = mircat_controller.trajectory
+        if since is not None:
+            records, next_index = recorder.read_since(since, limit)
+        else:
+            records = recorder.query(start, end, limit)
+            next_index = recorder.written
+        return {**recorder.info(), "next_index": next_index, "records": recorder.to_columns(records)}
+    except Exception as e:
+        logger.error(f"Get scan trajectory error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/scan/trajectory/stream")
+async def stream_scan_trajectory(since: int = 0):
+    """Stream trajectory samples as packed binary records until the scan's recording ends
+
+    Record layout is given by the X-Trajectory-Dtype header (NumPy dtype descr as JSON).
+    """
+    recorder = mircat_controller.trajectory
+    scan_id = recorder.scan_id
+
+    async def _records():
+        cursor = since
+        while True:
+            if recorder.scan_id != scan_id:
+                break
+            records, cursor = recorder.read_since(cursor)
+            if len(records):
+                yield records.tobytes()
+            elif not recorder.active:
+                break
+            await asyncio.sleep(max(0.05, mircat_controller.trajectory_interval))
+
+    info = recorder.info()
+    headers = {
+        "X-Trajectory-Dtype": json.dumps(info["dtype"]),
+        "X-Trajectory-Scan-Id": str(scan_id),
+        "X-Trajectory-Wall-Offset": repr(info["wall_offset"]),
+    }
+    return StreamingResponse(_records(), media_type="application/octet-stream", headers=headers)
+
 @router.post("/scan/step/manual")
 async def manual_step_scan():
     try:
@@ -342,17 +556,22 @@ async def manual_step_scan():
 def register(app: FastAPI) -> None:
     """Register MIRcat routes with FastAPI app"""
     app.include_router(router)
+    app.add_event_handler("startup", mircat_controller.user_settings.start_watcher)
+    app.add_event_handler("shutdown", mircat_controller.user_settings.stop)
+    app.add_event_handler("shutdown", mircat_controller.tune_model.flush)
+    app.add_event_handler("shutdown", mircat_controller.parameter_log.flush)
+    mircat_controller.register_metrics(metrics)
+    broadcast_hub.register_device(
+        "daylight_mircat",
+        mircat_controller.get_status,
+        volatile_keys=("snapshot_version", "snapshot_time"),
+    )
 
-# User settings persistence
-SETTINGS_PATH = (Path(__file__).parent / 'user_settings.json').resolve()
-
+# User settings persistence (in-memory store; file writes are debounced and atomic)
 @router.get('/settings')
 async def get_user_settings():
     try:
-        if SETTINGS_PATH.exists():
-            with open(SETTINGS_PATH, 'r') as f:
-                return json.load(f)
-        return {}
+        return mircat_controller.user_settings.snapshot()
     except Exception as e:
         logger.error(f"Get settings error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -361,36 +580,12 @@ async def get_user_settings():
 async def save_user_settings(payload: UserSettings):
     try:
         # Merge with existing
-        data: Dict[str, Any] = {}
-        if SETTINGS_PATH.exists():
-            with open(SETTINGS_PATH, 'r') as f:
-                try:
-                    data = json.load(f)
-                except Exception:
-                    data = {}
         update = {k: v for k, v in payload.dict().items() if v is not None}
-        data.update(update)
-        SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(SETTINGS_PATH, 'w') as f:
-            json.dump(data, f)
-        # Optionally apply hardware-affecting settings now
-        # Apply hardware-affecting settings as appropriate
-        if payload.laserMode is not None:
-            await mircat_controller.set_laser_mode(payload.laserMode)
-        # Only set pulse params when in Pulsed mode
-        try:
-            effective_mode = payload.laserMode if payload.laserMode is not None else mircat_controller.laser_mode
-            if effective_mode == 'Pulsed' and payload.pulseRate is not None and payload.pulseWidth is not None:
-                await mircat_controller.set_pulse_parameters(payload.pulseRate, payload.pulseWidth, payload.pulsedCurrent)
-        except Exception as e:
-            logger.warning(f"Applying pulse params skipped/failed: {e}")
-        # Apply trigger-related settings when provided
-        try:
-            await mircat_controller.apply_trigger_settings(data)
-        except Exception as e:
-            logger.warning(f"Trigger settings apply failed: {e}")
+        data = mircat_controller.user_settings.update(update)
+        # Apply hardware-affecting settings; unchanged QCL and trigger parameters are not re-sent
+        hardware_writes = await mircat_controller.apply_user_settings(update)
         status = await mircat_controller.get_status()
-        return {"message": "Settings saved", **status, "settings": data}
+        return {"message": "Settings saved", **status, "settings": data, "hardware_writes": hardware_writes}
     except Exception as e:
         logger.error(f"Save settings error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,305 @@
+"""
+MIRcat Scan Plans
+
+Compiles sweep, step & measure and multispectral requests into NumPy
+columns (wavenumber, wavelength, dwell and off time per point) with every
+range check done in one vectorized pass, and predicts when each point is
+reached and how long the whole scan takes. The controller's start_* methods
+program the hardware from a plan; POST /scan/plan returns one as a preview.
+
+Timing uses a simple tuning model (fixed settle time plus distance over a
+slew rate, plus a handoff penalty when a tune crosses into another QCL's
+range) from [daylight_mircat.scan_plan]. Sweep plans are sampled along the
+sweep, so their dwell and off columns are zero. Multispectral plans can be
+compiled with ``ordering="optimized"`` to visit the elements in the order
+with the least predicted tuning time (see tune_order.py).
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .tune_order import candidate_orders
+
+UINT32_MAX = 0xFFFFFFFF
+
+# Points a sweep pass is sampled at for the predicted trajectory
+DEFAULT_SWEEP_POINTS = 1001
+
+# Largest sweep sampling or step count a plan may have; each point is a row in
+# every column, so requests above this are rejected rather than allocated
+MAX_PLAN_POINTS = 100_000
+
+# Multispectral element orderings accepted by compile_multispectral
+ORDERINGS = ("as_entered", "optimized")
+
+
+class ScanPlanError(ValueError):
+    """A scan request that cannot be run as given."""
+
+
+@dataclass(frozen=True)
+class TuneTiming:
+    """Estimated time to tune between two wavenumbers: settle + |delta| / rate (+ handoff across QCLs).
+
+    ``qcl_boundaries`` are the wavenumbers where one QCL's range ends and the
+    next begins; a tune crossing one adds ``qcl_handoff`` seconds.
+    """
+    settle_time: float = 0.05  # seconds
+    rate: float = 2000.0       # cm-1 per second
+    qcl_handoff: float = 0.0   # seconds
+    qcl_boundaries: Tuple[float, ...] = ()
+
+    @classmethod
+    def from_config(cls, cfg) -> "TuneTiming":
+        return cls(
+            settle_time=float(cfg.get('tune_settle_time', 0.05)),
+            rate=float(cfg.get('tune_rate', 2000.0)),
+            qcl_handoff=float(cfg.get('qcl_handoff_time', 0.0)),
+            qcl_boundaries=tuple(sorted(float(b) for b in cfg.get('qcl_boundaries', []))),
+        )
+
+    def durations(self, distances: np.ndarray) -> np.ndarray:
+        return self.settle_time + np.abs(distances) / max(self.rate, 1e-9)
+
+    def between(self, origin, target) -> np.ndarray:
+        """Tune time from each ``origin`` wavenumber to the matching ``target`` (arrays broadcast)."""
+        origin = np.asarray(origin, dtype=np.float64)
+        target = np.asarray(target, dtype=np.float64)
+        cost = self.durations(target - origin)
+        if self.qcl_handoff and self.qcl_boundaries:
+            handoff = (np.searchsorted(self.qcl_boundaries, origin, side='right')
+                       != np.searchsorted(self.qcl_boundaries, target, side='right'))
+            cost = cost + self.qcl_handoff * handoff
+        return cost
+
+
+@dataclass
+class ScanPlan:
+    """Per-point columns of one scan pass plus predicted timing for the whole scan.
+
+    ``t`` is the predicted arrival time (seconds from scan start) at each point
+    of the first pass. ``duration`` covers all passes and is None for an
+    infinite scan (``num_scans`` <= 0).
+    """
+    mode: str
+    wavenumber: np.ndarray  # cm-1, float64
+    dwell_us: np.ndarray    # uint32
+    off_us: np.ndarray      # uint32
+    t: np.ndarray           # seconds, float64
+    num_scans: int
+    first_pass_duration: float
+    pass_duration: float
+    clamped: int = 0
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    # Original list index of each point, and the as-entered timing, when the order was optimized
+    order: Optional[np.ndarray] = None
+    original_first_pass_duration: Optional[float] = None
+    original_pass_duration: Optional[float] = None
+
+    @property
+    def points(self) -> int:
+        return int(self.wavenumber.size)
+
+    @property
+    def wavelength_um(self) -> np.ndarray:
+        return 10000.0 / self.wavenumber
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.num_scans <= 0:
+            return None
+        return self.first_pass_duration + self.pass_duration * (self.num_scans - 1)
+
+    @property
+    def original_duration(self) -> Optional[float]:
+        """Predicted duration of the list in the order it was entered."""
+        if self.original_first_pass_duration is None:
+            return self.duration
+        if self.num_scans <= 0:
+            return None
+        return self.original_first_pass_duration + self.original_pass_duration * (self.num_scans - 1)
+
+    def order_indices(self) -> List[int]:
+        """Original list index of each point in execution order (identity unless reordered)."""
+        if self.order is None:
+            return list(range(self.points))
+        return self.order.tolist()
+
+    def elements(self) -> List[tuple]:
+        """(wavenumber, dwell_us, off_us) tuples as programmed into the multispectral table."""
+        return list(zip(self.wavenumber.tolist(), self.dwell_us.tolist(), self.off_us.tolist()))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "points": self.points,
+            "num_scans": self.num_scans,
+            "first_pass_duration": self.first_pass_duration,
+            "pass_duration": self.pass_duration,
+            "duration": self.duration,
+            "original_duration": self.original_duration,
+            "ordering": self.parameters.get("ordering"),
+            "order_strategy": self.parameters.get("order_strategy", self.parameters.get("ordering")),
+            "clamped": self.clamped,
+            "wavenumber_min": float(self.wavenumber.min()) if self.points else None,
+            "wavenumber_max": float(self.wavenumber.max()) if self.points else None,
+            "parameters": self.parameters,
+        }
+
+    def to_columns(self, max_points: Optional[int] = None) -> Dict[str, list]:
+        """JSON-friendly columns, decimated by a constant stride to at most ``max_points``."""
+        stride = 1
+        if max_points is not None and max_points > 0 and self.points > max_points:
+            stride = -(-self.points // max_points)
+        columns = {
+            "wavenumber": self.wavenumber[::stride].tolist(),
+            "wavelength_um": self.wavelength_um[::stride].tolist(),
+            "dwell_ms": (self.dwell_us[::stride] / 1000.0).tolist(),
+            "off_ms": (self.off_us[::stride] / 1000.0).tolist(),
+            "t": self.t[::stride].tolist(),
+        }
+        if self.order is not None:
+            columns["original_index"] = self.order[::stride].tolist()
+        return columns
+
+
+def _check_range(name: str, values: np.ndarray, wn_min: float, wn_max: float) -> None:
+    bad = ~np.isfinite(values) | (values < wn_min) | (values > wn_max)
+    if bad.any():
+        first = int(np.argmax(bad))
+        raise ScanPlanError(
+            f"{name} {values[first]:g} cm-1 outside tuning range {wn_min:g}-{wn_max:g} cm-1"
+        )
+
+
+def _element_timeline(wavenumber: np.ndarray, hold: np.ndarray, timing: TuneTiming,
+                      from_wavenumber: Optional[float]) -> tuple:
+    """Arrival times for one pass and the durations of the first and later passes."""
+    tune_between = timing.between(wavenumber[:-1], wavenumber[1:])
+    lead = timing.settle_time if from_wavenumber is None else float(
+        timing.between(from_wavenumber, wavenumber[0]))
+    # Arrival at point i = lead + sum of (hold + tune) of the points before it
+    t = np.empty(wavenumber.size)
+    t[0] = lead
+    np.cumsum(hold[:-1] + tune_between, out=t[1:])
+    t[1:] += lead
+    body = float(t[-1] - lead + hold[-1])
+    wrap = float(timing.between(wavenumber[-1], wavenumber[0]))
+    return t, lead + body, wrap + body
+
+
+def compile_sweep(start_wn: float, end_wn: float, scan_speed: float, num_scans: int,
+                  bidirectional: bool, wn_min: float, wn_max: float, timing: TuneTiming,
+                  from_wavenumber: Optional[float] = None,
+                  points: int = DEFAULT_SWEEP_POINTS) -> ScanPlan:
+    """Sweep plan sampled at ``points`` positions along one pass."""
+    ends = np.array([start_wn, end_wn], dtype=np.float64)
+    _check_range("Sweep endpoint", ends, wn_min, wn_max)
+    if not np.isfinite(scan_speed) or scan_speed <= 0:
+        raise ScanPlanError(f"Scan speed must be positive (got {scan_speed})")
+    points = int(points)
+    if not 2 <= points <= MAX_PLAN_POINTS:
+        raise ScanPlanError(f"Sweep points must be between 2 and {MAX_PLAN_POINTS} (got {points})")
+    wavenumber = np.linspace(ends[0], ends[1], points)
+    sweep_time = float(abs(ends[1] - ends[0]) / scan_speed)
+    lead = timing.settle_time if from_wavenumber is None else float(
+        timing.between(from_wavenumber, ends[0]))
+    t = lead + np.abs(wavenumber - ends[0]) / scan_speed
+    # Later passes either reverse in place or retrace to the start
+    retrace = 0.0 if bidirectional else float(timing.between(ends[1], ends[0]))
+    zeros = np.zeros(wavenumber.size, dtype=np.uint32)
+    return ScanPlan(
+        mode="sweep", wavenumber=wavenumber, dwell_us=zeros, off_us=zeros.copy(), t=t,
+        num_scans=int(num_scans), first_pass_duration=lead + sweep_time,
+        pass_duration=retrace + sweep_time,
+        parameters={"scan_speed": float(scan_speed), "bidirectional": bool(bidirectional)},
+    )
+
+
+def compile_step(start_wn: float, end_wn: float, step_size: float, num_scans: int,
+                 step_time_ms: float, step_delay_ms: float, wn_min: float, wn_max: float,
+                 timing: TuneTiming, from_wavenumber: Optional[float] = None,
+                 min_step_size: float = 0.0) -> ScanPlan:
+    """Step & measure plan: evenly spaced points from start towards end, ``step_size`` apart.
+
+    ``min_step_size`` is the smallest step the hardware resolves (step_size_min).
+    """
+    ends = np.array([start_wn, end_wn], dtype=np.float64)
+    _check_range("Step endpoint", ends, wn_min, wn_max)
+    if not np.isfinite(step_size) or step_size <= 0:
+        raise ScanPlanError(f"Step size must be positive (got {step_size})")
+    if step_size < min_step_size:
+        raise ScanPlanError(f"Step size {step_size:g} cm-1 is below the minimum of {min_step_size:g} cm-1")
+    count = int(np.floor(abs(ends[1] - ends[0]) / step_size + 1e-9)) + 1
+    if count > MAX_PLAN_POINTS:
+        raise ScanPlanError(f"Step scan would have {count} points; the maximum is {MAX_PLAN_POINTS}")
+    direction = 1.0 if ends[1] >= ends[0] else -1.0
+    wavenumber = ends[0] + direction * step_size * np.arange(count)
+    dwell_us = np.full(count, min(UINT32_MAX, int(max(0, step_time_ms) * 1000)), dtype=np.uint32)
+    off_us = np.full(count, min(UINT32_MAX, int(max(0, step_delay_ms) * 1000)), dtype=np.uint32)
+    hold = (dwell_us.astype(np.float64) + off_us) / 1e6
+    t, first, later = _element_timeline(wavenumber, hold, timing, from_wavenumber)
+    return ScanPlan(
+        mode="step", wavenumber=wavenumber, dwell_us=dwell_us, off_us=off_us, t=t,
+        num_scans=int(num_scans), first_pass_duration=first, pass_duration=later,
+        parameters={"step_size": float(step_size), "step_time_ms": step_time_ms, "step_delay_ms": step_delay_ms},
+    )
+
+
+def compile_multispectral(wavenumbers: Sequence[float], dwell_ms: Sequence[float], off_ms: Sequence[float],
+                          num_scans: int, keep_laser_on: bool, wn_min: float, wn_max: float,
+                          timing: TuneTiming, from_wavenumber: Optional[float] = None,
+                          ordering: str = "as_entered") -> ScanPlan:
+    """Multispectral plan; wavenumbers outside the tuning range are clamped to it (counted in ``clamped``).
+
+    With ``ordering="optimized"`` the elements are reordered to minimize the
+    predicted scan duration; ``order`` then maps each point back to its list index.
+    """
+    if ordering not in ORDERINGS:
+        raise ScanPlanError(f"Unknown multispectral ordering '{ordering}' (expected one of {', '.join(ORDERINGS)})")
+    requested = np.asarray(wavenumbers, dtype=np.float64)
+    if requested.size == 0:
+        raise ScanPlanError("Multispectral list is empty")
+    if not np.isfinite(requested).all():
+        raise ScanPlanError("Multispectral list contains a non-finite wavenumber")
+    wavenumber = np.clip(requested, wn_min, wn_max)
+    clamped = int(np.count_nonzero(wavenumber != requested))
+    # UI times are ms; the SDK takes µs and uint32
+    dwell_us = np.clip(np.asarray(dwell_ms, dtype=np.int64) * 1000, 0, UINT32_MAX).astype(np.uint32)
+    if keep_laser_on:
+        off_us = np.zeros(requested.size, dtype=np.uint32)
+    else:
+        off_us = np.clip(np.asarray(off_ms, dtype=np.int64) * 1000, 0, UINT32_MAX).astype(np.uint32)
+    hold = (dwell_us.astype(np.float64) + off_us) / 1e6
+    t, first, later = _element_timeline(wavenumber, hold, timing, from_wavenumber)
+    parameters = {"keep_laser_on": bool(keep_laser_on), "ordering": ordering}
+    if ordering == "as_entered":
+        return ScanPlan(
+            mode="multispectral", wavenumber=wavenumber, dwell_us=dwell_us, off_us=off_us, t=t,
+            num_scans=int(num_scans), first_pass_duration=first, pass_duration=later, clamped=clamped,
+            parameters=parameters,
+        )
+
+    def total(first_pass: float, later_pass: float) -> float:
+        # Infinite scans are dominated by the repeating pass
+        return later_pass if num_scans <= 0 else first_pass + later_pass * (num_scans - 1)
+
+    best = ("as_entered", np.arange(wavenumber.size), t, first, later)
+    best_total = total(first, later)
+    for name, order in candidate_orders(wavenumber, timing.between, from_wavenumber).items():
+        if name == "as_entered":
+            continue
+        timeline = _element_timeline(wavenumber[order], hold[order], timing, from_wavenumber)
+        candidate_total = total(timeline[1], timeline[2])
+        if candidate_total < best_total - 1e-9:
+            best, best_total = (name, order) + timeline, candidate_total
+    name, order, t_opt, first_opt, later_opt = best
+    parameters["order_strategy"] = name
+    return ScanPlan(
+        mode="multispectral", wavenumber=wavenumber[order], dwell_us=dwell_us[order], off_us=off_us[order],
+        t=t_opt, num_scans=int(num_scans), first_pass_duration=first_opt, pass_duration=later_opt,
+        clamped=clamped, parameters=parameters, order=order,
+        original_first_pass_duration=first, original_pass_duration=later,
+    )
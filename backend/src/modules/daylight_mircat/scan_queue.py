@@ -0,0 +1,261 @@
+"""
+MIRcat Scan Queue
+
+Runs an ordered list of sweep, step and multispectral jobs back to back on
+the controller, each repeated a given number of times. Every job's scan plan
+is compiled when the queue is submitted, so an invalid job rejects the whole
+queue before the laser moves, and the predicted durations give a remaining
+time estimate. While a run is in progress the queue sleeps until shortly
+before its predicted end, then polls GetScanStatus closely and starts the
+next run as soon as completion is seen. A run only counts as complete once
+it has been seen running (or a short start grace has passed), and one that
+overruns its prediction by the configured timeout fails the queue. Step runs
+paced by external or manual process triggers have no timeout: the trigger
+source, not the plan, sets how long they take.
+
+The next run is programmed and started only after completion is seen; it
+cannot be loaded behind the running one, since the SDK rejects multispectral
+table and trigger parameter changes while a scan is in progress. The queue
+reports each completion it sees to the controller, so starting the next
+multispectral job does not first issue a redundant StopScanInProgress.
+
+Per-run timing is kept for the API: start call latency, measured duration
+against the plan, and the idle gap between the previous run's last running
+sample and this run being started.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .scan_plan import ScanPlan, ScanPlanError
+
+logger = logging.getLogger(__name__)
+
+# mode -> (plan method, start method) on MIRcatController; both take the job's params
+_JOB_METHODS: Dict[str, tuple] = {
+    "sweep": ("plan_sweep_scan", "start_sweep_scan"),
+    "step": ("plan_step_scan", "start_step_scan"),
+    "multispectral": ("plan_multispectral_scan", "start_multispectral_scan"),
+}
+
+
+@dataclass
+class ScanJob:
+    """One queued scan request, run ``repeats`` times."""
+    mode: str
+    params: Dict[str, Any]
+    repeats: int = 1
+    plan: Optional[ScanPlan] = None
+    status: str = "pending"  # pending, running, done, failed, cancelled
+    runs: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def predicted_duration(self) -> Optional[float]:
+        if self.plan is None or self.plan.duration is None:
+            return None
+        return self.plan.duration * self.repeats
+
+    def to_dict(self, index: int) -> Dict[str, Any]:
+        return {
+            "index": index,
+            "mode": self.mode,
+            "repeats": self.repeats,
+            "status": self.status,
+            # The multispectral list itself is summarized by the plan's point count
+            "params": {key: value for key, value in self.params.items() if key != "wavelength_list"},
+            "points": self.plan.points if self.plan else None,
+            "predicted_run_duration": self.plan.duration if self.plan else None,
+            "runs": self.runs,
+            "error": self.error,
+        }
+
+
+class MIRcatScanQueue:
+    """Server-side queue of scan jobs executed back to back."""
+
+    def __init__(self, controller):
+        self._ctl = controller
+        self.jobs: List[ScanJob] = []
+        self.state = "idle"  # idle, running, completed, failed, cancelled
+        self.current_job: Optional[int] = None
+        self.current_repeat: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.total_idle = 0.0
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._cancel = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def compile(self, jobs: List[Dict[str, Any]]) -> List[ScanJob]:
+        """Validate job specs ({"mode", "params", "repeats"}) and compile their plans."""
+        if not jobs:
+            raise ScanPlanError("Scan queue is empty")
+        compiled = []
+        for index, spec in enumerate(jobs):
+            mode = spec.get("mode")
+            if mode not in _JOB_METHODS:
+                raise ScanPlanError(f"Job {index}: unknown scan mode '{mode}'")
+            repeats = int(spec.get("repeats", 1))
+            if repeats < 1:
+                raise ScanPlanError(f"Job {index}: repeats must be at least 1")
+            params = dict(spec.get("params") or {})
+            try:
+                plan = getattr(self._ctl, _JOB_METHODS[mode][0])(**params)
+            except ScanPlanError as e:
+                raise ScanPlanError(f"Job {index} ({mode}): {e}") from e
+            if plan.duration is None:
+                raise ScanPlanError(f"Job {index} ({mode}): queued scans need a finite number of scans")
+            compiled.append(ScanJob(mode=mode, params=params, repeats=repeats, plan=plan))
+        return compiled
+
+    async def submit(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Replace the (finished) queue with ``jobs`` and start running it."""
+        if self.running:
+            raise Exception("A scan queue is already running; cancel it first")
+        # Multispectral jobs may run the order optimizer; keep it off the event loop
+        compiled = await asyncio.to_thread(self.compile, jobs)
+        self.jobs = compiled
+        self.state = "running"
+        self.current_job = None
+        self.current_repeat = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.total_idle = 0.0
+        self.error = None
+        self._cancel = False
+        self._task = asyncio.create_task(self._run())
+        return self.info()
+
+    async def cancel(self, stop_scan: bool = True) -> None:
+        """Stop the queue; the running scan is stopped too unless ``stop_scan`` is False."""
+        task = self._task
+        if task is None or task.done():
+            return
+        self._cancel = True
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        if stop_scan and self._ctl.connected:
+            await self._ctl.stop_scan()
+
+    def info(self) -> Dict[str, Any]:
+        remaining = None
+        if self.state == "running":
+            remaining = sum(job.predicted_duration or 0.0 for job in self.jobs if job.status == "pending")
+            if self.current_job is not None:
+                job = self.jobs[self.current_job]
+                finished = sum(1 for run in job.runs if run["duration"] is not None)
+                remaining += (job.plan.duration or 0.0) * (job.repeats - finished)
+        return {
+            "state": self.state,
+            "current_job": self.current_job,
+            "current_repeat": self.current_repeat,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "predicted_total": sum(job.predicted_duration or 0.0 for job in self.jobs),
+            "predicted_remaining": remaining,
+            "total_idle": self.total_idle,
+            "error": self.error,
+            "jobs": [job.to_dict(i) for i, job in enumerate(self.jobs)],
+        }
+
+    async def _run(self) -> None:
+        ctl = self._ctl
+        last_running: Optional[float] = None
+        try:
+            for index, job in enumerate(self.jobs):
+                self.current_job = index
+                job.status = "running"
+                for repeat in range(job.repeats):
+                    self.current_repeat = repeat + 1
+                    t_call = time.monotonic()
+                    started = await getattr(ctl, _JOB_METHODS[job.mode][1])(**job.params)
+                    if not started:
+                        raise Exception(ctl.last_error or f"{job.mode} scan failed to start")
+                    t_started = time.monotonic()
+                    idle = None if last_running is None else max(0.0, t_started - last_running)
+                    if idle is not None:
+                        self.total_idle += idle
+                    run = {
+                        "repeat": repeat + 1,
+                        "started_at": time.time(),
+                        "start_call": t_started - t_call,
+                        "idle_before": idle,
+                        "predicted": job.plan.duration,
+                        "duration": None,
+                    }
+                    job.runs.append(run)
+                    timed = not ctl.scan_externally_paced(job.mode)
+                    last_running = await self._wait_run(t_started, job.plan.duration, timed)
+                    run["duration"] = last_running - t_started
+                job.status = "done"
+            self.state = "completed"
+        except asyncio.CancelledError:
+            self._mark_remaining("cancelled")
+            self.state = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Scan queue stopped: {e}")
+            self.error = str(e)
+            self._mark_remaining("cancelled", failed=self.current_job)
+            self.state = "failed"
+        finally:
+            self.finished_at = time.time()
+            self.current_repeat = None
+
+    def _mark_remaining(self, status: str, failed: Optional[int] = None) -> None:
+        for index, job in enumerate(self.jobs):
+            if index == failed:
+                job.status = "failed"
+                job.error = self.error
+            elif job.status in ("pending", "running"):
+                job.status = status
+
+    async def _wait_run(self, started: float, predicted: float, timed: bool = True) -> float:
+        """Wait for the running scan to finish; returns the monotonic time it was last seen running.
+
+        "Not in progress" only counts as completion once the run has been seen
+        running, or ``start_grace`` seconds after it was started (a run short
+        enough to finish between two reads). A run still going after
+        ``predicted * timeout_factor + timeout_margin`` raises TimeoutError,
+        which fails the queue; with ``timed`` False the run may take any time.
+        """
+        ctl = self._ctl
+        intervals = ctl.scan_queue_intervals
+        predicted_end = started + predicted
+        deadline = None
+        if timed:
+            deadline = started + predicted * intervals["timeout_factor"] + intervals["timeout_margin"]
+        last_running = started
+        seen_running = False
+        while not self._cancel:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Scan did not finish within {deadline - started:.1f} s "
+                                   f"(predicted {predicted:.1f} s)")
+            # Software-managed scans (ping-pong, streamed multispectral) end when their task does
+            if ctl.software_scan_active():
+                last_running = time.monotonic()
+                seen_running = True
+                await asyncio.sleep(intervals["dense_interval"] if time.monotonic() > predicted_end
+                                    else intervals["coarse_interval"])
+                continue
+            t, scan = await ctl.sample_scan_status()
+            if scan is not None and scan[0]:
+                last_running = t
+                seen_running = True
+            elif scan is not None and (seen_running or t - started >= intervals["start_grace"]):
+                ctl.scan_completed()
+                return last_running
+            delay = predicted_end - intervals["end_guard"] - time.monotonic()
+            await asyncio.sleep(min(intervals["coarse_interval"], max(intervals["dense_interval"], delay)))
+        return last_running
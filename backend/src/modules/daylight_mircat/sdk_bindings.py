@@ -0,0 +1,318 @@
+"""
+Daylight MIRcat SDK Bindings
+
+Prototype table for every function exported by MIRcatSDK.h (all of them
+return a uint32_t error code) and call stubs with preallocated
+out-parameters for the reads on the status polling path.
+
+Declaring ``argtypes`` once lets ctypes convert plain Python numbers at call
+time instead of every caller building ``c_float``/``c_uint8`` wrappers and
+catches mismatched arguments. A stub reuses the same out-buffers and
+``byref`` handles on every call. Stubs are not thread-safe; like every SDK
+call they run on the SDK executor thread.
+
+Direct library functions and stubs are wrapped to record per-function call
+latency and non-zero return codes in the process metrics registry.
+"""
+
+import logging
+import time
+from operator import attrgetter
+from ctypes import (
+    POINTER, byref, c_bool, c_char_p, c_float, c_int, c_int16, c_int32, c_uint,
+    c_uint8, c_uint16, c_uint32,
+)
+from typing import Any, Callable, Dict, Tuple
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_sdk_latency = metrics.histogram(
+    "mircat_sdk_call_duration_seconds", "MIRcat SDK function call time", ("function",))
+_sdk_errors = metrics.counter(
+    "mircat_sdk_errors_total", "MIRcat SDK calls returning a non-zero code", ("function", "code"))
+
+SDK_PREFIX = 'MIRcatSDK_'
+
+P_BOOL = POINTER(c_bool)
+P_U8 = POINTER(c_uint8)
+P_U16 = POINTER(c_uint16)
+P_U32 = POINTER(c_uint32)
+P_I16 = POINTER(c_int16)
+P_I32 = POINTER(c_int32)
+P_INT = POINTER(c_int)
+P_UINT = POINTER(c_uint)
+P_FLOAT = POINTER(c_float)
+PP_UINT = POINTER(P_UINT)
+
+# Function name (without the MIRcatSDK_ prefix) -> argtypes, in header order
+PROTOTYPES: Dict[str, Tuple[Any, ...]] = {
+    'GetAPIVersion': (P_U16, P_U16, P_U16),
+    'SetCommType': (c_uint8,),
+    'SetSerialParams': (c_uint16, c_uint32),
+    'CreateMIRcatObject': (),
+    'IsMIRcatObjectCreated': (P_BOOL,),
+    'Initialize': (),
+    'DeInitialize': (),
+    'SearchForDevices': (),
+    'GetNumMIRcatDevices': (P_U8,),
+    'GetDeviceList': (PP_UINT,),
+    'ConnectToDevice': (c_uint,),
+    'SetActiveSystem': (c_uint,),
+    'DisconnectFromDevice': (c_uint,),
+    'GetModelNumber': (c_char_p, c_uint8),
+    'GetSerialNumber': (c_char_p, c_uint8),
+    'GetFirmwareVersions': (P_U8, P_U8, P_U8, P_U8, P_U8, P_U8),
+    'GetTuningRange': (P_FLOAT, P_FLOAT, P_U8),
+    'GetNumInstalledQcls': (P_U8,),
+    'GetQclTuningRange': (c_uint8, P_FLOAT, P_FLOAT, P_U8),
+    'GetHoursOfOperation': (P_FLOAT,),
+    'IsConnectedToLaser': (P_BOOL,),
+    'IsInterlockedStatusSet': (P_BOOL,),
+    'IsKeySwitchStatusSet': (P_BOOL,),
+    'IsEmissionOn': (P_BOOL,),
+    'IsLaserArmed': (P_BOOL,),
+    'IsSystemError': (P_BOOL,),
+    'ClearSystemError': (P_BOOL,),
+    'AreTECsAtSetTemperature': (P_BOOL,),
+    'GetSystemErrorWord': (P_U16,),
+    'GetWWDisplayUnits': (P_U8,),
+    'GetScanStatus': (P_BOOL, P_BOOL, P_BOOL, P_U16, P_U16, P_FLOAT, P_U8, P_BOOL, P_BOOL),
+    'GetScanWaitingProcessTrigger': (P_BOOL,),
+    'GetActiveQcl': (P_U8,),
+    'ConvertWW': (c_float, c_uint8, c_uint8, P_FLOAT),
+    'ArmLaser': (),
+    'DisarmLaser': (),
+    'ArmDisarmLaser': (),
+    'StopScanInProgress': (),
+    'PauseScanInProgress': (),
+    'ResumeScanInProgress': (),
+    'ManualStepScanInProgress': (),
+    'GetActualWW': (P_FLOAT, P_U8, P_BOOL),
+    'GetTuneWW': (P_FLOAT, P_U8, P_U8),
+    'TuneToWW': (c_float, c_uint8, c_uint8),
+    'IsTuned': (P_BOOL,),
+    'CancelManualTuneMode': (),
+    'TurnEmissionOn': (),
+    'TurnEmissionOff': (),
+    'GetSweepStartWW': (P_FLOAT, P_U8),
+    'GetSweepStopWW': (P_FLOAT, P_U8),
+    'GetSweepScanSpeed': (P_FLOAT, P_U8),
+    'GetSweepNumScans': (P_U16,),
+    'IsSweepBidirectional': (P_BOOL,),
+    'StartSweepScan': (c_float, c_float, c_float, c_uint8, c_uint16, c_bool, c_uint8),
+    'GetStepMeasureStartWW': (P_FLOAT, P_U8),
+    'GetStepMeasureStopWW': (P_FLOAT, P_U8),
+    'GetStepMeasureStepSizeWW': (P_FLOAT, P_U8),
+    'GetStepMeasureNumScans': (P_U16,),
+    'StartStepMeasureModeScan': (c_float, c_float, c_float, c_uint8, c_uint16),
+    'GetNumMultiSpectralElements': (P_U8,),
+    'GetMultiSpectralElement': (c_uint8, P_FLOAT, P_U32, P_U32),
+    'GetMultiSpectralWWUnits': (P_U8,),
+    'GetMultiSpectralNumScans': (P_U16,),
+    'SetNumMultiSpectralElements': (c_uint8,),
+    'AddMultiSpectralElement': (c_float, c_uint8, c_uint32, c_uint32),
+    'StartMultiSpectralModeScan': (c_uint16,),
+    'GetNumFavorites': (P_U8,),
+    'GetFavoriteName': (c_uint8, c_char_p, c_uint8),
+    'RecallFavorite': (c_char_p,),
+    'GetQCLPulseRate': (c_uint8, P_FLOAT),
+    'GetQCLPulseWidth': (c_uint8, P_FLOAT),
+    'GetQCLCurrent': (c_uint8, P_FLOAT),
+    'SetQCLParams': (c_uint8, c_float, c_float, c_float),
+    'GetQCLPulseLimits': (c_uint8, P_FLOAT, P_FLOAT, P_FLOAT),
+    'GetQCLMaxPulsedCurrent': (c_uint8, P_U16),
+    'GetQCLMaxCwCurrent': (c_uint8, P_U16),
+    'isCwAllowed': (c_uint8, P_BOOL),
+    'areCwFiltersInstalled': (c_uint8, P_BOOL),
+    'GetTecCurrent': (c_uint8, P_I16),
+    'GetQCLTemperature': (c_uint8, P_FLOAT),
+    'GetQCLOperatingMode': (c_uint8, P_U8),
+    'GetQclSetTemperature': (c_uint8, P_FLOAT),
+    'GetQCLTemperatureRange': (c_uint8, P_FLOAT, P_FLOAT, P_FLOAT),
+    'SetAllQclParams': (c_uint8, c_float, c_float, c_float, c_float, c_uint8, c_bool),
+    'PowerOffSystem': (),
+    'GetWlTrigParams': (P_U8, P_U8, P_FLOAT, P_FLOAT, P_FLOAT, P_U8, P_U32, P_U32),
+    'SetWlTrigParams': (c_uint8, c_uint8, c_float, c_float, c_float, c_uint8, c_uint32, c_uint32),
+    'GetWlTrigChanParams': (c_uint8, P_U8, P_FLOAT, P_FLOAT, P_FLOAT, P_U16),
+    'GetSystemTemperatures': (P_FLOAT, P_FLOAT, P_FLOAT),
+    'ReadWriteAdvancedSweepParams': (c_bool,),
+    'SetAdvancedSweepParams': (c_uint8, c_float, c_float, c_float, c_uint16, c_bool),
+    'GetAdvancedSweepParams': (P_U8, P_FLOAT, P_FLOAT, P_FLOAT, P_U16, P_BOOL),
+    'SetAdvancedSweepChanParams': (c_uint8, c_float, c_float, c_bool),
+    'GetAdvancedSweepChanParams': (c_uint8, P_FLOAT, P_FLOAT, P_BOOL),
+    'StartSweepAdvancedScan': (),
+    'InjectProcessTrigger': (),
+    'GetReadbackParameters': (c_uint8, P_FLOAT, P_FLOAT, P_FLOAT, P_FLOAT),
+    'GetAllTecParams': (c_uint8, P_FLOAT, P_FLOAT, P_FLOAT),
+    'GetMoveDuration': (c_uint8, P_U32),
+    'GetWlTrigPulseWidth': (P_U16,),
+    'SetWlTrigPulseWidth': (c_uint16,),
+    'EnableRedLaserPointer': (c_bool,),
+    'GetFactoryCrossover': (c_uint8, P_FLOAT),
+    'GetUserCrossover': (c_uint8, P_FLOAT),
+    'SetUserCrossover': (c_uint8, c_float),
+    'PointingControlsSupported': (P_BOOL,),
+    'PointingGetCompensationEnabled': (P_BOOL, P_BOOL),
+    'PointingCompensationEnable': (c_bool, c_bool),
+    'PointingGoToPosition': (c_int, c_int),
+    'PointingGetPosition': (P_INT, P_INT),
+    'PointingGetActiveChannel': (P_U8,),
+    'PointingSetActiveChannel': (c_uint8,),
+    'PointingGetActiveBasePosition': (c_uint8, P_INT, P_INT),
+    'PointingSetActiveBasePosition': (c_uint8, c_int, c_int),
+    'PointingGetFactoryBasePosition': (c_uint8, P_INT, P_INT),
+    'PointingReadCalTableInfo': (c_uint8, c_uint8, P_BOOL, P_U16, P_U8, P_U8, c_char_p),
+    'PointingExportCalTable': (c_uint8, c_uint8, P_U16, P_FLOAT, P_I32, P_I32),
+    'PointingImportCalTable': (c_uint8, c_uint8, c_uint16, c_uint8, c_uint8, c_char_p, P_FLOAT, P_I32, P_I32),
+    'PointingActivateCalTable': (c_uint8, c_uint8),
+    'PointingGetActiveCalTable': (c_uint8, P_U8),
+    'PointingDeleteCalTable': (c_uint8, c_uint8),
+    'ConvertCountsToMilliRadians': (c_int32, P_FLOAT),
+    'ConvertMilliRadiansToCounts': (c_float, P_I32),
+    'GetAdminMode': (P_BOOL,),
+    'SetAdminMode': (c_int32, c_bool),
+    'GetExtPreTrigMode': (P_BOOL,),
+    'SetExtPreTrigMode': (c_bool,),
+}
+
+
+def bind_prototypes(lib: Any) -> int:
+    """Declare restype/argtypes on every SDK function ``lib`` exports; returns how many were bound."""
+    bound = 0
+    for name, argtypes in PROTOTYPES.items():
+        fn = getattr(lib, SDK_PREFIX + name, None)
+        if fn is None:
+            continue  # older SDK builds do not export every function
+        fn.restype = c_uint32
+        fn.argtypes = list(argtypes)
+        bound += 1
+    return bound
+
+
+def _timed_function(name: str, fn: Any) -> Callable[..., int]:
+    """``fn`` with its call time and non-zero return codes recorded under ``name``."""
+    hist = _sdk_latency.labels(name)
+    perf_counter = time.perf_counter
+
+    def call(*args):
+        start = perf_counter()
+        ret = fn(*args)
+        hist.record(perf_counter() - start)
+        if ret:
+            _sdk_errors.labels(name, ret).inc()
+        return ret
+    call.timed = True
+    return call
+
+
+def _timed_stub(name: str, stub: "OutCall") -> "OutCall":
+    hist = _sdk_latency.labels(name)
+    perf_counter = time.perf_counter
+
+    def call(*args):
+        start = perf_counter()
+        result = stub(*args)
+        hist.record(perf_counter() - start)
+        if result[0]:
+            _sdk_errors.labels(name, result[0]).inc()
+        return result
+    return call
+
+
+def instrument_library(lib: Any) -> int:
+    """Replace ``lib``'s bound SDK functions with timed wrappers (once); returns how many were wrapped."""
+    wrapped = 0
+    for name in PROTOTYPES:
+        attr = SDK_PREFIX + name
+        fn = getattr(lib, attr, None)
+        if fn is None or getattr(fn, 'timed', False):
+            continue
+        try:
+            setattr(lib, attr, _timed_function(name, fn))
+        except AttributeError:
+            return wrapped  # read-only library object: leave it uninstrumented
+        wrapped += 1
+    return wrapped
+
+
+_value = attrgetter('value')
+
+
+def _convert(ctype: Any, value: Any) -> Any:
+    return ctype(value)
+
+
+OutCall = Callable[..., Tuple[int, tuple]]
+
+
+def _unchecked_function(lib: Any, name: str) -> Any:
+    """A separate function pointer for ``name`` without argtypes (same C function)."""
+    try:
+        # CDLL item access returns a new pointer object rather than the cached attribute
+        fn = lib[name]
+    except (TypeError, KeyError, AttributeError):
+        return getattr(lib, name)
+    fn.restype = c_uint32
+    return fn
+
+
+def make_out_call(fn: Any, argtypes: Tuple[Any, ...]) -> OutCall:
+    """Bind ``fn`` to preallocated buffers for its trailing pointer arguments.
+
+    The stub takes the leading (input) arguments and returns
+    ``(return_code, values)`` with one Python value per out-buffer. The
+    buffers are built from the prototype, so the call skips per-argument
+    argtypes checks; inputs are converted through their declared types.
+    """
+    n_in = len(argtypes)
+    while n_in and hasattr(argtypes[n_in - 1], 'contents'):
+        n_in -= 1
+    in_types = argtypes[:n_in]
+    buffers = tuple(argtype._type_() for argtype in argtypes[n_in:])
+    refs = tuple(byref(buf) for buf in buffers)
+
+    # Specialized for the shapes on the polling path: getters with no inputs or a QCL index
+    if len(buffers) == 1:
+        buf, ref = buffers[0], refs[0]
+        if n_in == 0:
+            def stub():
+                return fn(ref), (buf.value,)
+            return stub
+        if n_in == 1:
+            in_type = in_types[0]
+
+            def stub(arg):
+                return fn(in_type(arg), ref), (buf.value,)
+            return stub
+    if n_in == 0:
+        def stub():
+            return fn(*refs), tuple(map(_value, buffers))
+        return stub
+
+    def stub(*inputs):
+        return fn(*map(_convert, in_types, inputs), *refs), tuple(map(_value, buffers))
+    return stub
+
+
+class MIRcatBindings:
+    """A loaded SDK library with prototypes declared.
+
+    Attribute access by SDK function name (without the prefix) returns its
+    out-call stub, created on first use and cached as a plain attribute.
+    """
+
+    def __init__(self, lib: Any):
+        self.lib = lib
+        self.bound = bind_prototypes(lib)
+        instrument_library(lib)
+        logger.debug(f"Bound {self.bound}/{len(PROTOTYPES)} MIRcat SDK prototypes")
+
+    def __getattr__(self, name: str) -> OutCall:
+        argtypes = PROTOTYPES.get(name)
+        if argtypes is None or not hasattr(self.lib, SDK_PREFIX + name):
+            raise AttributeError(f"{SDK_PREFIX}{name} not supported in SDK")
+        stub = _timed_stub(name, make_out_call(_unchecked_function(self.lib, SDK_PREFIX + name), argtypes))
+        setattr(self, name, stub)
+        return stub
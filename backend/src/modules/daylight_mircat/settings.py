@@ -0,0 +1,58 @@
+"""
+Daylight MIRcat User Settings
+
+Typed access to the persisted front-end settings (user_settings.json)
+used by the controller when starting scans and applying trigger modes.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from core.settings_store import JsonSettingsStore
+
+SETTINGS_PATH = (Path(__file__).parent / 'user_settings.json').resolve()
+
+# UI labels (and short aliases) -> SDK pulse mode codes
+PULSE_MODE_CODES = {
+    'Use Internal Pulse Mode': 1,
+    'Use External Trigger Mode': 2,
+    'Use External Pulse Mode': 3,
+    'Use Wavelength Trigger Pulse Mode': 4,
+    'internal': 1,
+    'external_trigger': 2,
+    'external_pulse': 3,
+    'wavelength_trigger': 4,
+}
+
+# UI labels (and short aliases) -> SDK process trigger mode codes
+PROCESS_TRIGGER_MODE_CODES = {
+    'Use Internal Step Mode': 1,
+    'Use External Step Mode': 2,
+    'Use Manual Step Mode': 3,
+    'internal': 1,
+    'external': 2,
+    'manual': 3,
+}
+
+
+class MIRcatUserSettings(JsonSettingsStore):
+    """User settings held in memory with typed accessors for the controller."""
+
+    def __init__(self, path: Path = SETTINGS_PATH, **kwargs):
+        super().__init__(path, **kwargs)
+
+    def pulse_mode_code(self, default: int = 1) -> int:
+        return PULSE_MODE_CODES.get(self.get('pulseMode'), default)
+
+    def process_trigger_mode_code(self, default: int = 1) -> int:
+        return PROCESS_TRIGGER_MODE_CODES.get(self.get('processTriggerMode'), default)
+
+    def _optional_int(self, key: str) -> Optional[int]:
+        value = self.get(key)
+        return None if value is None else int(value)
+
+    def internal_step_time_ms(self) -> Optional[int]:
+        return self._optional_int('internalStepTime')
+
+    def internal_step_delay_ms(self) -> Optional[int]:
+        return self._optional_int('internalStepDelay')
@@ -0,0 +1,108 @@
+"""
+MIRcat Scan Trajectory Recorder
+
+Preallocated NumPy ring buffer of GetScanStatus samples taken during a
+scan: monotonic timestamp, wavenumber, scan number, percent complete and
+motion flag. Gives a measured wavenumber-versus-time axis for aligning
+detector data after the fact.
+
+Samples are appended from the event loop thread only, so no locking is
+needed. Every sample gets a global index that keeps counting across ring
+wrap-around; readers use it as a cursor (``read_since``).
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Packed little-endian record; the binary stream endpoint sends these bytes as-is
+TRAJECTORY_DTYPE = np.dtype([
+    ('t', '<f8'),            # time.monotonic() seconds at the middle of the SDK call
+    ('wavenumber', '<f4'),   # cm-1, NaN when the SDK reported no wavelength
+    ('scan_number', '<u2'),
+    ('percent', '<u2'),
+    ('motion', 'u1'),
+])
+
+
+class ScanTrajectoryRecorder:
+    """Ring buffer of scan status samples for the current (or last) scan."""
+
+    def __init__(self, capacity: int = 200000):
+        self.capacity = int(capacity)
+        self._buffer = np.zeros(self.capacity, dtype=TRAJECTORY_DTYPE)
+        self.written = 0
+        self.scan_id = 0
+        self.scan_mode: Optional[str] = None
+        self.active = False
+        # Offset that converts sample monotonic times to wall-clock epoch seconds
+        self.wall_offset = time.time() - time.monotonic()
+
+    def start(self, scan_mode: Optional[str]) -> int:
+        """Reset the buffer for a new scan and return its id."""
+        self.written = 0
+        self.scan_id += 1
+        self.scan_mode = scan_mode
+        self.active = True
+        self.wall_offset = time.time() - time.monotonic()
+        return self.scan_id
+
+    def finish(self) -> None:
+        self.active = False
+
+    def append(self, t: float, wavenumber: float, scan_number: int, percent: int, motion: bool) -> None:
+        self._buffer[self.written % self.capacity] = (t, wavenumber, scan_number, percent, motion)
+        self.written += 1
+
+    @property
+    def first_index(self) -> int:
+        """Global index of the oldest sample still held in the ring."""
+        return max(0, self.written - self.capacity)
+
+    def read_since(self, index: int, limit: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """Copy samples with global index >= ``index`` in time order; returns (records, next_index)."""
+        start = max(int(index), self.first_index)
+        stop = self.written if limit is None else min(self.written, start + int(limit))
+        if stop <= start:
+            return self._buffer[:0].copy(), max(start, int(index))
+        lo, hi = start % self.capacity, stop % self.capacity
+        if lo < hi or hi == 0:
+            records = self._buffer[lo:hi or self.capacity].copy()
+        else:
+            records = np.concatenate((self._buffer[lo:], self._buffer[:hi]))
+        return records, stop
+
+    def query(self, t_start: Optional[float] = None, t_end: Optional[float] = None,
+              limit: Optional[int] = None) -> np.ndarray:
+        """Samples with monotonic time in [t_start, t_end], oldest first."""
+        records, _ = self.read_since(self.first_index)
+        if t_start is not None or t_end is not None:
+            times = records['t']
+            lo = 0 if t_start is None else int(np.searchsorted(times, t_start, side='left'))
+            hi = len(records) if t_end is None else int(np.searchsorted(times, t_end, side='right'))
+            records = records[lo:hi]
+        if limit is not None:
+            records = records[:int(limit)]
+        return records
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "scan_id": self.scan_id,
+            "scan_mode": self.scan_mode,
+            "active": self.active,
+            "capacity": self.capacity,
+            "samples": self.written - self.first_index,
+            "first_index": self.first_index,
+            "next_index": self.written,
+            "wall_offset": self.wall_offset,
+            "dtype": [(name, TRAJECTORY_DTYPE[name].str) for name in TRAJECTORY_DTYPE.names],
+        }
+
+    @staticmethod
+    def to_columns(records: np.ndarray) -> Dict[str, list]:
+        """Column-oriented JSON-friendly view of a record array (NaN wavenumbers become None)."""
+        columns = {name: records[name].tolist() for name in TRAJECTORY_DTYPE.names}
+        wavenumber = records['wavenumber']
+        columns['wavenumber'] = np.where(np.isnan(wavenumber), None, wavenumber).tolist()
+        return columns
@@ -0,0 +1,166 @@
+"""
+MIRcat Tune Latency Model
+
+Logs every TuneToWW the controller issues (start and target wavenumber, QCL
+and the time until IsTuned reported true) in a fixed-size NumPy table that
+is persisted as a .npy file, and fits a per-QCL linear model
+
+    settle_time ~= intercept + slope * |target - start|
+
+by least squares over the logged tunes. The controller uses the fit for tune
+timeouts, the ping-pong lead-in guard and the scan plan timing; until a QCL
+has enough logged tunes the configured defaults apply.
+
+Settle times are measured by polling IsTuned, so they include up to one
+completion-wait poll interval of quantization. The log is written after a
+debounce, off the event loop (core.debounced_writer).
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from core.debounced_writer import DebouncedWriter, atomic_write
+
+from .scan_plan import TuneTiming
+
+logger = logging.getLogger(__name__)
+
+LOG_PATH = (Path(__file__).parent / 'tune_log.npy').resolve()
+
+TUNE_LOG_DTYPE = np.dtype([
+    ('time', '<f8'),         # wall-clock epoch seconds when the tune was issued
+    ('from_wn', '<f8'),      # cm-1; NaN when the start position was not known
+    ('to_wn', '<f8'),        # cm-1
+    ('qcl', 'u1'),
+    ('settle_time', '<f4'),  # seconds from TuneToWW until IsTuned
+])
+
+
+class TuneLatencyModel:
+    """Persisted tune log plus the per-QCL least-squares fit over it."""
+
+    def __init__(self, path: Path = LOG_PATH, capacity: int = 5000, min_samples: int = 10,
+                 debounce: float = 2.0):
+        self.path = Path(path)
+        self.capacity = int(capacity)
+        self.min_samples = int(min_samples)
+        # qcl -> {"intercept", "slope", "residual_std", "samples"}
+        self.fits: Dict[int, Dict[str, float]] = {}
+        self._log = self._read_file()
+        # record() replaces the array rather than mutating it, so it is its own snapshot
+        self._writer = DebouncedWriter(f"tune log {self.path}", lambda: self._log, self._write_file, debounce)
+        self.fit()
+
+    @property
+    def samples(self) -> int:
+        return int(self._log.size)
+
+    @property
+    def writes(self) -> int:
+        return self._writer.writes
+
+    def _read_file(self) -> np.ndarray:
+        try:
+            log = np.load(self.path, allow_pickle=False)
+        except FileNotFoundError:
+            return np.zeros(0, dtype=TUNE_LOG_DTYPE)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable tune log {self.path}: {e}")
+            return np.zeros(0, dtype=TUNE_LOG_DTYPE)
+        if log.dtype != TUNE_LOG_DTYPE:
+            logger.warning(f"Ignoring tune log {self.path} with unexpected layout {log.dtype}")
+            return np.zeros(0, dtype=TUNE_LOG_DTYPE)
+        return log[-self.capacity:].copy()
+
+    def _write_file(self, log: np.ndarray) -> None:
+        atomic_write(self.path, lambda f: np.save(f, log, allow_pickle=False), binary=True)
+
+    def record(self, from_wn: Optional[float], to_wn: float, qcl: int, settle_time: float) -> None:
+        """Append one observed tune, refit that QCL and schedule a write."""
+        row = np.array([(time.time(), np.nan if from_wn is None else from_wn, to_wn, qcl, settle_time)],
+                       dtype=TUNE_LOG_DTYPE)
+        self._log = np.concatenate((self._log[-(self.capacity - 1):] if self.capacity > 1 else self._log[:0], row))
+        self._fit_qcl(int(qcl))
+        self._writer.mark_dirty()
+
+    def fit(self) -> None:
+        """Refit every QCL present in the log."""
+        self.fits = {}
+        for qcl in np.unique(self._log['qcl']).tolist():
+            self._fit_qcl(int(qcl))
+
+    def _fit_qcl(self, qcl: int) -> None:
+        rows = self._log[(self._log['qcl'] == qcl) & np.isfinite(self._log['from_wn'])
+                         & (self._log['settle_time'] > 0)]
+        if rows.size < self.min_samples:
+            self.fits.pop(qcl, None)
+            return
+        distance = np.abs(rows['to_wn'].astype(np.float64) - rows['from_wn'])
+        settle = rows['settle_time'].astype(np.float64)
+        slope = 0.0
+        if np.ptp(distance) > 0:
+            design = np.column_stack((np.ones(rows.size), distance))
+            (intercept, slope), *_ = np.linalg.lstsq(design, settle, rcond=None)
+        if slope <= 0:
+            # Distance does not explain the latency (or never varied): use the mean latency alone
+            slope, intercept = 0.0, settle.mean()
+        # A negative intercept would predict tunes faster than ever observed
+        intercept, slope = max(0.0, float(intercept)), float(slope)
+        residual = settle - (intercept + slope * distance)
+        self.fits[qcl] = {
+            "intercept": intercept,
+            "slope": slope,
+            "residual_std": float(residual.std()),
+            "samples": int(rows.size),
+        }
+
+    def predict(self, from_wn: Optional[float], to_wn: float, qcl: int) -> Optional[float]:
+        """Expected settle time in seconds, or None without a fit (or start position) for ``qcl``."""
+        fit = self.fits.get(int(qcl))
+        if fit is None or from_wn is None:
+            return None
+        return fit["intercept"] + fit["slope"] * abs(float(to_wn) - float(from_wn))
+
+    def timing(self, qcl: int, fallback: TuneTiming) -> TuneTiming:
+        """Scan plan timing for ``qcl`` from the fit; ``fallback`` (and its QCL handoff settings) otherwise.
+
+        A fit without a distance term keeps the fallback slew rate.
+        """
+        fit = self.fits.get(int(qcl))
+        if fit is None:
+            return fallback
+        return TuneTiming(
+            settle_time=fit["intercept"],
+            rate=1.0 / fit["slope"] if fit["slope"] > 0 else fallback.rate,
+            qcl_handoff=fallback.qcl_handoff,
+            qcl_boundaries=fallback.qcl_boundaries,
+        )
+
+    def summary(self, recent: int = 20) -> Dict[str, Any]:
+        tail = self._log[-recent:] if recent > 0 else self._log[:0]
+        return {
+            "path": str(self.path),
+            "samples": self.samples,
+            "capacity": self.capacity,
+            "min_samples": self.min_samples,
+            "writes": self.writes,
+            "fits": {str(qcl): fit for qcl, fit in sorted(self.fits.items())},
+            "recent": [
+                {
+                    "time": float(row['time']),
+                    "from_wn": None if np.isnan(row['from_wn']) else float(row['from_wn']),
+                    "to_wn": float(row['to_wn']),
+                    "qcl": int(row['qcl']),
+                    "settle_time": float(row['settle_time']),
+                }
+                for row in tail
+            ],
+        }
+
+    async def flush(self) -> None:
+        """Write any pending tunes now (used on shutdown)."""
+        await self._writer.flush()
@@ -0,0 +1,101 @@
+"""
+Multispectral Tune Order Optimizer
+
+Reorders a multispectral element list to shorten the predicted time spent
+tuning between elements. Cost between two wavenumbers comes from the scan
+plan's TuneTiming (settle time, distance over slew rate, and a penalty when
+the move crosses into another QCL's range).
+
+The search builds a nearest-neighbour path from the current laser position,
+improves it with 2-opt segment reversals (windowed for long lists), and
+keeps whichever of that path, the sorted orders and the original order has
+the lowest predicted scan duration, so the result is never worse than the
+list as entered.
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+# Lists longer than this only try 2-opt moves between nearby positions
+TWO_OPT_FULL_MAX = 1000
+TWO_OPT_WINDOW = 64
+TWO_OPT_MAX_PASSES = 20
+
+CostFn = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def nearest_neighbour(wavenumber: np.ndarray, start: Optional[float]) -> np.ndarray:
+    """Greedy path from ``start`` (or the lowest wavenumber) that always tunes to the closest remaining element.
+
+    Closeness is by distance: the closest remaining element is always at one
+    edge of the visited span of the sorted list, so a two-pointer walk gives
+    the greedy path in O(n log n). QCL handoff penalties are left to 2-opt.
+    """
+    by_value = np.argsort(wavenumber, kind='stable')
+    values = wavenumber[by_value]
+    n = values.size
+    if start is None:
+        return by_value
+    right = int(np.searchsorted(values, start))
+    left = right - 1
+    order = np.empty(n, dtype=np.intp)
+    position = float(start)
+    for k in range(n):
+        if left < 0 or (right < n and values[right] - position <= position - values[left]):
+            order[k] = by_value[right]
+            position = values[right]
+            right += 1
+        else:
+            order[k] = by_value[left]
+            position = values[left]
+            left -= 1
+    return order
+
+
+def two_opt(order: np.ndarray, wavenumber: np.ndarray, cost: CostFn, start: Optional[float]) -> np.ndarray:
+    """Improve an open path by reversing segments while that lowers the total tune cost (symmetric costs)."""
+    order = order.copy()
+    n = order.size
+    if n < 3:
+        return order
+    window = n if n <= TWO_OPT_FULL_MAX else TWO_OPT_WINDOW
+    for _ in range(TWO_OPT_MAX_PASSES):
+        improved = False
+        x = wavenumber[order]
+        for i in range(n - 1):
+            if i == 0 and start is None:
+                prev = None
+            else:
+                prev = start if i == 0 else x[i - 1]
+            j = np.arange(i + 1, min(n, i + 1 + window))
+            xi, xj = x[i], x[j]
+            # Reversing x[i..j] swaps edges (prev, x[i]) + (x[j], x[j+1]) for (prev, x[j]) + (x[i], x[j+1])
+            delta = np.zeros(j.size)
+            if prev is not None:
+                p = np.full(j.size, prev)
+                delta += cost(p, xj) - cost(p, np.full(j.size, xi))
+            has_next = j + 1 < n
+            if has_next.any():
+                nxt = x[j[has_next] + 1]
+                delta[has_next] += cost(np.full(nxt.size, xi), nxt) - cost(xj[has_next], nxt)
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-12:
+                jj = int(j[best])
+                order[i:jj + 1] = order[i:jj + 1][::-1]
+                x[i:jj + 1] = x[i:jj + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return order
+
+
+def candidate_orders(wavenumber: np.ndarray, cost: CostFn, start: Optional[float]) -> dict:
+    """Named element orders worth comparing on predicted scan duration."""
+    ascending = np.argsort(wavenumber, kind='stable')
+    return {
+        "as_entered": np.arange(wavenumber.size),
+        "ascending": ascending,
+        "descending": ascending[::-1].copy(),
+        "nearest_neighbour_2opt": two_opt(nearest_neighbour(wavenumber, start), wavenumber, cost, start),
+    }
@@ -5,11 +5,12 @@ Implements control functions for the PicoScope 5244D MSO oscilloscope
 based on PicoSDK and GUI analysis.
 """
 
-import toml
 import logging
-from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+from core.broadcast import broadcast_hub
+from core.config import hardware_config
+
 logger = logging.getLogger(__name__)
 
 class PicoScope5244DController:
@@ -17,7 +18,8 @@ class PicoScope5244DController:
     
     def __init__(self):
         self.connected = False
-        self.config = self._load_config()
+        self.config = hardware_config.section('picoscope_5244d')
+        hardware_config.add_listener(self._on_config_reload)
         self.channels = {
             'A': {'enabled': True, 'range': '±2V', 'coupling': 'DC', 'offset': 0.0},
             'B': {'enabled': True, 'range': '±2V', 'coupling': 'DC', 'offset': 0.0},
@@ -36,17 +38,9 @@ class PicoScope5244DController:
             'enabled': True
         }
         
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from hardware_configuration.toml"""
-        config_path = Path(__file__).parent.parent.parent.parent.parent / "hardware_configuration.toml"
-        try:
-            with open(config_path, 'r') as f:
-                config = toml.load(f)
-            return config.get('picoscope_5244d', {})
-        except Exception as e:
-            logger.error(f"Failed to load config: {e}")
-            return {}
-    
+    def _on_config_reload(self, version: int) -> None:
+        self.config = hardware_config.section('picoscope_5244d')
+
     async def connect(self) -> bool:
         """Connect to PicoScope device"""
         try:
@@ -149,6 +143,4 @@ class PicoScope5244DController:
     
     async def _broadcast_state_update(self) -> None:
         """Broadcast state update via WebSocket"""
-        # TODO: Implement WebSocket broadcast to connected clients
-        logger.info("Broadcasting PicoScope state update")
-        pass
\ No newline at end of file
+        broadcast_hub.publish("picoscope_5244d", await self.get_status())
\ No newline at end of file
@@ -9,6 +9,8 @@ from pydantic import BaseModel
 from typing import Dict, Any
 import logging
 
+from core.broadcast import broadcast_hub
+
 from .controller import PicoScope5244DController
 
 logger = logging.getLogger(__name__)
@@ -171,3 +173,4 @@ async def get_status():
 def register(app: FastAPI) -> None:
     """Register PicoScope routes with FastAPI app"""
     app.include_router(router)
+    broadcast_hub.register_device("picoscope_5244d", picoscope_controller.get_status)
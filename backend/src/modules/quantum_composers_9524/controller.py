@@ -5,11 +5,12 @@ Implements control functions for the Quantum Composers 9524 signal generator
 based on serial communication and GUI analysis.
 """
 
-import toml
 import logging
-from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+from core.broadcast import broadcast_hub
+from core.config import hardware_config
+
 logger = logging.getLogger(__name__)
 
 class QuantumComposers9524Controller:
@@ -17,7 +18,8 @@ class QuantumComposers9524Controller:
     
     def __init__(self):
         self.connected = False
-        self.config = self._load_config()
+        self.config = hardware_config.section('quantum_composers_9524')
+        hardware_config.add_listener(self._on_config_reload)
         self.system_settings = {
             'pulse_mode': 'Continuous',
             'period': '0.000,100,00',
@@ -101,17 +103,9 @@ class QuantumComposers9524Controller:
             'gate_threshold': 2.50
         }
         
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from hardware_configuration.toml"""
-        config_path = Path(__file__).parent.parent.parent.parent.parent / "hardware_configuration.toml"
-        try:
-            with open(config_path, 'r') as f:
-                config = toml.load(f)
-            return config.get('quantum_composers_9524', {})
-        except Exception as e:
-            logger.error(f"Failed to load config: {e}")
-            return {}
-    
+    def _on_config_reload(self, version: int) -> None:
+        self.config = hardware_config.section('quantum_composers_9524')
+
     async def connect(self) -> bool:
         """Connect to Quantum Composers device"""
         try:
@@ -222,6 +216,4 @@ class QuantumComposers9524Controller:
     
     async def _broadcast_state_update(self) -> None:
         """Broadcast state update via WebSocket"""
-        # TODO: Implement WebSocket broadcast to connected clients
-        logger.info("Broadcasting Quantum Composers state update")
-        pass
\ No newline at end of file
+        broadcast_hub.publish("quantum_composers_9524", await self.get_status())
\ No newline at end of file
@@ -9,6 +9,8 @@ from pydantic import BaseModel
 from typing import Dict, Any
 import logging
 
+from core.broadcast import broadcast_hub
+
 from .controller import QuantumComposers9524Controller
 
 logger = logging.getLogger(__name__)
@@ -170,3 +172,4 @@ async def get_status():
 def register(app: FastAPI) -> None:
     """Register Quantum Composers routes with FastAPI app"""
     app.include_router(router)
+    broadcast_hub.register_device("quantum_composers_9524", qc_controller.get_status)
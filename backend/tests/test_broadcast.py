@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+from core.broadcast import PROTOCOL_DELTA, PROTOCOL_FULL, BroadcastHub, diff_payload
+
+
+def apply_patch(payload, changes, removed):
+    """Python twin of the front end's applyStatusPatch."""
+    def merge(target, src):
+        for key, value in src.items():
+            if isinstance(value, dict) and isinstance(target.get(key), dict):
+                merge(target[key], value)
+            else:
+                target[key] = value
+    merge(payload, changes)
+    for path in removed:
+        node = payload
+        for key in path[:-1]:
+            node = node[key]
+        node.pop(path[-1], None)
+    return payload
+
+
+class DeltaClient:
+    """Follows a delta subscriber like the UI does, resyncing on a missing base or seq gap."""
+
+    def __init__(self, hub, subscriber):
+        self.hub = hub
+        self.subscriber = subscriber
+        self.current = None
+        self.seq = None
+        self.resyncs = 0
+
+    def drain(self):
+        while not self.subscriber.queue.empty():
+            msg = json.loads(self.subscriber.queue.get_nowait())
+            if msg["type"] == "snapshot":
+                self.current, self.seq = msg["payload"], msg["seq"]
+            elif self.current is None or msg["seq"] != self.seq + 1:
+                self.resyncs += 1
+                self.seq = None
+                self.hub.resync(self.subscriber)
+            else:
+                self.current = apply_patch(self.current, msg["changes"], msg["removed"])
+                self.seq = msg["seq"]
+
+
+def test_diff_payload_nested_changes_and_removals():
+    old = {"a": 1, "nested": {"x": 1, "y": 2}, "gone": True}
+    new = {"a": 1, "nested": {"x": 5}, "added": [1]}
+    changes, removed = diff_payload(old, new)
+    assert changes == {"nested": {"x": 5}, "added": [1]}
+    assert sorted(removed) == [["gone"], ["nested", "y"]]
+
+
+def test_full_protocol_drops_oldest_frames():
+    async def run():
+        hub = BroadcastHub(queue_size=2)
+        hub.register_device("dev", None)
+        hub.publish("dev", {"n": 0})
+        sub = await hub.subscribe("dev", PROTOCOL_FULL)
+        for n in range(1, 5):
+            hub.publish("dev", {"n": n})
+        frames = [json.loads(sub.queue.get_nowait())["payload"]["n"] for _ in range(sub.queue.qsize())]
+        assert frames == [3, 4]
+        assert sub.dropped == 3
+    asyncio.run(run())
+
+
+def test_slow_delta_client_gets_snapshot_instead_of_losing_it():
+    async def run():
+        hub = BroadcastHub(queue_size=3)
+        hub.register_device("dev", None)
+        hub.publish("dev", {"n": 0, "nested": {"k": 0}})
+        sub = await hub.subscribe("dev", PROTOCOL_DELTA)
+        # Overflow the queue before the client reads anything: the initial
+        # snapshot must not be evicted by patches
+        for n in range(1, 10):
+            hub.publish("dev", {"n": n, "nested": {"k": n * 2}})
+        first = json.loads(sub.queue.get_nowait())
+        assert first["type"] == "snapshot"
+        client = DeltaClient(hub, sub)
+        client.current, client.seq = first["payload"], first["seq"]
+        client.drain()
+        for n in range(10, 13):
+            hub.publish("dev", {"n": n, "nested": {"k": n * 2}})
+            client.drain()
+        assert client.current == {"n": 12, "nested": {"k": 24}}
+        assert client.resyncs == 0
+    asyncio.run(run())
+
+
+def test_patch_without_base_triggers_resync():
+    async def run():
+        hub = BroadcastHub(queue_size=4)
+        hub.register_device("dev", None)
+        hub.publish("dev", {"n": 0})
+        sub = await hub.subscribe("dev", PROTOCOL_DELTA)
+        sub.queue.get_nowait()  # the client missed its snapshot
+        hub.publish("dev", {"n": 1})
+        client = DeltaClient(hub, sub)
+        client.drain()
+        assert client.resyncs == 1
+        hub.publish("dev", {"n": 2})
+        client.drain()
+        assert client.current == {"n": 2}
+    asyncio.run(run())
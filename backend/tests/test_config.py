@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+import modules.daylight_mircat.controller as mircat
+from core.config import HardwareConfig
+
+CONFIG = """
+[daylight_mircat.parameters]
+wavenumber_min = {wn_min}
+wavenumber_max = 2077.27
+
+[daylight_mircat.polling]
+fast_interval = {fast}
+"""
+
+
+def write(path, text, bump=0):
+    path.write_text(text)
+    # Give every rewrite a distinct mtime even on coarse-grained filesystems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 1_000_000_000))
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    path = tmp_path / "hardware_configuration.toml"
+    write(path, CONFIG.format(wn_min=1650.0, fast=0.1))
+    config = HardwareConfig(path)
+    monkeypatch.setattr(mircat, "hardware_config", config)
+    return config
+
+
+def test_sections_are_read_only(config):
+    section = config.section("daylight_mircat")
+    with pytest.raises(TypeError):
+        section["parameters"] = {}
+    assert config.section("missing") == {}
+
+
+def test_changed_file_is_reapplied_to_the_controller(config):
+    ctl = mircat.MIRcatController()
+    assert ctl.limits.wavenumber_min == 1650.0
+    assert ctl.poll_intervals["fast"] == 0.1
+    ctl.last_multispectral_plan = {"order": [0]}
+
+    write(config.path, CONFIG.format(wn_min=1660.0, fast=0.05), bump=1)
+    assert config.reload_if_changed()
+    assert config.version == 2
+    assert ctl.config_version == 2
+    assert ctl.limits.wavenumber_min == 1660.0
+    assert ctl.poll_intervals["fast"] == 0.05
+    # Runtime state survives the reload
+    assert ctl.last_multispectral_plan == {"order": [0]}
+    # Unchanged mtime: nothing to do
+    assert not config.reload_if_changed()
+
+
+def test_bad_file_keeps_the_previous_config(config):
+    ctl = mircat.MIRcatController()
+    write(config.path, "[daylight_mircat.parameters\nwavenumber_min = ", bump=1)
+    assert not config.reload_if_changed()
+    assert config.version == 1
+    assert ctl.limits.wavenumber_min == 1650.0
+    # The broken file is reported once, not on every watcher tick
+    assert not config.reload_if_changed()
+
+    write(config.path, CONFIG.format(wn_min=1670.0, fast=0.1), bump=2)
+    assert config.reload_if_changed()
+    assert ctl.limits.wavenumber_min == 1670.0
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.hardware_executor import CONTROL, SAFETY, TELEMETRY, HardwareExecutor
+
+
+@pytest.fixture
+def executor():
+    hw = HardwareExecutor("test-hw")
+    yield hw
+    hw.shutdown()
+
+
+async def wait_until(predicate):
+    while not predicate():
+        await asyncio.sleep(0.001)
+
+
+def test_queued_calls_run_by_priority_then_submission_order(executor):
+    gate = threading.Event()
+    executed = []
+
+    async def run():
+        # Occupy the worker so everything below queues up behind it
+        blocker = asyncio.ensure_future(executor.run(gate.wait, priority=CONTROL))
+        await wait_until(lambda: executor._running)
+        submitted = [("telemetry", 1, TELEMETRY), ("control", 1, CONTROL), ("telemetry", 2, TELEMETRY),
+                     ("safety", 1, SAFETY), ("control", 2, CONTROL), ("safety", 2, SAFETY)]
+        calls = []
+        for name, n, priority in submitted:
+            calls.append(asyncio.ensure_future(executor.run(executed.append, (name, n), priority=priority)))
+            await wait_until(lambda: len(executor._queue) == len(calls))
+        gate.set()
+        await asyncio.gather(blocker, *calls)
+
+    asyncio.run(run())
+    assert executed == [("safety", 1), ("safety", 2), ("control", 1), ("control", 2),
+                        ("telemetry", 1), ("telemetry", 2)]
+    assert executor.preemptions == 0
+
+
+def test_preempt_point_runs_queued_safety_inside_a_telemetry_batch(executor):
+    executed = []
+    safety_queued = threading.Event()
+
+    def batch():
+        executed.append("read 1")
+        safety_queued.wait()
+        executed.append(("preempted", executor.preempt_point()))
+        executed.append("read 2")
+
+    async def run():
+        reads = asyncio.ensure_future(executor.run(batch, priority=TELEMETRY))
+        await wait_until(lambda: executor._running)
+        later = asyncio.ensure_future(executor.run(executed.append, "telemetry", priority=TELEMETRY))
+        stop = asyncio.ensure_future(executor.run(executed.append, "stop", priority=SAFETY))
+        await wait_until(lambda: len(executor._queue) == 2)
+        safety_queued.set()
+        await asyncio.gather(reads, later, stop)
+
+    asyncio.run(run())
+    # SAFETY runs between the batch's reads; the equal-priority call waits for the batch to end
+    assert executed == ["read 1", "stop", ("preempted", 1), "read 2", "telemetry"]
+    assert executor.preemptions == 1
+    assert executor.stats()["preemptions"] == 1
+
+
+def test_preempt_point_is_a_no_op_off_the_worker(executor):
+    assert executor.preempt_point() == 0
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from modules.daylight_mircat.controller import MIRcatController
+
+
+class FakeSDK:
+    """Records the multispectral tables programmed and scans started; ``fail_add`` rejects an element."""
+
+    def __init__(self):
+        self.tables = []
+        self.starts = 0
+        self.fail_add = False
+
+    def MIRcatSDK_SetNumMultiSpectralElements(self, count):
+        self.tables.append([])
+        return 0
+
+    def MIRcatSDK_AddMultiSpectralElement(self, wn, units, dwell_us, off_us):
+        if self.fail_add:
+            return 80
+        self.tables[-1].append(round(wn.value, 2))
+        return 0
+
+    def MIRcatSDK_StartMultiSpectralModeScan(self, num_scans):
+        self.starts += 1
+        return 0
+
+
+@pytest.fixture
+def controller():
+    ctl = MIRcatController()
+    ctl._sdk = FakeSDK()
+
+    async def sdk_run(fn, *args, priority=None):
+        return fn(*args)
+
+    ctl._sdk_run = sdk_run
+    return ctl
+
+
+def table(n, start=1700.0):
+    return [(start + 0.5 * i, 100000, 0) for i in range(n)]
+
+
+def test_identical_table_is_not_reprogrammed(controller):
+    sdk = controller._sdk
+
+    async def scenario():
+        await controller._program_multispectral_table(table(3), 1, False)
+        await controller._program_multispectral_table(table(3), 1, False)
+        # The laser-on flag is part of the table identity
+        await controller._program_multispectral_table(table(3), 1, True)
+
+    asyncio.run(scenario())
+    assert len(sdk.tables) == 2
+    assert sdk.starts == 3
+    assert controller.multispectral_table_cache == {"hits": 1, "misses": 2}
+
+
+def test_failed_write_forgets_the_programmed_table(controller):
+    sdk = controller._sdk
+    asyncio.run(controller._program_multispectral_table(table(3), 1, False))
+    sdk.fail_add = True
+    with pytest.raises(Exception, match="AddMultiSpectralElement failed"):
+        asyncio.run(controller._program_multispectral_table(table(3, 1800.0), 1, False))
+    sdk.fail_add = False
+    # The half-written table no longer matches the first one
+    asyncio.run(controller._program_multispectral_table(table(3), 1, False))
+    assert len(sdk.tables) == 3
+    assert controller.multispectral_table_cache["hits"] == 0
+
+
+def test_disconnect_forgets_the_programmed_table(controller):
+    asyncio.run(controller._program_multispectral_table(table(3), 1, False))
+    asyncio.run(controller.disconnect())
+    asyncio.run(controller._program_multispectral_table(table(3), 1, False))
+    assert len(controller._sdk.tables) == 2
+
+
+def test_long_list_streams_in_table_sized_chunks(controller):
+    sdk = controller._sdk
+    size = controller.MULTISPECTRAL_TABLE_MAX
+    elements = table(2 * size + 10, 1640.0)
+
+    async def chunk_done(chunk):
+        return 0.0
+
+    controller._wait_multispectral_chunk = chunk_done
+
+    async def scenario():
+        await controller._start_multispectral_stream(elements, 2, False)
+        await controller._multispectral_task
+
+    asyncio.run(scenario())
+    assert [len(t) for t in sdk.tables] == [size, size, 10] * 2
+    # Chunks cover the list in order without gaps or overlaps
+    assert sum(sdk.tables[:3], []) == [wn for wn, _dwell, _off in elements]
+    assert controller.multispectral_progress["scan"] == 2
+    assert controller.multispectral_progress["elements_done"] == len(elements)
+    assert controller.multispectral_progress["percent"] == 100
+    assert not controller._multispectral_active
+
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from modules.daylight_mircat.controller import MIRcatController
+
+TRIGGER_SETTINGS = {
+    "pulseMode": "internal",
+    "processTriggerMode": "internal",
+    "wlTrigStart": 1700.0,
+    "wlTrigStop": 1800.0,
+    "wlTrigInterval": 1.0,
+    "internalStepTime": 100,
+    "internalStepDelay": 10,
+}
+
+
+class FakeSDK:
+    """Records SetWlTrigParams calls; ``ret`` is the SDK return code to hand back."""
+
+    def __init__(self):
+        self.ret = 0
+        self.wl_trig_calls = []
+
+    def MIRcatSDK_SetWlTrigParams(self, *args):
+        self.wl_trig_calls.append(args)
+        return self.ret
+
+
+@pytest.fixture
+def controller():
+    ctl = MIRcatController()
+    ctl._sdk = FakeSDK()
+
+    async def sdk_run(fn, *args, priority=None):
+        return fn(*args)
+
+    ctl._sdk_run = sdk_run
+    return ctl
+
+
+def test_wl_trig_params_only_sent_when_changed(controller):
+    sdk = controller._sdk
+
+    async def scenario():
+        first = await controller.apply_trigger_settings(TRIGGER_SETTINGS)
+        same = await controller.apply_trigger_settings(dict(TRIGGER_SETTINGS))
+        changed = await controller.apply_trigger_settings({**TRIGGER_SETTINGS, "wlTrigInterval": 2.0})
+        return first, same, changed
+
+    assert asyncio.run(scenario()) == (["SetWlTrigParams"], [], ["SetWlTrigParams"])
+    assert len(sdk.wl_trig_calls) == 2
+    assert controller.trigger_params_cache == {"writes": 2, "skipped_writes": 1}
+
+
+def test_failed_wl_trig_write_is_not_reported_and_is_retried(controller):
+    sdk = controller._sdk
+    sdk.ret = 1
+
+    async def scenario():
+        failed = await controller.apply_trigger_settings(TRIGGER_SETTINGS)
+        sdk.ret = 0
+        retried = await controller.apply_trigger_settings(TRIGGER_SETTINGS)
+        return failed, retried
+
+    assert asyncio.run(scenario()) == ([], ["SetWlTrigParams"])
+    assert len(sdk.wl_trig_calls) == 2
+
+
+def test_settings_save_reports_successful_writes_only(controller):
+    controller.user_settings.snapshot = lambda: dict(TRIGGER_SETTINGS)
+
+    def failing_write(*args):
+        raise Exception("SetQCLParams failed (1)")
+
+    controller._write_qcl_params = failing_write
+    update = {"pulseRate": 1000, "pulseWidth": 500, "pulsedCurrent": 400.0}
+    assert asyncio.run(controller.apply_user_settings(update)) == ["SetWlTrigParams"]
+    # The status the settings route returns already counts this save's writes
+    status = controller._status_snapshot
+    assert status["trigger_params_cache"] == {"writes": 1, "skipped_writes": 0}
+    assert status["qcl_params_cache"]["writes"] == 1
+
+    controller._write_qcl_params = lambda qcl, rate, width, current, default: ((rate, width), current)
+    assert asyncio.run(controller.apply_user_settings(update)) == ["SetQCLParams"]
+    status = controller._status_snapshot
+    assert status["trigger_params_cache"] == {"writes": 1, "skipped_writes": 1}
+    assert status["qcl_params_cache"]["writes"] == 2
+
+
+def test_qcl_params_write_skipped_when_cached(controller):
+    written = []
+
+    def write(qcl, rate, width, current, default):
+        written.append((qcl, rate, width, current))
+        return (rate, width), 400.0 if current is None else current
+
+    controller._write_qcl_params = write
+    controller._update_qcl_params(1, pulse_rate=1000.0, pulse_width=500.0, current=400.0)
+
+    async def scenario():
+        unchanged = await controller._apply_pulse_parameters(1000, 500)
+        changed = await controller._apply_pulse_parameters(2000, 500)
+        again = await controller.set_pulse_parameters(2000, 500)
+        return unchanged, changed, again
+
+    assert asyncio.run(scenario()) == (False, True, True)
+    # The cached current is reused rather than read back from the QCL
+    assert written == [(1, 2000.0, 500.0, 400.0)]
+    assert controller.qcl_params_cache["skipped_writes"] == 2
+    assert controller.qcl_params_cache["skipped_current_reads"] == 1
+    assert controller._cached_qcl_params(1, "pulse_rate", "current") == (2000.0, 400.0)
+
+
+def test_failed_qcl_params_write_drops_the_cache(controller):
+    def failing_write(*args):
+        raise Exception("SetQCLParams failed (1)")
+
+    controller._write_qcl_params = failing_write
+    controller._update_qcl_params(1, pulse_rate=1000.0, pulse_width=500.0, current=400.0)
+    assert asyncio.run(controller._apply_pulse_parameters(2000, 500)) is None
+    assert controller._cached_qcl_params(1, "pulse_rate") is None
+    assert "SetQCLParams failed" in controller.last_error
+
+
+def test_stale_qcl_params_are_not_trusted(controller):
+    controller.qcl_params_max_age = 0.01
+    controller._update_qcl_params(1, pulse_rate=1000.0)
+    asyncio.run(asyncio.sleep(0.02))
+    assert controller._cached_qcl_params(1, "pulse_rate") is None
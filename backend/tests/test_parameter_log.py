@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from modules.daylight_mircat.parameter_log import ParameterLogStore, downsample
+
+
+def test_downsample_bucket_means_and_envelope():
+    t = np.arange(10, dtype=np.float64)
+    values = np.arange(10, dtype=np.float32)
+    values[1] = np.nan
+    result = downsample(t, {"v": values}, 0.0, 10.0, 5, envelope=True)
+    np.testing.assert_allclose(result["time"], [0.5, 2.5, 4.5, 6.5, 8.5])
+    # The NaN is left out of its bucket's mean and envelope
+    np.testing.assert_allclose(result["v"], [0.0, 2.5, 4.5, 6.5, 8.5])
+    np.testing.assert_allclose(result["v_min"], [0, 2, 4, 6, 8])
+    np.testing.assert_allclose(result["v_max"], [0, 3, 5, 7, 9])
+
+
+def test_downsample_drops_empty_buckets():
+    t = np.array([0.0, 0.1, 9.9])
+    result = downsample(t, {"v": np.array([1.0, 3.0, 5.0])}, 0.0, 10.0, 10)
+    np.testing.assert_allclose(result["time"], [0.05, 9.9])
+    np.testing.assert_allclose(result["v"], [2.0, 5.0])
+
+
+def test_store_rotates_and_queries_across_chunks(tmp_path):
+    store = ParameterLogStore(tmp_path, sample_rate=10.0, chunk_seconds=10.0)
+    t0 = time.time() - 60.0  # inside the retention window
+    for i in range(300):  # 30 s at 10 Hz: two written chunks plus the open one
+        store.append({"time": t0 + i * 0.1, "qcl": 1, "wavenumber": 1700.0 + i, "tuned": 1})
+    assert store.writes == 2 and store.open_rows > 0
+
+    raw = asyncio.run(store.query(t0 + 5.0, t0 + 25.0, columns=["wavenumber"], max_points=None))
+    assert raw["rows"] == 201 and not raw["downsampled"]
+    assert raw["columns"]["wavenumber"][0] == pytest.approx(1750.0)
+
+    reduced = asyncio.run(store.query(columns=["wavenumber", "pulse_rate"], max_points=30))
+    assert reduced["downsampled"] and reduced["points"] == 30
+    assert reduced["columns"]["pulse_rate"][0] is None  # never logged: NaN becomes null
+    with pytest.raises(ValueError):
+        asyncio.run(store.query(columns=["bogus"]))
+
+    asyncio.run(store.flush())
+    reopened = ParameterLogStore(tmp_path, sample_rate=10.0, chunk_seconds=10.0)
+    assert asyncio.run(reopened.query(max_points=None))["rows"] == 300
+
+
+def test_store_drops_oldest_chunks_over_size_limit(tmp_path):
+    store = ParameterLogStore(tmp_path, sample_rate=10.0, chunk_seconds=1.0, max_total_mb=0.004)
+    t0 = time.time() - 60.0  # inside the retention window
+    for i in range(200):
+        store.append({"time": t0 + i * 0.1, "wavenumber": float(i)})
+    asyncio.run(store.flush())
+    info = store.info()
+    assert info["bytes"] <= store.max_total_bytes or info["chunks"] == 1
+    assert info["chunks"] == len(list(tmp_path.glob("*.npz")))
+    assert info["first_time"] > t0
+
+
+def test_store_drops_chunks_past_retention(tmp_path):
+    store = ParameterLogStore(tmp_path, sample_rate=10.0, chunk_seconds=1.0, retention_days=1.0)
+    old = time.time() - 2 * 86400.0
+    for i in range(25):
+        store.append({"time": old + i * 0.1})
+    for i in range(25):
+        store.append({"time": time.time() - 10.0 + i * 0.1})
+    asyncio.run(store.flush())
+    # Chunk files are named <first ms>-<last ms>.npz; only ones ending inside the window remain
+    cutoff_ms = (time.time() - 86400.0) * 1000
+    last_ms = [int(path.stem.split("-")[1]) for path in tmp_path.glob("*.npz")]
+    assert last_ms and min(last_ms) > cutoff_ms
+    assert store.info()["chunks"] == len(last_ms)
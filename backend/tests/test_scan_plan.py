@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from modules.daylight_mircat.scan_plan import (
+    MAX_PLAN_POINTS, ScanPlanError, TuneTiming, compile_multispectral, compile_step, compile_sweep,
+)
+
+WN_MIN, WN_MAX = 1638.81, 2077.27
+TIMING = TuneTiming(settle_time=0.05, rate=2000.0)
+
+
+def test_sweep_plan_timing():
+    plan = compile_sweep(1700.0, 1800.0, 10.0, 2, False, WN_MIN, WN_MAX, TIMING, points=101)
+    assert plan.points == 101
+    assert plan.wavenumber[0] == 1700.0 and plan.wavenumber[-1] == 1800.0
+    assert plan.t[0] == pytest.approx(0.05)
+    assert plan.t[-1] == pytest.approx(0.05 + 10.0)
+    # The second pass retraces 100 cm-1 before sweeping again
+    assert plan.duration == pytest.approx(0.05 + 10.0 + (0.05 + 100 / 2000.0) + 10.0)
+
+
+def test_sweep_points_are_bounded():
+    for points in (1, MAX_PLAN_POINTS + 1):
+        with pytest.raises(ScanPlanError):
+            compile_sweep(1700.0, 1800.0, 10.0, 1, False, WN_MIN, WN_MAX, TIMING, points=points)
+    plan = compile_sweep(1700.0, 1800.0, 10.0, 1, False, WN_MIN, WN_MAX, TIMING, points=MAX_PLAN_POINTS)
+    assert plan.points == MAX_PLAN_POINTS
+
+
+def test_sweep_rejects_out_of_range_endpoint():
+    with pytest.raises(ScanPlanError, match="outside tuning range"):
+        compile_sweep(1600.0, 1800.0, 10.0, 1, False, WN_MIN, WN_MAX, TIMING)
+
+
+def test_step_plan_points_and_dwell():
+    plan = compile_step(1800.0, 1700.0, 25.0, 1, 100, 10, WN_MIN, WN_MAX, TIMING)
+    np.testing.assert_allclose(plan.wavenumber, [1800, 1775, 1750, 1725, 1700])
+    assert plan.dwell_us.tolist() == [100_000] * 5
+    assert plan.off_us.tolist() == [10_000] * 5
+    # Four 25 cm-1 tunes between five 110 ms holds
+    assert plan.first_pass_duration == pytest.approx(0.05 + 5 * 0.11 + 4 * (0.05 + 25 / 2000.0))
+
+
+def test_step_size_below_resolution_is_rejected():
+    with pytest.raises(ScanPlanError, match="below the minimum"):
+        compile_step(1700.0, 1800.0, 0.1, 1, 100, 0, WN_MIN, WN_MAX, TIMING, min_step_size=0.5)
+    with pytest.raises(ScanPlanError, match="positive"):
+        compile_step(1700.0, 1800.0, 0.0, 1, 100, 0, WN_MIN, WN_MAX, TIMING)
+
+
+def test_step_count_is_bounded():
+    # Without a hardware minimum a tiny step would otherwise allocate billions of points
+    with pytest.raises(ScanPlanError, match="maximum"):
+        compile_step(WN_MIN, WN_MAX, 1e-9, 1, 100, 0, WN_MIN, WN_MAX, TIMING)
+
+
+def test_multispectral_clamps_and_converts_units():
+    plan = compile_multispectral([1600.0, 1700.0], [5, 10], [1, 2], 1, False, WN_MIN, WN_MAX, TIMING)
+    assert plan.clamped == 1
+    assert plan.wavenumber[0] == WN_MIN
+    assert plan.dwell_us.tolist() == [5000, 10000]
+    assert plan.off_us.tolist() == [1000, 2000]
+    kept_on = compile_multispectral([1700.0], [5], [1], 1, True, WN_MIN, WN_MAX, TIMING)
+    assert kept_on.off_us.tolist() == [0]
+
+
+def test_to_columns_decimates():
+    plan = compile_sweep(1700.0, 1800.0, 10.0, 1, False, WN_MIN, WN_MAX, TIMING, points=1001)
+    columns = plan.to_columns(max_points=100)
+    assert len(columns["wavenumber"]) <= 100
+    assert columns["wavenumber"][0] == 1700.0
+
+
+def test_optimized_multispectral_order():
+    rng = np.random.default_rng(0)
+    wavenumbers = rng.uniform(1650.0, 2050.0, 50).tolist()
+    args = ([10] * 50, [0] * 50, 3, False, WN_MIN, WN_MAX, TIMING, 1850.0)
+    entered = compile_multispectral(wavenumbers, *args)
+    optimized = compile_multispectral(wavenumbers, *args, ordering="optimized")
+    assert optimized.duration < entered.duration
+    assert optimized.original_duration == pytest.approx(entered.duration)
+    order = optimized.order_indices()
+    assert sorted(order) == list(range(50))
+    np.testing.assert_array_equal(optimized.wavenumber, np.asarray(wavenumbers)[order])
+    summary = optimized.summary()
+    assert summary["ordering"] == "optimized"
+    assert summary["order_strategy"] == optimized.parameters["order_strategy"] != "as_entered"
+    assert entered.summary()["order_strategy"] == "as_entered"
+    assert entered.order_indices() == list(range(50))
+
+
+def test_unknown_ordering_is_rejected():
+    with pytest.raises(ScanPlanError, match="ordering"):
+        compile_multispectral([1700.0], [5], [1], 1, False, WN_MIN, WN_MAX, TIMING, ordering="fastest")
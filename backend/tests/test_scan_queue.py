@@ -0,0 +1,116 @@
+import asyncio
+import time
+
+import numpy as np
+
+from modules.daylight_mircat.scan_plan import ScanPlan
+from modules.daylight_mircat.scan_queue import MIRcatScanQueue
+
+
+class FakeController:
+    """Just enough of MIRcatController for the queue: one job whose status reads are scripted."""
+
+    def __init__(self, statuses, duration=0.05, externally_paced=False, **intervals):
+        self.connected = True
+        self.externally_paced = externally_paced
+        self.last_error = None
+        self.scan_queue_intervals = {
+            "coarse_interval": 0.01,
+            "dense_interval": 0.005,
+            "end_guard": 0.0,
+            "start_grace": 1.0,
+            "timeout_factor": 1.0,
+            "timeout_margin": 5.0,
+            **intervals,
+        }
+        self.duration = duration
+        self.statuses = list(statuses)
+        self.reads = 0
+        self.completions = 0
+
+    def plan_sweep_scan(self, **params):
+        wavenumber = np.array([1700.0, 1800.0])
+        zeros = np.zeros(2, dtype=np.uint32)
+        return ScanPlan(mode="sweep", wavenumber=wavenumber, dwell_us=zeros, off_us=zeros,
+                        t=np.zeros(2), num_scans=1, first_pass_duration=self.duration,
+                        pass_duration=self.duration)
+
+    async def start_sweep_scan(self, **params):
+        return True
+
+    def plan_step_scan(self, **params):
+        plan = self.plan_sweep_scan()
+        plan.mode = "step"
+        return plan
+
+    async def start_step_scan(self, **params):
+        return True
+
+    def software_scan_active(self):
+        return False
+
+    def scan_completed(self):
+        self.completions += 1
+
+    def scan_externally_paced(self, mode):
+        return mode == "step" and self.externally_paced
+
+    async def sample_scan_status(self):
+        self.reads += 1
+        # The last scripted status repeats
+        in_progress = self.statuses[min(self.reads, len(self.statuses)) - 1]
+        return time.monotonic(), (in_progress, 1, 0, 1750.0, 2, False)
+
+
+async def run_queue(ctl, mode="sweep"):
+    queue = MIRcatScanQueue(ctl)
+    await queue.submit([{"mode": mode, "params": {}}])
+    await queue._task
+    return queue
+
+
+def test_not_in_progress_before_start_is_not_completion():
+    # The hardware has not reported the new scan yet on the first read
+    ctl = FakeController([False, True, True, True, False])
+    queue = asyncio.run(run_queue(ctl))
+    assert queue.state == "completed"
+    assert ctl.reads == 5
+    assert queue.jobs[0].runs[0]["duration"] > 0
+
+
+def test_run_that_never_reports_running_completes_after_grace():
+    ctl = FakeController([False], start_grace=0.05)
+    t0 = time.monotonic()
+    queue = asyncio.run(run_queue(ctl))
+    assert queue.state == "completed"
+    assert time.monotonic() - t0 >= 0.05
+
+
+def test_run_that_never_finishes_times_out():
+    ctl = FakeController([True], duration=0.02, timeout_margin=0.05)
+    queue = asyncio.run(run_queue(ctl))
+    assert queue.state == "failed"
+    assert "did not finish" in queue.error
+    assert queue.jobs[0].status == "failed"
+    assert ctl.completions == 0
+
+
+def test_externally_triggered_step_run_outlives_its_prediction():
+    # Ends well after predicted * timeout_factor + timeout_margin
+    ctl = FakeController([True] * 30 + [False], duration=0.02, timeout_margin=0.05, externally_paced=True)
+    queue = asyncio.run(run_queue(ctl, mode="step"))
+    assert queue.state == "completed"
+    assert queue.jobs[0].runs[0]["duration"] > 0.07
+
+
+def test_seen_completion_is_reported_to_the_controller():
+    ctl = FakeController([True, True, False], start_grace=0.02)
+    queue = MIRcatScanQueue(ctl)
+
+    async def run():
+        await queue.submit([{"mode": "sweep", "params": {}, "repeats": 3}])
+        await queue._task
+
+    asyncio.run(run())
+    assert queue.state == "completed"
+    assert ctl.completions == 3
@@ -0,0 +1,80 @@
+import ctypes
+import re
+from ctypes import POINTER, c_bool, c_char_p, c_float, c_int16, c_int32, c_uint8, c_uint16, c_uint32
+from pathlib import Path
+
+import pytest
+
+from modules.daylight_mircat.sdk_bindings import PROTOTYPES, SDK_PREFIX, MIRcatBindings
+
+SIM_DIR = Path(__file__).resolve().parents[1] / "simulators" / "mircat"
+
+C_TYPES = {
+    "bool": c_bool,
+    "uint8_t": c_uint8,
+    "uint16_t": c_uint16,
+    "uint32_t": c_uint32,
+    "int16_t": c_int16,
+    "int32_t": c_int32,
+    "float": c_float,
+}
+
+
+def simulator_exports():
+    """SDK function name (without prefix) -> ctypes argtypes parsed from the simulator source."""
+    source = (SIM_DIR / "mircat_sim.c").read_text()
+    exports = {}
+    for name, params in re.findall(r"EXPORT uint32_t MIRcatSDK_(\w+)\(([^)]*)\)", source):
+        argtypes = []
+        for param in params.split(","):
+            param = " ".join(param.split())
+            if not param or param == "void":
+                continue
+            ctype = param.rsplit(None, 1)[0] if "*" not in param else param[:param.rindex("*") + 1]
+            ctype = ctype.replace("const ", "").replace(" *", "*")
+            if ctype == "char*":
+                argtypes.append(c_char_p)
+            elif ctype.endswith("*"):
+                argtypes.append(POINTER(C_TYPES[ctype[:-1]]))
+            else:
+                argtypes.append(C_TYPES[ctype])
+        exports[name] = tuple(argtypes)
+    return exports
+
+
+def test_prototypes_match_simulator_signatures():
+    exports = simulator_exports()
+    assert "GetScanStatus" in exports and "SetWlTrigParams" in exports
+    mismatched = {name: (PROTOTYPES.get(name), argtypes) for name, argtypes in exports.items()
+                  if PROTOTYPES.get(name) != argtypes}
+    assert mismatched == {}
+
+
+@pytest.fixture(scope="module")
+def sdk():
+    path = SIM_DIR / "libMIRcatSDK.so"
+    if not path.exists():
+        pytest.skip("MIRcat SDK simulator not built (make -C backend/simulators/mircat)")
+    lib = ctypes.CDLL(str(path))
+    lib.MIRcatSim_Reset()
+    bindings = MIRcatBindings(lib)
+    assert lib.MIRcatSDK_Initialize() == 0
+    yield bindings
+    lib.MIRcatSDK_DeInitialize()
+
+
+def test_wl_trig_params_round_trip(sdk):
+    lib = sdk.lib
+    assert lib.MIRcatSDK_SetWlTrigParams(2, 3, 1700.5, 1800.25, 0.5, 2, 150000, 20000) == 0
+    assert sdk.GetWlTrigParams() == (0, (2, 3, 1700.5, 1800.25, 0.5, 2, 150000, 20000))
+    with pytest.raises(ctypes.ArgumentError):
+        lib.MIRcatSDK_SetWlTrigParams(2, 3, "1700", 1800.0, 0.5, 2, 150000, 20000)
+
+
+def test_scan_status_out_parameters(sdk):
+    ret, values = sdk.GetScanStatus()
+    assert ret == 0
+    in_progress, active, paused, scan_number, percent, current_ww, units, tec, motion = values
+    assert (in_progress, active, paused, motion) == (False, False, False, False)
+    assert isinstance(scan_number, int) and isinstance(percent, int)
+    assert isinstance(current_ww, float) and isinstance(tec, bool)
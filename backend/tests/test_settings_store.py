@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+import threading
+
+from core.settings_store import JsonSettingsStore
+
+
+class SlowStore(JsonSettingsStore):
+    """Store whose file writes block until released; tracks how many run at once."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_started = threading.Event()
+        self.release = threading.Event()
+        self.active = 0
+        self.max_active = 0
+
+    def _write_file(self, data):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.write_started.set()
+        self.release.wait(5)
+        try:
+            return super()._write_file(data)
+        finally:
+            self.active -= 1
+
+
+def test_update_without_loop_writes_immediately(tmp_path):
+    store = JsonSettingsStore(tmp_path / "settings.json")
+    store.update({"a": 1})
+    assert json.loads((tmp_path / "settings.json").read_text()) == {"a": 1}
+    assert store.writes == 1
+
+
+def test_updates_are_debounced_into_one_write(tmp_path):
+    async def run():
+        store = JsonSettingsStore(tmp_path / "settings.json", debounce=0.05)
+        for n in range(5):
+            store.update({"n": n})
+        await asyncio.sleep(0.2)
+        assert store.writes == 1
+        assert json.loads((tmp_path / "settings.json").read_text()) == {"n": 4}
+    asyncio.run(run())
+
+
+def test_update_during_in_flight_write_is_not_lost(tmp_path):
+    async def run():
+        store = SlowStore(tmp_path / "settings.json", debounce=0.0)
+        store.update({"a": 1})
+        await asyncio.to_thread(store.write_started.wait, 5)
+        # The running write already took its snapshot; this change must get its own write
+        store.update({"b": 2})
+        store.release.set()
+        await asyncio.sleep(0.2)
+        assert json.loads((tmp_path / "settings.json").read_text()) == {"a": 1, "b": 2}
+        assert store.writes == 2
+    asyncio.run(run())
+
+
+def test_flush_during_in_flight_write_writes_latest(tmp_path):
+    async def run():
+        store = SlowStore(tmp_path / "settings.json", debounce=10.0)
+        store.update({"a": 1})
+        flush = asyncio.ensure_future(store.flush())
+        await asyncio.to_thread(store.write_started.wait, 5)
+        store.update({"a": 2})
+        # Give a second, overlapping write time to start (it must not)
+        await asyncio.sleep(0.1)
+        store.release.set()
+        await flush
+        assert store.max_active == 1
+        assert json.loads((tmp_path / "settings.json").read_text()) == {"a": 2}
+    asyncio.run(run())
+
+
+class SlowReadStore(JsonSettingsStore):
+    """Store whose file reads block until released once ``block_reads`` is set."""
+
+    block_reads = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_started = threading.Event()
+        self.release = threading.Event()
+
+    def _read_file(self):
+        if self.block_reads:
+            self.read_started.set()
+            self.release.wait(5)
+        return super()._read_file()
+
+
+def test_update_during_reload_is_not_overwritten(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"a": 1}))
+
+    async def run():
+        store = SlowReadStore(path, debounce=0.0)
+        path.write_text(json.dumps({"a": "external"}))
+        os.utime(path, ns=(0, 1))  # a different mtime, whatever the clock resolution
+        store.block_reads = True
+        reload = asyncio.ensure_future(store._reload_if_changed())
+        await asyncio.to_thread(store.read_started.wait, 5)
+        store.update({"b": 2})
+        store.release.set()
+        assert await reload is False
+        assert store.snapshot() == {"a": 1, "b": 2}
+        await store.flush()
+        assert json.loads(path.read_text()) == {"a": 1, "b": 2}
+    asyncio.run(run())
+
+
+def test_external_edit_is_reloaded(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"a": 1}))
+
+    async def run():
+        store = JsonSettingsStore(path)
+        path.write_text(json.dumps({"a": "external"}))
+        os.utime(path, ns=(0, 1))
+        assert await store._reload_if_changed() is True
+        assert store.get("a") == "external"
+    asyncio.run(run())
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from modules.daylight_mircat.controller import MIRcatController
+
+
+@pytest.fixture
+def controller():
+    ctl = MIRcatController()
+    ctl.connected = True
+    ctl.sweeps = []
+    # Cleared by a test to hold a sweep mid-read; ``reading`` is set once one is
+    ctl.read_gate = threading.Event()
+    ctl.read_gate.set()
+    ctl.reading = threading.Event()
+
+    def read_status(groups):
+        # Stands in for the SDK reads; every sweep's groups are recorded
+        ctl.sweeps.append(set(groups))
+        ctl.reading.set()
+        ctl.read_gate.wait(5)
+        return {"status": {"connected": True}}
+
+    ctl._read_hardware_status = read_status
+    yield ctl
+    ctl._hw.shutdown()
+
+
+def test_nothing_due_republishes_a_fresh_snapshot(controller):
+    now = time.monotonic()
+    controller._poll_last = {group: now for group in controller.STATUS_POLL_SCHEDULE}
+    first = controller._publish_snapshot()
+    controller._snapshot_monotonic -= 10.0
+
+    status = asyncio.run(controller.get_status(max_age=1.0))
+    assert controller.sweeps == []
+    assert status["snapshot_version"] == first["snapshot_version"] + 1
+    assert status["snapshot_time"] >= first["snapshot_time"]
+    # The refreshed snapshot now counts as fresh
+    asyncio.run(controller.get_status(max_age=1.0))
+    assert controller.status_coalescing["snapshot_hits"] == 1
+
+
+def due_only(ctl, *groups):
+    """Mark every status group fresh except ``groups``."""
+    now = time.monotonic()
+    ctl._poll_last = {group: now for group in ctl.STATUS_POLL_SCHEDULE if group not in groups}
+
+
+async def wait_until(predicate):
+    while not predicate():
+        await asyncio.sleep(0.001)
+
+
+FORCED = {"tuned", "armed", "emission", "interlocks", "key_switch", "temperature_stable"}
+
+
+def test_callers_join_a_sweep_whose_reads_have_not_begun(controller):
+    due_only(controller, "pulse")
+    gate = threading.Event()
+
+    async def run():
+        # Keep the executor busy so the first sweep stays queued
+        busy = asyncio.ensure_future(controller._hw.run(gate.wait))
+        first = asyncio.ensure_future(controller._update_hardware_status())
+        await wait_until(lambda: controller._status_sweep is not None)
+        joiners = [asyncio.ensure_future(controller._update_hardware_status()),
+                   asyncio.ensure_future(controller._update_hardware_status(force=True))]
+        await wait_until(lambda: controller.status_coalescing["joined"] == 2)
+        gate.set()
+        await asyncio.gather(busy, first, *joiners)
+
+    asyncio.run(run())
+    assert controller.sweeps == [{"pulse"} | FORCED]
+    assert controller.status_coalescing["sweeps"] == 1
+    assert controller.status_coalescing["joined"] == 2
+    assert controller.status_coalescing["waited"] == 0
+
+
+def test_caller_waits_for_a_running_sweep_then_reads_what_is_still_due(controller):
+    due_only(controller, "pulse")
+    controller.read_gate.clear()
+
+    async def run():
+        first = asyncio.ensure_future(controller._update_hardware_status())
+        await wait_until(controller.reading.is_set)
+        # An action invalidates a group the running sweep is not reading
+        controller._invalidate_status("armed")
+        second = asyncio.ensure_future(controller._update_hardware_status())
+        await wait_until(lambda: controller.status_coalescing["waited"] == 1)
+        controller.read_gate.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(run())
+    assert controller.sweeps == [{"pulse"}, {"armed"}]
+    assert controller.status_coalescing["sweeps"] == 2
+    assert controller.status_coalescing["waited"] == 1
+    assert controller.status_coalescing["joined"] == 0
+    # The pulse reads were reused, but the second sweep still read IsConnected
+    assert controller.status_coalescing["sdk_calls_saved"] == controller.STATUS_GROUP_SDK_CALLS["pulse"]
+
+
+def test_forced_caller_does_not_reuse_a_running_sweep(controller):
+    due_only(controller, "pulse")
+    controller.read_gate.clear()
+
+    async def run():
+        first = asyncio.ensure_future(controller._update_hardware_status())
+        await wait_until(controller.reading.is_set)
+        forced = asyncio.ensure_future(controller._update_hardware_status(force=True))
+        await wait_until(lambda: controller.status_coalescing["sweeps"] == 2)
+        controller.read_gate.set()
+        await asyncio.gather(first, forced)
+
+    asyncio.run(run())
+    # The forced sweep re-reads pulse too: the running read may predate the action
+    assert controller.sweeps == [{"pulse"}, {"pulse"} | FORCED]
+    assert controller.status_coalescing["waited"] == 0
+    assert controller.status_coalescing["joined"] == 0
+    assert controller.status_coalescing["sdk_calls_saved"] == 0
@@ -0,0 +1,17 @@
+import json
+
+from modules.daylight_mircat.trajectory import ScanTrajectoryRecorder
+
+
+def test_columns_render_missing_wavenumbers_as_null():
+    recorder = ScanTrajectoryRecorder(capacity=8)
+    recorder.start("sweep")
+    recorder.append(1.0, 1700.0, 1, 10, True)
+    recorder.append(2.0, float('nan'), 1, 20, True)
+    records, _ = recorder.read_since(0)
+    columns = recorder.to_columns(records)
+    assert columns["wavenumber"] == [1700.0, None]
+    assert columns["percent"] == [10, 20]
+    # Starlette renders JSON with allow_nan=False
+    json.dumps(columns, allow_nan=False)
+
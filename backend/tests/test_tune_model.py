@@ -0,0 +1,78 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from modules.daylight_mircat.scan_plan import TuneTiming
+from modules.daylight_mircat.tune_model import TuneLatencyModel
+
+
+def record_line(model, qcl, intercept, slope, count=20):
+    for i in range(count):
+        distance = 10.0 * (i + 1)
+        model.record(1700.0, 1700.0 + distance, qcl, intercept + slope * distance)
+
+
+def test_fit_recovers_settle_model(tmp_path):
+    model = TuneLatencyModel(tmp_path / "tune_log.npy", min_samples=10)
+    record_line(model, 1, 0.08, 0.001, count=9)
+    assert model.predict(1700.0, 1800.0, 1) is None  # below min_samples
+    record_line(model, 1, 0.08, 0.001, count=11)
+    fit = model.fits[1]
+    assert fit["intercept"] == pytest.approx(0.08, abs=1e-4)
+    assert fit["slope"] == pytest.approx(0.001, rel=1e-3)
+    assert model.predict(1800.0, 1700.0, 1) == pytest.approx(0.18, abs=1e-4)
+    assert model.predict(None, 1700.0, 1) is None
+    assert model.predict(1700.0, 1800.0, 2) is None
+    fallback = TuneTiming(settle_time=0.5, rate=100.0, qcl_handoff=0.2, qcl_boundaries=(1900.0,))
+    timing = model.timing(1, fallback)
+    assert timing.rate == pytest.approx(1000.0, rel=1e-3)
+    assert timing.qcl_boundaries == fallback.qcl_boundaries
+    assert model.timing(2, fallback) is fallback
+
+
+def test_log_is_capped_and_reloaded(tmp_path):
+    path = tmp_path / "tune_log.npy"
+    model = TuneLatencyModel(path, capacity=15, min_samples=10)
+    record_line(model, 1, 0.05, 0.002)  # no event loop: written immediately
+    assert model.samples == 15
+    reloaded = TuneLatencyModel(path, capacity=15, min_samples=10)
+    assert reloaded.samples == 15
+    assert reloaded.fits[1]["slope"] == pytest.approx(0.002, rel=1e-3)
+
+
+def test_tunes_are_written_once_per_debounce(tmp_path):
+    path = tmp_path / "tune_log.npy"
+
+    async def scenario():
+        model = TuneLatencyModel(path, debounce=0.05)
+        record_line(model, 1, 0.05, 0.002, count=5)
+        assert not path.exists()
+        await asyncio.sleep(0.2)
+        assert model.writes == 1
+        model.record(1700.0, 1750.0, 2, 0.1)
+        await model.flush()
+        return model
+
+    model = asyncio.run(scenario())
+    assert model.writes == 2
+    log = np.load(path)
+    assert log.size == 6 and log['qcl'][-1] == 2
+
+
+def test_fit_without_distance_term_uses_mean_latency(tmp_path):
+    fallback = TuneTiming(settle_time=0.5, rate=100.0)
+    # Every tune to the same wavenumber: no distance spread to fit a slope from
+    same = TuneLatencyModel(tmp_path / "same.npy", min_samples=10)
+    for settle in (0.10, 0.12, 0.14) * 4:
+        same.record(1700.0, 1700.0, 1, settle)
+    # Latency falling with distance would fit a negative slope
+    falling = TuneLatencyModel(tmp_path / "falling.npy", min_samples=10)
+    record_line(falling, 1, 0.3, -0.001, count=12)
+    for model, mean in ((same, 0.12), (falling, 0.3 - 0.001 * 65)):
+        fit = model.fits[1]
+        assert fit["slope"] == 0.0
+        assert fit["intercept"] == pytest.approx(mean, abs=1e-4)
+        timing = model.timing(1, fallback)
+        assert timing.settle_time == pytest.approx(mean, abs=1e-4)
+        assert timing.rate == fallback.rate
@@ -0,0 +1,36 @@
+import numpy as np
+
+from modules.daylight_mircat.scan_plan import TuneTiming
+from modules.daylight_mircat.tune_order import candidate_orders, nearest_neighbour, two_opt
+
+TIMING = TuneTiming(settle_time=0.05, rate=2000.0)
+
+
+def path_cost(wavenumber, order, start):
+    x = wavenumber[order]
+    cost = TIMING.between(x[:-1], x[1:]).sum()
+    if start is not None:
+        cost += float(TIMING.between(start, x[0]))
+    return cost
+
+
+def test_nearest_neighbour_walks_outward_from_start():
+    wavenumber = np.array([1700.0, 1900.0, 1750.0, 1800.0])
+    assert nearest_neighbour(wavenumber, 1790.0).tolist() == [3, 2, 0, 1]
+    # Without a start position the path is simply ascending
+    assert nearest_neighbour(wavenumber, None).tolist() == [0, 2, 3, 1]
+
+
+def test_two_opt_untangles_a_crossing_path():
+    wavenumber = np.array([1700.0, 1900.0, 1750.0, 1950.0, 1800.0])
+    order = np.arange(wavenumber.size)
+    improved = two_opt(order, wavenumber, TIMING.between, None)
+    assert sorted(improved.tolist()) == order.tolist()
+    assert path_cost(wavenumber, improved, None) < path_cost(wavenumber, order, None)
+
+
+def test_candidate_orders_are_permutations():
+    rng = np.random.default_rng(1)
+    wavenumber = rng.uniform(1650.0, 2050.0, 200)
+    for name, order in candidate_orders(wavenumber, TIMING.between, 1850.0).items():
+        assert sorted(order.tolist()) == list(range(wavenumber.size)), name
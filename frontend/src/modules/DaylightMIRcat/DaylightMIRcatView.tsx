@@ -25,7 +25,7 @@ import {
   RadioButtonChecked as LaserIcon,
   Tune as TuneIcon
 } from '@mui/icons-material'
-import { MIRcatAPI, type DeviceStatus as APIDeviceStatus } from './api'
+import { MIRcatAPI, applyStatusPatch, type DeviceStatus as APIDeviceStatus } from './api'
 import StatusIndicator from './components/StatusIndicator'
 import TuningControls from './components/TuningControls'
 import LaserSettingsPanel from './components/LaserSettingsPanel'
@@ -124,16 +124,40 @@ function DaylightMIRcatView() {
       const isSecure = window.location.protocol === 'https:'
       const host = window.location.hostname
       const port = window.location.port === '5000' ? '8000' : window.location.port || (isSecure ? '443' : '80')
-      const wsUrl = `${isSecure ? 'wss' : 'ws'}://${host}:${port}/ws/daylight_mircat`
+      const wsUrl = `${isSecure ? 'wss' : 'ws'}://${host}:${port}/ws/daylight_mircat?protocol=delta`
       const ws = new WebSocket(wsUrl)
       wsRef.current = ws
+      // Delta protocol: full snapshot first, then patches. A patch without a
+      // base or with a sequence gap requests one resync until a snapshot arrives
+      let current: any = null
+      let seq: number | null = null
+      let resyncPending = false
+      const requestResync = () => {
+        seq = null
+        if (resyncPending) return
+        resyncPending = true
+        ws.send(JSON.stringify({ type: 'resync' }))
+      }
       ws.onopen = () => setWsConnected(true)
       ws.onclose = () => setWsConnected(false)
       ws.onerror = () => setWsConnected(false)
       ws.onmessage = (ev) => {
         try {
           const msg = JSON.parse(ev.data)
-          if (msg?.type === 'status' && msg?.payload) {
+          if (msg?.type === 'snapshot' && msg?.payload) {
+            current = msg.payload
+            seq = msg.seq
+            resyncPending = false
+            setDeviceStatus(current)
+          } else if (msg?.type === 'patch') {
+            if (current === null || seq === null || msg.seq !== seq + 1) {
+              requestResync()
+              return
+            }
+            current = applyStatusPatch(current, msg.changes || {}, msg.removed || [])
+            seq = msg.seq
+            setDeviceStatus(current)
+          } else if (msg?.type === 'status' && msg?.payload) {
             setDeviceStatus(msg.payload)
           }
         } catch {}
@@ -21,8 +21,20 @@ export interface DeviceStatus {
   current_scan_number?: number | null
   current_scan_percent?: number | null
   current_scan_mode: string | null
+  multispectral_table_cache?: { hits: number; misses: number }
+  multispectral_progress?: {
+    scan: number
+    scans: number | null
+    chunk: number
+    chunks: number
+    elements_done: number
+    elements_total: number
+    percent: number
+  } | null
   last_error: string | null
   last_error_code: number | null
+  snapshot_version?: number
+  snapshot_time?: number
   status: {
     interlocks: boolean
     key_switch: boolean
@@ -225,3 +237,25 @@ export class MIRcatAPI {
     return response.data
   }
 }
+
+// Apply a delta-protocol patch frame: `changes` deep-merges into nested objects,
+// `removed` lists key paths to delete. Returns a new object; `base` is not mutated.
+export function applyStatusPatch(base: any, changes: Record<string, any>, removed: string[][]): any {
+  const isObject = (v: any) => v !== null && typeof v === 'object' && !Array.isArray(v)
+  const merge = (target: any, patch: Record<string, any>): any => {
+    const out = { ...target }
+    for (const [key, value] of Object.entries(patch)) {
+      out[key] = isObject(value) && isObject(out[key]) ? merge(out[key], value) : value
+    }
+    return out
+  }
+  const next = merge(base, changes)
+  for (const path of removed) {
+    let node = next
+    for (let i = 0; i < path.length - 1 && node; i++) {
+      node = isObject(node[path[i]]) ? (node[path[i]] = { ...node[path[i]] }) : null
+    }
+    if (node) delete node[path[path.length - 1]]
+  }
+  return next
+}